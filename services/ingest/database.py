@@ -1,12 +1,17 @@
+import itertools
 import json
 import logging
 import os
 import sqlite3
 import re
+import threading
 from contextlib import contextmanager
 from datetime import datetime, date
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils import fast_json
 
 logger = logging.getLogger(__name__)
 
@@ -75,12 +80,41 @@ def _convert_datetime_in_dict(data: Dict[str, Any]) -> Dict[str, Any]:
             result[key] = value
     return result
 
+@lru_cache(maxsize=1024)
+def _dumps_flat_parameters(items: Tuple[Tuple[str, type, Any], ...]) -> str:
+    """Сериализует плоский словарь параметров (кэшируется по содержимому)."""
+    return json.dumps({key: value for key, _, value in items})
+
+
+def _dumps_rule_parameters(parameters: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Сериализация параметров правила в JSON.
+
+    Правила из одного документа часто имеют одинаковую схему параметров,
+    поэтому плоские словари с хешируемыми значениями сериализуются через кэш.
+    Тип значения входит в ключ, чтобы 1, 1.0 и True не смешивались.
+    """
+    if not parameters:
+        return None
+    try:
+        items = tuple((key, type(value), value) for key, value in parameters.items())
+        return _dumps_flat_parameters(items)
+    except TypeError:
+        # Вложенные структуры (list/dict) не хешируются - сериализуем напрямую
+        return json.dumps(parameters)
+
+
 DB_PATH = os.getenv("INGEST_DB_PATH", os.path.join(os.getcwd(), "ingest_data.db"))
 
+# SQLite допускает одного писателя: массовые импорты выстраиваются в очередь здесь,
+# а не удерживают соединения в ожидании внутренней блокировки БД.
+# RLock - batch_import_aggregated_files вызывает import_resource_to_db под той же блокировкой.
+_DB_WRITE_LOCK = threading.RLock()
+
 
 @contextmanager
 def get_connection():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
     # Оптимизация производительности SQLite
     conn.execute("PRAGMA journal_mode=WAL")
@@ -207,6 +241,11 @@ def init_db() -> None:
                 logger.info("Добавлена колонка parsed_data_json в normative_documents")
         except sqlite3.OperationalError as e:
             logger.warning(f"Ошибка при миграции normative_documents: {e}")
+        # Дедупликация по хешу: ORDER BY uploaded_at DESC LIMIT 1 останавливается на первой строке индекса
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_normdoc_hash_uploaded "
+            "ON normative_documents(file_hash, uploaded_at DESC)"
+        )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS normative_rules (
@@ -261,6 +300,24 @@ def init_db() -> None:
             )
             """
         )
+        # Индексы под выборку последних нарушений (ORDER BY created_at DESC LIMIT ?):
+        # SQLite читает первые N строк индекса без сортировки всего набора
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_violations_created "
+            "ON normative_violations(created_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_violations_ent_created "
+            "ON normative_violations(enterprise_id, created_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_violations_batch_created "
+            "ON normative_violations(batch_id, created_at DESC)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_violations_status_created "
+            "ON normative_violations(status, created_at DESC)"
+        )
         # Таблица для агрегированных данных энергоресурсов
         conn.execute(
             """
@@ -291,7 +348,7 @@ def init_db() -> None:
                 reactive_energy_kvarh REAL,
                 cost_sum REAL,
                 data_type TEXT DEFAULT 'consumption',
-                data_json TEXT,
+                data_json BLOB,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
                 FOREIGN KEY (enterprise_id) REFERENCES enterprises(id),
@@ -305,6 +362,32 @@ def init_db() -> None:
         except sqlite3.OperationalError:
             # Колонка уже существует, игнорируем ошибку
             pass
+        # UPSERT в import_node_consumption_to_db требует уникальный индекс по ключу записи.
+        # В новых БД его даёт UNIQUE из CREATE TABLE, в старых (до data_type) - создаём явно.
+        if not _has_unique_index(conn, "node_consumption", ("enterprise_id", "node_name", "period", "data_type")):
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_node_consumption_key "
+                "ON node_consumption(enterprise_id, node_name, period, data_type)"
+            )
+        # Выборки по периоду и ORDER BY period, node_name в get_node_consumption:
+        # уникальный ключ начинается с node_name и для них не подходит
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_node_consumption_ent_period "
+            "ON node_consumption(enterprise_id, period, node_name)"
+        )
+
+
+def _has_unique_index(conn: sqlite3.Connection, table: str, columns: Tuple[str, ...]) -> bool:
+    """Проверяет, есть ли у таблицы уникальный индекс ровно по указанным колонкам."""
+    for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+        if not index["unique"]:
+            continue
+        index_columns = tuple(
+            col["name"] for col in conn.execute(f"PRAGMA index_info({index['name']})").fetchall()
+        )
+        if set(index_columns) == set(columns):
+            return True
+    return False
 
 
 def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
@@ -847,13 +930,20 @@ def find_duplicate_upload(
 
 # Функции для работы с нормативными документами
 
+# Метаданные документа без тяжёлых full_text/parsed_data_json:
+# полный текст читается отдельно через get_normative_document_text()
+_NORMATIVE_DOCUMENT_COLUMNS = (
+    "id, title, document_type, file_path, file_hash, file_size, "
+    "uploaded_at, ai_processed, processing_status"
+)
+
 
 def find_normative_document_by_hash(file_hash: str) -> Optional[Dict[str, Any]]:
     """Найти нормативный документ по хешу файла (для дедупликации)"""
     with get_connection() as conn:
         row = conn.execute(
-            """
-            SELECT * FROM normative_documents
+            f"""
+            SELECT {_NORMATIVE_DOCUMENT_COLUMNS} FROM normative_documents
             WHERE file_hash = ?
             ORDER BY uploaded_at DESC
             LIMIT 1
@@ -972,11 +1062,33 @@ def update_normative_document_status(
 
 
 def get_normative_document(document_id: int) -> Optional[Dict[str, Any]]:
-    """Получить нормативный документ по ID"""
+    """Получить метаданные нормативного документа по ID (без полного текста)"""
+    with get_connection() as conn:
+        row = conn.execute(
+            f"""
+            SELECT {_NORMATIVE_DOCUMENT_COLUMNS},
+                   (full_text IS NOT NULL AND full_text != '') AS has_full_text,
+                   (parsed_data_json IS NOT NULL AND parsed_data_json != '') AS has_parsed_data
+            FROM normative_documents
+            WHERE id = ?
+            """,
+            (document_id,),
+        ).fetchone()
+        if not row:
+            return None
+        record = _row_to_dict(row)
+        record["has_full_text"] = bool(record["has_full_text"])
+        record["has_parsed_data"] = bool(record["has_parsed_data"])
+        return record
+
+
+def get_normative_document_text(document_id: int) -> Optional[Dict[str, Any]]:
+    """Получить полный текст и результат парсинга нормативного документа"""
     with get_connection() as conn:
         row = conn.execute(
             """
-            SELECT * FROM normative_documents
+            SELECT id, title, full_text, parsed_data_json
+            FROM normative_documents
             WHERE id = ?
             """,
             (document_id,),
@@ -998,7 +1110,7 @@ def create_normative_rule(
 ) -> Dict[str, Any]:
     """Создать правило из нормативного документа"""
     created_at = datetime.utcnow().isoformat()
-    parameters_json = json.dumps(parameters) if parameters else None
+    parameters_json = _dumps_rule_parameters(parameters)
 
     with get_connection() as conn, conn:
         cursor = conn.execute(
@@ -1131,17 +1243,115 @@ def get_normative_rules_for_field(
                 """,
                 (field_name,),
             ).fetchall()
-        results = []
-        for row in rows:
-            record = _row_to_dict(row)
-            if record.get("parameters"):
-                try:
-                    record["parameters"] = json.loads(record["parameters"])
-                except (json.JSONDecodeError, TypeError):
-                    record["parameters"] = {}
-            results.append(record)
+        return [_normative_rule_record(row) for row in rows]
+
+
+def _normative_rule_record(row: sqlite3.Row) -> Dict[str, Any]:
+    """Запись правила норматива с разобранным JSON parameters"""
+    record = _row_to_dict(row)
+    if record.get("parameters"):
+        try:
+            record["parameters"] = json.loads(record["parameters"])
+        except (json.JSONDecodeError, TypeError):
+            record["parameters"] = {}
+    return record
+
+
+def get_normative_rules_bulk(
+    pairs: Sequence[Tuple[str, Optional[str]]]
+) -> Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]:
+    """
+    Получить правила для нескольких полей энергопаспорта одним запросом
+
+    Args:
+        pairs: Пары (field_name, sheet_name); sheet_name=None - поле на любом листе
+
+    Returns:
+        Словарь {(field_name, sheet_name): правила} - для каждой пары то же,
+        что вернул бы get_normative_rules_for_field(field_name, sheet_name)
+    """
+    results: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {
+        pair: [] for pair in pairs
+    }
+    if not results:
         return results
 
+    field_names = sorted({field_name for field_name, _ in results})
+    placeholders = ",".join("?" * len(field_names))
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT nr.*, nd.title as document_title, nd.document_type, nref.cell_reference,
+                   nref.field_name AS ref_field_name, nref.sheet_name AS ref_sheet_name
+            FROM normative_rules nr
+            JOIN normative_documents nd ON nr.document_id = nd.id
+            JOIN normative_references nref ON nr.id = nref.rule_id
+            WHERE nref.field_name IN ({placeholders})
+            ORDER BY nr.extraction_confidence DESC
+            """,
+            field_names,
+        ).fetchall()
+
+    # Пустой sheet_name, как и в get_normative_rules_for_field, - любой лист
+    exact_buckets = {pair: bucket for pair, bucket in results.items() if pair[1]}
+    any_sheet_buckets: Dict[str, List[List[Dict[str, Any]]]] = {}
+    for (field_name, sheet_name), bucket in results.items():
+        if not sheet_name:
+            any_sheet_buckets.setdefault(field_name, []).append(bucket)
+
+    for row in rows:
+        record = _normative_rule_record(row)
+        field_name = record.pop("ref_field_name")
+        sheet_name = record.pop("ref_sheet_name")
+        bucket = exact_buckets.get((field_name, sheet_name))
+        if bucket is not None:
+            bucket.append(record)
+        for bucket in any_sheet_buckets.get(field_name, ()):
+            bucket.append(dict(record))
+    return results
+
+
+def count_normative_rules_bulk(
+    pairs: Sequence[Tuple[str, Optional[str]]]
+) -> Dict[Tuple[str, Optional[str]], int]:
+    """
+    Посчитать правила для нескольких полей энергопаспорта одним запросом
+
+    Args:
+        pairs: Пары (field_name, sheet_name); sheet_name=None - поле на любом листе
+
+    Returns:
+        Словарь {(field_name, sheet_name): количество} - для каждой пары то же,
+        что len(get_normative_rules_for_field(field_name, sheet_name))
+    """
+    counts: Dict[Tuple[str, Optional[str]], int] = {pair: 0 for pair in pairs}
+    if not counts:
+        return counts
+
+    field_names = sorted({field_name for field_name, _ in counts})
+    placeholders = ",".join("?" * len(field_names))
+    with get_connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT nref.field_name, nref.sheet_name, COUNT(*) AS rules_count
+            FROM normative_rules nr
+            JOIN normative_documents nd ON nr.document_id = nd.id
+            JOIN normative_references nref ON nr.id = nref.rule_id
+            WHERE nref.field_name IN ({placeholders})
+            GROUP BY nref.field_name, nref.sheet_name
+            """,
+            field_names,
+        ).fetchall()
+
+    for field_name, sheet_name, rules_count in rows:
+        if sheet_name and (field_name, sheet_name) in counts:
+            counts[(field_name, sheet_name)] += rules_count
+        # Пустой sheet_name, как и в get_normative_rules_for_field, - любой лист
+        for any_sheet in (None, ""):
+            if (field_name, any_sheet) in counts:
+                counts[(field_name, any_sheet)] += rules_count
+    return counts
+
 
 def create_normative_violation(
     *,
@@ -1202,6 +1412,36 @@ def create_normative_violation(
         }
 
 
+_NORMATIVE_VIOLATION_COLUMNS = (
+    "id, enterprise_id, batch_id, field_name, sheet_name, actual_value, "
+    "normative_value, deviation_percent, status, message, rule_id, "
+    "cell_reference, created_at"
+)
+
+
+def _build_violations_query(by_enterprise: bool, by_batch: bool, by_status: bool) -> str:
+    conditions: List[str] = []
+    if by_enterprise:
+        conditions.append("enterprise_id = ?")
+    if by_batch:
+        conditions.append("batch_id = ?")
+    if by_status:
+        conditions.append("status = ?")
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return (
+        f"SELECT {_NORMATIVE_VIOLATION_COLUMNS} FROM normative_violations{where} "
+        "ORDER BY created_at DESC LIMIT ?"
+    )
+
+
+# Все варианты запроса нарушений строятся один раз при импорте модуля:
+# текст SQL стабилен, и sqlite3 берёт подготовленный план из кэша выражений.
+_VIOLATIONS_SQL: Dict[Tuple[bool, bool, bool], str] = {
+    key: _build_violations_query(*key)
+    for key in itertools.product((False, True), repeat=3)
+}
+
+
 def get_normative_violations(
     enterprise_id: Optional[int] = None,
     batch_id: Optional[str] = None,
@@ -1209,30 +1449,14 @@ def get_normative_violations(
     limit: int = 100,
 ) -> List[Dict[str, Any]]:
     """Получить список нарушений нормативов"""
-    with get_connection() as conn:
-        query = "SELECT * FROM normative_violations WHERE 1=1"
-        params: List[Any] = []
-
-        if enterprise_id:
-            query += " AND enterprise_id = ?"
-            params.append(enterprise_id)
-
-        if batch_id:
-            query += " AND batch_id = ?"
-            params.append(batch_id)
-
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-
-        query += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
+    filters = (enterprise_id, batch_id, status)
+    query = _VIOLATIONS_SQL[(bool(enterprise_id), bool(batch_id), bool(status))]
+    params: List[Any] = [value for value in filters if value]
+    params.append(limit)
 
+    with get_connection() as conn:
         rows = conn.execute(query, params).fetchall()
-        results = []
-        for row in rows:
-            results.append(_row_to_dict(row))
-        return results
+        return [_row_to_dict(row) for row in rows]
 
 
 def list_normative_documents() -> List[Dict[str, Any]]:
@@ -1401,6 +1625,7 @@ def import_resource_to_db(
     batch_id: str,
     resource_type: str,
     resource_data: Dict[str, Any],
+    now: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     Импортирует агрегированные данные энергоресурса в БД (универсальная функция).
@@ -1411,6 +1636,8 @@ def import_resource_to_db(
         resource_type: Тип ресурса ('electricity', 'gas', 'water', 'heat', 'fuel')
         resource_data: Данные ресурса из aggregated JSON
             Формат: {"2022-Q1": {...}, "2022-Q2": {...}}
+        now: Метка времени created_at/updated_at (ISO). Пакетные импорты передают
+            одну метку на весь пакет; по умолчанию - текущее время
     
     Returns:
         Список созданных/обновленных записей
@@ -1418,10 +1645,12 @@ def import_resource_to_db(
     if not resource_data:
         return []
     
-    now = datetime.utcnow().isoformat()
+    now = now or datetime.utcnow().isoformat()
     imported_records = []
     
-    with get_connection() as conn, conn:
+    with _DB_WRITE_LOCK, get_connection() as conn, conn:
+        # Берём блокировку записи сразу: внутри цикла SELECT чередуется с записью
+        conn.execute("BEGIN IMMEDIATE")
         for period, period_data in resource_data.items():
             # period имеет формат "2022-Q1", "2022-Q2" и т.д.
             if not isinstance(period_data, dict):
@@ -1539,7 +1768,7 @@ def get_aggregated_electricity(
         result = {}
         for row in rows:
             period_key = row["period"]
-            data = json.loads(row["data_json"])
+            data = fast_json.loads(row["data_json"])
             result[period_key] = data
         
         return result
@@ -1687,6 +1916,9 @@ def batch_import_aggregated_files(
         "details": []
     }
     
+    # Одна метка времени на весь пакет файлов
+    now = datetime.utcnow().isoformat()
+    
     for aggregated_file in aggregated_files:
         file_result: Dict[str, Any] = {
             "filename": aggregated_file.name,
@@ -1743,20 +1975,23 @@ def batch_import_aggregated_files(
             resources = aggregated_data.get("resources", {})
             total_imported = 0
             
-            for resource_type, resource_data in resources.items():
-                if not resource_data or not isinstance(resource_data, dict):
-                    continue
-                
-                imported_records = import_resource_to_db(
-                    enterprise_id=enterprise_id,
-                    batch_id=batch_id,
-                    resource_type=resource_type,
-                    resource_data=resource_data
-                )
-                
-                if imported_records:
-                    file_result["resources_imported"][resource_type] = len(imported_records)
-                    total_imported += len(imported_records)
+            # Ресурсы одного файла пишутся подряд, без вклинивания других писателей
+            with _DB_WRITE_LOCK:
+                for resource_type, resource_data in resources.items():
+                    if not resource_data or not isinstance(resource_data, dict):
+                        continue
+                    
+                    imported_records = import_resource_to_db(
+                        enterprise_id=enterprise_id,
+                        batch_id=batch_id,
+                        resource_type=resource_type,
+                        resource_data=resource_data,
+                        now=now,
+                    )
+                    
+                    if imported_records:
+                        file_result["resources_imported"][resource_type] = len(imported_records)
+                        total_imported += len(imported_records)
             
             if total_imported > 0:
                 file_result["status"] = "imported"
@@ -1784,6 +2019,70 @@ def batch_import_aggregated_files(
     return result
 
 
+# SQL для узлов учёта - константы модуля: стабильный текст запроса
+# берётся из кэша подготовленных выражений соединения (cached_statements)
+_UPSERT_NODE_CONSUMPTION_SQL = """
+    INSERT INTO node_consumption
+    (enterprise_id, batch_id, node_name, period, active_energy_kwh,
+     reactive_energy_kvarh, cost_sum, data_type, data_json, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(enterprise_id, node_name, period, data_type) DO UPDATE SET
+        batch_id = excluded.batch_id,
+        active_energy_kwh = excluded.active_energy_kwh,
+        reactive_energy_kvarh = excluded.reactive_energy_kvarh,
+        cost_sum = excluded.cost_sum,
+        data_json = excluded.data_json,
+        updated_at = excluded.updated_at
+"""
+
+_SELECT_NODE_CONSUMPTION_IDS_SQL = """
+    SELECT id, node_name, period, data_type FROM node_consumption
+    WHERE enterprise_id = ? AND batch_id = ?
+"""
+
+
+def _dumps_json_bytes(data: Any) -> bytes:
+    """
+    Сериализует JSON-колонку в байты для хранения как BLOB.
+
+    Чтение (fast_json.loads) принимает и байты, и строки прежних TEXT-записей.
+    """
+    try:
+        return fast_json.dumps_bytes(data)
+    except TypeError:
+        return safe_json_dumps(data).encode("utf-8")
+
+
+def _loads_json_or_none(raw: Any) -> Any:
+    """Разбирает JSON-колонку; некорректные данные читаются как None."""
+    try:
+        return fast_json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+def _build_node_consumption_query(by_node: bool, by_period: bool) -> str:
+    conditions = ["enterprise_id = ?"]
+    if by_node:
+        conditions.append("node_name = ?")
+    if by_period:
+        conditions.append("period = ?")
+    return f"""
+        SELECT id, enterprise_id, batch_id, node_name, period,
+               active_energy_kwh, reactive_energy_kvarh, cost_sum,
+               data_json, created_at, updated_at
+        FROM node_consumption
+        WHERE {' AND '.join(conditions)}
+        ORDER BY period, node_name
+    """
+
+
+_NODE_CONSUMPTION_SQL: Dict[Tuple[bool, bool], str] = {
+    key: _build_node_consumption_query(*key)
+    for key in itertools.product((False, True), repeat=2)
+}
+
+
 def import_node_consumption_to_db(
     enterprise_id: int,
     batch_id: str,
@@ -1815,87 +2114,70 @@ def import_node_consumption_to_db(
         return []
     
     now = datetime.utcnow().isoformat()
-    imported_records = []
+    # Ключ записи → строка для UPSERT: повторы узла/периода внутри пакета
+    # схлопываются в Python (побеждает последняя строка, как и при поочерёдной записи)
+    rows_by_key: Dict[tuple, tuple] = {}
+    keys: List[tuple] = []
+    
+    for node_data in node_consumption_data:
+        node_name = node_data.get("node_name")
+        period = node_data.get("period")
+        
+        if not node_name or not period:
+            continue
+        
+        data_json_bytes = None
+        # Если есть дополнительные данные, сохраняем их в JSON (UTF-8 байты, BLOB)
+        if "data_json" in node_data:
+            data_json_bytes = _dumps_json_bytes(node_data["data_json"])
+        
+        # Определяем тип данных (production/realization vs consumption)
+        data_type = node_data.get("data_type", "consumption")
+        if data_type not in ["consumption", "production", "realization"]:
+            data_type = "consumption"  # По умолчанию
+        
+        key = (node_name, period, data_type)
+        rows_by_key[key] = (
+            enterprise_id, batch_id, node_name, period,
+            node_data.get("active_energy_kwh"),
+            node_data.get("reactive_energy_kvarh"),
+            node_data.get("cost_sum"),
+            data_type, data_json_bytes, now, now,
+        )
+        keys.append(key)
     
-    with get_connection() as conn, conn:
-        for node_data in node_consumption_data:
-            node_name = node_data.get("node_name")
-            period = node_data.get("period")
-            
-            if not node_name or not period:
-                continue
-            
-            active_energy_kwh = node_data.get("active_energy_kwh")
-            reactive_energy_kvarh = node_data.get("reactive_energy_kvarh")
-            cost_sum = node_data.get("cost_sum")
-            data_json_str = None
-            
-            # Если есть дополнительные данные, сохраняем их в JSON
-            if "data_json" in node_data:
-                data_json_str = safe_json_dumps(node_data["data_json"])
-            
-            # Определяем тип данных (production/realization vs consumption)
-            data_type = node_data.get("data_type", "consumption")
-            if data_type not in ["consumption", "production", "realization"]:
-                data_type = "consumption"  # По умолчанию
-            
-            # Проверяем, существует ли запись
-            existing = conn.execute(
-                """
-                SELECT id FROM node_consumption
-                WHERE enterprise_id = ? AND node_name = ? AND period = ? AND data_type = ?
-                """,
-                (enterprise_id, node_name, period, data_type),
-            ).fetchone()
-            
-            if existing:
-                # Обновляем существующую запись
-                conn.execute(
-                    """
-                    UPDATE node_consumption
-                    SET batch_id = ?, active_energy_kwh = ?, reactive_energy_kvarh = ?,
-                        cost_sum = ?, data_json = ?, updated_at = ?
-                    WHERE enterprise_id = ? AND node_name = ? AND period = ? AND data_type = ?
-                    """,
-                    (
-                        batch_id, active_energy_kwh, reactive_energy_kvarh,
-                        cost_sum, data_json_str, now,
-                        enterprise_id, node_name, period, data_type
-                    ),
-                )
-                record_id = existing["id"]
-            else:
-                # Создаем новую запись
-                cursor = conn.execute(
-                    """
-                    INSERT INTO node_consumption
-                    (enterprise_id, batch_id, node_name, period, active_energy_kwh,
-                     reactive_energy_kvarh, cost_sum, data_type, data_json, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        enterprise_id, batch_id, node_name, period,
-                        active_energy_kwh, reactive_energy_kvarh, cost_sum, data_type,
-                        data_json_str, now, now
-                    ),
-                )
-                record_id = cursor.lastrowid
-            
-            imported_records.append({
-                "id": record_id,
-                "enterprise_id": enterprise_id,
-                "batch_id": batch_id,
-                "node_name": node_name,
-                "period": period,
-            })
+    if not rows_by_key:
+        return []
     
-    return imported_records
+    with _DB_WRITE_LOCK, get_connection() as conn, conn:
+        # Весь пакет - одна транзакция с блокировкой записи с самого начала:
+        # один fsync на COMMIT и без SQLITE_BUSY при повышении блокировки посреди пакета
+        conn.execute("BEGIN IMMEDIATE")
+        # Один подготовленный UPSERT на весь пакет вместо SELECT + UPDATE/INSERT на строку
+        conn.executemany(_UPSERT_NODE_CONSUMPTION_SQL, rows_by_key.values())
+        # Все затронутые записи теперь принадлежат batch_id - получаем их id одним запросом
+        id_rows = conn.execute(_SELECT_NODE_CONSUMPTION_IDS_SQL, (enterprise_id, batch_id)).fetchall()
+    
+    ids_by_key = {
+        (row["node_name"], row["period"], row["data_type"]): row["id"] for row in id_rows
+    }
+    return [
+        {
+            "id": ids_by_key.get(key),
+            "enterprise_id": enterprise_id,
+            "batch_id": batch_id,
+            "node_name": key[0],
+            "period": key[1],
+        }
+        for key in keys
+    ]
 
 
 def get_node_consumption(
     enterprise_id: int,
     node_name: Optional[str] = None,
     period: Optional[str] = None,
+    lazy_json: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Получить данные потребления электроэнергии по узлам учёта из БД.
@@ -1904,41 +2186,28 @@ def get_node_consumption(
         enterprise_id: ID предприятия
         node_name: Имя узла учёта (опционально, для фильтрации)
         period: Период (например, "2022-Q1") или None для всех периодов
+        lazy_json: Если True, data_json возвращается как fast_json.LazyJSON
+            и разбирается только при обращении к нему
     
     Returns:
         Список записей потребления по узлам
     """
+    query = _NODE_CONSUMPTION_SQL[(bool(node_name), bool(period))]
+    params: List[Any] = [enterprise_id]
+    if node_name:
+        params.append(node_name)
+    if period:
+        params.append(period)
+    
+    decode = fast_json.LazyJSON if lazy_json else _loads_json_or_none
+    
     with get_connection() as conn:
-        query = """
-            SELECT id, enterprise_id, batch_id, node_name, period,
-                   active_energy_kwh, reactive_energy_kvarh, cost_sum,
-                   data_json, created_at, updated_at
-            FROM node_consumption
-            WHERE enterprise_id = ?
-        """
-        params: List[Any] = [enterprise_id]
-        
-        if node_name:
-            query += " AND node_name = ?"
-            params.append(node_name)
-        
-        if period:
-            query += " AND period = ?"
-            params.append(period)
-        
-        query += " ORDER BY period, node_name"
-        
-        rows = conn.execute(query, params).fetchall()
-        
-        result = []
-        for row in rows:
-            record = _row_to_dict(row)
-            # Парсим JSON, если есть
-            if record.get("data_json"):
-                try:
-                    record["data_json"] = json.loads(record["data_json"])
-                except (json.JSONDecodeError, TypeError):
-                    record["data_json"] = None
-            result.append(record)
-        
-        return result
\ No newline at end of file
+        # Кортежи вместо sqlite3.Row: словари собираются одним проходом по строкам
+        conn.row_factory = None
+        cursor = conn.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        json_index = columns.index("data_json")
+        return [
+            {**dict(zip(columns, row)), "data_json": decode(row[json_index]) if row[json_index] else None}
+            for row in cursor.fetchall()
+        ]
\ No newline at end of file
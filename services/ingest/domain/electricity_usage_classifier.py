@@ -12,27 +12,192 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
-from typing import List, Optional
+import re
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
 
 from ai.ai_excel_semantic_parser import EquipmentItem, NodeItem
 from domain.passport_field_map import (
     ELECTRICITY_USAGE_KEYWORDS,
+    ELECTRICITY_USAGE_KEYWORDS_LOWER,
     ELECTRICITY_USAGE_COLUMN_MAP,
+    ELECTRICITY_USAGE_COLUMN_SET,
     USAGE_CLASSIFICATION_PRIORITY,
     ELECTRICITY_USAGE_TECH,
     ELECTRICITY_USAGE_OWN,
     ELECTRICITY_USAGE_PROD,
     ELECTRICITY_USAGE_HOUSEHOLD,
+    set_electricity_usage_keywords,
 )
 
 logger = logging.getLogger(__name__)
 
+# Aho-Corasick (C-расширение) - один проход по тексту для всех ключевых слов
+try:
+    import ahocorasick
 
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+try:
+    import pandas as pd
+
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+
+def _build_keyword_index() -> Dict[str, Tuple[str, ...]]:
+    """Строит индекс: ключевое слово в нижнем регистре → категории, где оно встречается."""
+    index: Dict[str, Tuple[str, ...]] = {}
+    for category_id, keywords_lower in ELECTRICITY_USAGE_KEYWORDS_LOWER.items():
+        for keyword_lower in keywords_lower:
+            categories = index.get(keyword_lower, ())
+            if category_id not in categories:
+                index[keyword_lower] = categories + (category_id,)
+    return index
+
+
+def _build_keyword_automaton(index: Dict[str, Tuple[str, ...]]):
+    """Собирает автомат Aho-Corasick по индексу ключевых слов (None без pyahocorasick)."""
+    if not HAS_AHOCORASICK or not index:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword_lower, categories in index.items():
+        automaton.add_word(keyword_lower, categories)
+    automaton.make_automaton()
+    return automaton
+
+
+def _keywords_hash(keywords: Mapping[str, Sequence[str]]) -> str:
+    """Отпечаток конфигурации ключевых слов (порядок категорий не важен)."""
+    canonical = repr(sorted((category_id, tuple(kws)) for category_id, kws in keywords.items()))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).hexdigest()
+
+
+_KEYWORDS_HASH = _keywords_hash(ELECTRICITY_USAGE_KEYWORDS)
+_KEYWORD_INDEX = _build_keyword_index()
+_KEYWORD_AUTOMATON = _build_keyword_automaton(_KEYWORD_INDEX)
+
+
+def _find_keyword_categories(text_lower: str) -> Set[str]:
+    """
+    Находит все категории, ключевые слова которых встречаются в тексте.
+
+    Args:
+            text_lower: Текст в нижнем регистре
+
+    Returns:
+            Множество ID категорий
+    """
+    if _KEYWORD_AUTOMATON is not None:
+        return {
+            category
+            for _, categories in _KEYWORD_AUTOMATON.iter(text_lower)
+            for category in categories
+        }
+    return {
+        category
+        for keyword_lower, categories in _KEYWORD_INDEX.items()
+        if keyword_lower in text_lower
+        for category in categories
+    }
+
+
+# Позиция категории в USAGE_CLASSIFICATION_PRIORITY (меньше - приоритетнее)
+_CATEGORY_PRIORITY: Dict[str, int] = {
+    category_id: priority for priority, category_id in enumerate(USAGE_CLASSIFICATION_PRIORITY)
+}
+
+
+def _highest_priority_category(categories) -> Optional[str]:
+    """Самая приоритетная категория из найденных (None, если приоритетных нет)."""
+    return min(
+        (category for category in categories if category in _CATEGORY_PRIORITY),
+        key=_CATEGORY_PRIORITY.__getitem__,
+        default=None,
+    )
+
+
+def classify_usage(text: str) -> Optional[str]:
+    """
+    Классифицирует произвольный текст по ключевым словам категорий.
+
+    Текст приводится к нижнему регистру один раз и просматривается одним
+    проходом автомата Aho-Corasick; при совпадении нескольких категорий
+    выбирается первая по USAGE_CLASSIFICATION_PRIORITY.
+
+    Args:
+            text: Текст ячейки (название, тип, место установки...)
+
+    Returns:
+            ID категории или None, если ключевых слов не найдено
+    """
+    if not text:
+        return None
+    return _classify_usage_cached(text.lower().strip())
+
+
+@lru_cache(maxsize=8192)
+def _classify_usage_cached(text_lower: str) -> Optional[str]:
+    """
+    classify_usage для нормализованного текста.
+
+    Значения колонок ("цех №3", "офис") массово повторяются в строках одного
+    паспорта, поэтому результат кэшируется.
+    """
+    if _KEYWORD_AUTOMATON is None:
+        # Без C-расширения скомпилированные регулярные выражения быстрее
+        # поштучной проверки ключевых слов
+        return classify_usage_regex(text_lower)
+    return _highest_priority_category(_find_keyword_categories(text_lower))
+
+
+# Прямые маппинги строк категории (в нижнем регистре) на ID категорий
+_CATEGORY_ALIASES: Dict[str, str] = {
+    # RU variants
+    "технолог": ELECTRICITY_USAGE_TECH,
+    "технологический": ELECTRICITY_USAGE_TECH,
+    "технология": ELECTRICITY_USAGE_TECH,
+    "собственные нужды": ELECTRICITY_USAGE_OWN,
+    "с.н.": ELECTRICITY_USAGE_OWN,
+    "собств. нужды": ELECTRICITY_USAGE_OWN,
+    "производств": ELECTRICITY_USAGE_PROD,
+    "производственный": ELECTRICITY_USAGE_PROD,
+    "хоз-быт": ELECTRICITY_USAGE_HOUSEHOLD,
+    "хозбыт": ELECTRICITY_USAGE_HOUSEHOLD,
+    "хозяйственно-бытовые": ELECTRICITY_USAGE_HOUSEHOLD,
+    "бытовые": ELECTRICITY_USAGE_HOUSEHOLD,
+    "быт": ELECTRICITY_USAGE_HOUSEHOLD,
+    # EN variants
+    "tech": ELECTRICITY_USAGE_TECH,
+    "techn": ELECTRICITY_USAGE_TECH,
+    "technological": ELECTRICITY_USAGE_TECH,
+    "own": ELECTRICITY_USAGE_OWN,
+    "aux": ELECTRICITY_USAGE_OWN,
+    "own_needs": ELECTRICITY_USAGE_OWN,
+    "prod": ELECTRICITY_USAGE_PROD,
+    "production": ELECTRICITY_USAGE_PROD,
+    "general": ELECTRICITY_USAGE_PROD,
+    "house": ELECTRICITY_USAGE_HOUSEHOLD,
+    "household": ELECTRICITY_USAGE_HOUSEHOLD,
+}
+
+# Значения extra, которые явно означают production (а не default нормализации)
+_EXPLICIT_PROD_VALUES = frozenset({"производств", "production"})
+
+
+@lru_cache(maxsize=2048)
 def _normalize_category_id(category_id: str) -> str:
     """
     Нормализует строку категории к стандартному ID.
 
+    Значения в колонках назначения сильно повторяются ("prod", "техн"...),
+    поэтому результат кэшируется.
+
     Args:
             category_id: Строка с категорией (может быть на RU/UZ/EN)
 
@@ -44,55 +209,37 @@ def _normalize_category_id(category_id: str) -> str:
 
     s = category_id.strip().lower()
 
-    # Прямые маппинги
-    aliases = {
-        # RU variants
-        "технолог": ELECTRICITY_USAGE_TECH,
-        "технологический": ELECTRICITY_USAGE_TECH,
-        "технология": ELECTRICITY_USAGE_TECH,
-        "собственные нужды": ELECTRICITY_USAGE_OWN,
-        "с.н.": ELECTRICITY_USAGE_OWN,
-        "собств. нужды": ELECTRICITY_USAGE_OWN,
-        "производств": ELECTRICITY_USAGE_PROD,
-        "производственный": ELECTRICITY_USAGE_PROD,
-        "хоз-быт": ELECTRICITY_USAGE_HOUSEHOLD,
-        "хозбыт": ELECTRICITY_USAGE_HOUSEHOLD,
-        "хозяйственно-бытовые": ELECTRICITY_USAGE_HOUSEHOLD,
-        "бытовые": ELECTRICITY_USAGE_HOUSEHOLD,
-        "быт": ELECTRICITY_USAGE_HOUSEHOLD,
-        # EN variants
-        "tech": ELECTRICITY_USAGE_TECH,
-        "techn": ELECTRICITY_USAGE_TECH,
-        "technological": ELECTRICITY_USAGE_TECH,
-        "own": ELECTRICITY_USAGE_OWN,
-        "aux": ELECTRICITY_USAGE_OWN,
-        "own_needs": ELECTRICITY_USAGE_OWN,
-        "prod": ELECTRICITY_USAGE_PROD,
-        "production": ELECTRICITY_USAGE_PROD,
-        "general": ELECTRICITY_USAGE_PROD,
-        "house": ELECTRICITY_USAGE_HOUSEHOLD,
-        "household": ELECTRICITY_USAGE_HOUSEHOLD,
-    }
-
     # Проверяем точное совпадение
-    if s in aliases:
-        return aliases[s]
+    if s in _CATEGORY_ALIASES:
+        return _CATEGORY_ALIASES[s]
 
     # Проверяем частичное совпадение
-    for alias, category in aliases.items():
+    for alias, category in _CATEGORY_ALIASES.items():
         if alias in s or s in alias:
             return category
 
-    # Проверяем по ключевым словам из конфигурации
-    for category_id_key, keywords in ELECTRICITY_USAGE_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword.lower() in s:
-                return category_id_key
+    # Проверяем по ключевым словам из конфигурации (индекс уже в нижнем регистре)
+    matched = _find_keyword_categories(s)
+    for category_id_key in ELECTRICITY_USAGE_KEYWORDS:
+        if category_id_key in matched:
+            return category_id_key
 
     # По умолчанию
     return ELECTRICITY_USAGE_PROD
 
 
+# Результаты нормализации для всех известных терминов (алиасы и ключевые слова),
+# вычисленные заранее: точное совпадение не проходит частичный поиск по алиасам
+def _build_direct_category_lookup() -> Dict[str, str]:
+    return {
+        term: _normalize_category_id(term)
+        for term in (*_CATEGORY_ALIASES, *_KEYWORD_INDEX)
+    }
+
+
+_DIRECT_CATEGORY_LOOKUP: Dict[str, str] = _build_direct_category_lookup()
+
+
 def _check_keywords_in_text(text: str, category_id: str) -> bool:
     """
     Проверяет наличие ключевых слов категории в тексте.
@@ -107,14 +254,43 @@ def _check_keywords_in_text(text: str, category_id: str) -> bool:
     if not text:
         return False
 
-    text_lower = text.lower()
-    keywords = ELECTRICITY_USAGE_KEYWORDS.get(category_id, [])
+    return category_id in _find_keyword_categories(text.lower())
+
+
+# Эвристики по location узла учета: (шаблон, категория) в порядке проверки.
+# Компилируются один раз - вместо построения списков и any() на каждый узел
+_NODE_LOCATION_RULES: Tuple[Tuple[re.Pattern, str], ...] = (
+    (re.compile("котельная|котел|подстанц|тп"), ELECTRICITY_USAGE_OWN),
+    (re.compile("офис|админ|склад"), ELECTRICITY_USAGE_HOUSEHOLD),
+    (re.compile("цех|участок"), ELECTRICITY_USAGE_PROD),
+)
+
+
+def _node_locations_lower(nodes: Optional[List[NodeItem]]) -> Tuple[str, ...]:
+    """Непустые location узлов учета в нижнем регистре (в исходном порядке)."""
+    if not nodes:
+        return ()
+    return tuple(
+        location
+        for location in (
+            (node.location or "").lower() for node in nodes if isinstance(node, NodeItem)
+        )
+        if location
+    )
 
-    for keyword in keywords:
-        if keyword.lower() in text_lower:
-            return True
 
-    return False
+def _classify_by_node_locations(
+    item_location_lower: str, node_locations: Tuple[str, ...]
+) -> Optional[str]:
+    """Эвристика по узлам учета для уже приведённых к нижнему регистру location."""
+    for node_location in node_locations:
+        # Если оборудование и узел в одном месте
+        if item_location_lower in node_location or node_location in item_location_lower:
+            for pattern, category_id in _NODE_LOCATION_RULES:
+                if pattern.search(node_location):
+                    return category_id
+
+    return None
 
 
 def _classify_by_nodes(
@@ -135,31 +311,95 @@ def _classify_by_nodes(
     if not nodes or not item.location:
         return None
 
-    item_location_lower = item.location.lower()
+    return _classify_by_node_locations(item.location.lower(), _node_locations_lower(nodes))
 
-    for node in nodes:
-        if not isinstance(node, NodeItem):
-            continue
-
-        node_location = (node.location or "").lower()
-        if not node_location:
-            continue
 
-        # Если оборудование и узел в одном месте
-        if item_location_lower in node_location or node_location in item_location_lower:
-            # Эвристики по location узла
-            if any(
-                kw in node_location for kw in ["котельная", "котел", "подстанц", "тп"]
-            ):
-                return ELECTRICITY_USAGE_OWN
-            if any(kw in node_location for kw in ["офис", "админ", "склад"]):
-                return ELECTRICITY_USAGE_HOUSEHOLD
-            if any(kw in node_location for kw in ["цех", "участок"]):
-                return ELECTRICITY_USAGE_PROD
+def _extract_usage_hints(item: EquipmentItem) -> Tuple[Tuple[str, str], ...]:
+    """
+    Извлекает из extra непустые строковые значения колонок назначения.
 
+    Returns:
+            Кортеж (ключ, значение) в порядке ELECTRICITY_USAGE_COLUMN_MAP
+    """
+    # extra - поле схемы EquipmentItem (dict по умолчанию), getattr не нужен
+    extra = item.extra
+    # Чаще всего колонок назначения в extra нет - проверка пересечения без цикла
+    if not extra or ELECTRICITY_USAGE_COLUMN_SET.isdisjoint(extra):
+        return ()
+
+    return tuple(
+        (key, extra[key])
+        for key in ELECTRICITY_USAGE_COLUMN_MAP
+        if key in extra and isinstance(extra[key], str) and extra[key].strip()
+    )
+
+
+def _classify_by_hints(usage_hints: Tuple[Tuple[str, str], ...]) -> Optional[str]:
+    """Приоритет 1: явное указание категории в extra/metadata."""
+    for key, value in usage_hints:
+        value_lower = value.strip().lower()
+        # Типовые значения - одним обращением к словарю, остальные - нечёткой нормализацией
+        normalized = _DIRECT_CATEGORY_LOOKUP.get(value_lower) or _normalize_category_id(value)
+        if (
+            normalized != ELECTRICITY_USAGE_PROD
+            or value_lower in _EXPLICIT_PROD_VALUES
+        ):
+            logger.debug(f"Классификация по extra.{key}='{value}' → {normalized}")
+            return normalized
     return None
 
 
+@lru_cache(maxsize=2048)
+def _classify_by_fields(
+    name: str,
+    typ: str,
+    location: str,
+    notes: str,
+    usage_hints: Tuple[Tuple[str, str], ...],
+) -> Optional[str]:
+    """
+    Классификация по явному указанию в extra и по ключевым словам (приоритеты 1-2).
+
+    Оборудование в ведомостях часто повторяется (одинаковые насосы, станки),
+    поэтому результат кэшируется по значениям полей.
+
+    Returns:
+            ID категории или None, если ни одно правило не сработало
+    """
+    # Приоритет 1: Явное указание в extra/metadata
+    by_hints = _classify_by_hints(usage_hints)
+    if by_hints:
+        return by_hints
+
+    # Приоритет 2: Анализ по ключевым словам
+    # Собираем все текстовые поля
+    text_fields = [
+        (field_name, field_value)
+        for field_name, field_value in (
+            ("name", name),
+            ("type", typ),
+            ("location", location),
+            ("notes", notes),
+        )
+        if field_value
+    ]
+
+    # Один проход по каждому полю: для каждой категории запоминаем первое совпавшее поле
+    matched_fields: Dict[str, Tuple[str, str]] = {}
+    for field_name, field_value in text_fields:
+        for category_id in _find_keyword_categories(field_value.lower()):
+            matched_fields.setdefault(category_id, (field_name, field_value))
+
+    # Если найдено несколько совпадений, берем первое по приоритету
+    category_id = _highest_priority_category(matched_fields)
+    if category_id:
+        field_name, field_value = matched_fields[category_id]
+        logger.debug(
+            f"Классификация по ключевым словам: {(category_id, field_name, field_value)} → {category_id}"
+        )
+    return category_id
+
+
 def classify_equipment_usage(
     item: EquipmentItem, nodes: Optional[List[NodeItem]] = None
 ) -> str:
@@ -179,64 +419,16 @@ def classify_equipment_usage(
     Returns:
             ID категории использования: "technological", "own_needs", "production", "household"
     """
-    # Приоритет 1: Явное указание в extra/metadata
-    try:
-        extra = getattr(item, "extra", {}) or {}
-        if not isinstance(extra, dict):
-            extra = {}
-
-        # Проверяем возможные ключи
-        for key in ELECTRICITY_USAGE_COLUMN_MAP:
-            if key in extra:
-                value = extra[key]
-                if isinstance(value, str) and value.strip():
-                    normalized = _normalize_category_id(value)
-                    if (
-                        normalized != ELECTRICITY_USAGE_PROD
-                        or value.strip().lower() in ["производств", "production"]
-                    ):
-                        logger.debug(
-                            f"Классификация по extra.{key}='{value}' → {normalized}"
-                        )
-                        return normalized
-    except Exception as e:
-        logger.debug(f"Ошибка при проверке extra: {e}")
-
-    # Приоритет 2: Анализ по ключевым словам
-    # Собираем все текстовые поля
-    text_fields = []
-
-    name = (getattr(item, "name", "") or "").strip()
-    if name:
-        text_fields.append(("name", name))
-
-    typ = (getattr(item, "type", "") or "").strip()
-    if typ:
-        text_fields.append(("type", typ))
-
-    location = (getattr(item, "location", "") or "").strip()
-    if location:
-        text_fields.append(("location", location))
-
-    notes = (getattr(item, "notes", "") or "").strip()
-    if notes:
-        text_fields.append(("notes", notes))
-
-    # Проверяем каждую категорию в порядке приоритета
-    matched_categories = []
-    for category_id in USAGE_CLASSIFICATION_PRIORITY:
-        for field_name, field_value in text_fields:
-            if _check_keywords_in_text(field_value, category_id):
-                matched_categories.append((category_id, field_name, field_value))
-                break  # Одна категория может совпасть только один раз
-
-    # Если найдено несколько совпадений, берем первое по приоритету
-    if matched_categories:
-        result = matched_categories[0][0]
-        logger.debug(
-            f"Классификация по ключевым словам: {matched_categories[0]} → {result}"
-        )
-        return result
+    # Приоритеты 1-2 зависят только от текстовых полей - результат кэшируется
+    category = _classify_by_fields(
+        (item.name or "").strip(),
+        (item.type or "").strip(),
+        (item.location or "").strip(),
+        (item.notes or "").strip(),
+        _extract_usage_hints(item),
+    )
+    if category:
+        return category
 
     # Приоритет 3: Анализ по узлам учета (опционально)
     if nodes:
@@ -248,3 +440,194 @@ def classify_equipment_usage(
     # Приоритет 4: Значение по умолчанию
     logger.debug(f"Классификация по умолчанию → {ELECTRICITY_USAGE_PROD}")
     return ELECTRICITY_USAGE_PROD
+
+
+
+def _build_category_keyword_patterns(index: Dict[str, Tuple[str, ...]]) -> Dict[str, str]:
+    """Альтернация ключевых слов для каждой категории (в порядке приоритета)."""
+    return {
+        category_id: "|".join(
+            re.escape(keyword_lower)
+            for keyword_lower, categories in index.items()
+            if category_id in categories
+        )
+        for category_id in USAGE_CLASSIFICATION_PRIORITY
+    }
+
+
+def _compile_category_keyword_patterns(
+    patterns: Dict[str, str]
+) -> Tuple[Tuple[str, re.Pattern], ...]:
+    """Скомпилированные непустые выражения категорий в порядке приоритета."""
+    return tuple(
+        (category_id, re.compile(pattern)) for category_id, pattern in patterns.items() if pattern
+    )
+
+
+# Регулярные выражения по категориям для пакетной классификации
+_CATEGORY_KEYWORD_PATTERNS: Dict[str, str] = _build_category_keyword_patterns(_KEYWORD_INDEX)
+
+# Те же выражения, скомпилированные один раз, в порядке приоритета
+_CATEGORY_KEYWORD_REGEXES: Tuple[Tuple[str, re.Pattern], ...] = (
+    _compile_category_keyword_patterns(_CATEGORY_KEYWORD_PATTERNS)
+)
+
+
+def classify_usage_regex(text: str) -> Optional[str]:
+    """
+    Классифицирует текст по ключевым словам без pyahocorasick.
+
+    Одна альтернация на категорию: re.search возвращает самое левое совпадение,
+    а не самое приоритетное, поэтому категории проверяются по очереди в порядке
+    USAGE_CLASSIFICATION_PRIORITY. Результат совпадает с classify_usage.
+
+    Args:
+            text: Текст ячейки
+
+    Returns:
+            ID категории или None, если ключевых слов не найдено
+    """
+    if not text:
+        return None
+    text_lower = text.lower()
+    for category_id, regex in _CATEGORY_KEYWORD_REGEXES:
+        if regex.search(text_lower):
+            return category_id
+    return None
+
+
+def classify_series(texts: "pd.Series") -> "pd.Series":
+    """
+    Классифицирует столбец текстов (pandas.Series) по ключевым словам.
+
+    Векторный аналог classify_usage: текст приводится к нижнему регистру
+    один раз, затем для каждой категории в порядке USAGE_CLASSIFICATION_PRIORITY
+    выполняется один str.contains по альтернации её ключевых слов.
+
+    Args:
+            texts: Столбец с текстами (пропуски допустимы)
+
+    Returns:
+            Series с ID категорий (None, если ключевых слов не найдено)
+            с тем же индексом
+    """
+    lowered = texts.astype("string").str.lower()
+    result = pd.Series([None] * len(texts), index=texts.index, dtype=object)
+    unresolved = lowered.notna().to_numpy(dtype=bool, copy=True)
+    for category_id in USAGE_CLASSIFICATION_PRIORITY:
+        pattern = _CATEGORY_KEYWORD_PATTERNS[category_id]
+        if not pattern or not unresolved.any():
+            continue
+        matched = (
+            lowered.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)
+            & unresolved
+        )
+        result[matched] = category_id
+        unresolved &= ~matched
+    return result
+
+
+def classify_equipment_usage_bulk(
+    items: List[EquipmentItem], nodes: Optional[List[NodeItem]] = None
+) -> List[str]:
+    """
+    Классифицирует список оборудования за один проход.
+
+    Результат совпадает с вызовом classify_equipment_usage для каждого элемента,
+    но поиск ключевых слов (приоритет 2) выполняется векторно через
+    pandas.Series.str.contains - по одному регулярному выражению на категорию.
+
+    Args:
+            items: Оборудование для классификации
+            nodes: Список узлов учета (опционально)
+
+    Returns:
+            Список ID категорий той же длины, что и items
+    """
+    if not items:
+        return []
+    if not HAS_PANDAS:
+        return [classify_equipment_usage(item, nodes) for item in items]
+
+    # Приоритет 1: явные указания в extra (встречаются редко - поэлементно)
+    results: List[Optional[str]] = [
+        _classify_by_hints(_extract_usage_hints(item)) for item in items
+    ]
+
+    # Приоритет 2: ключевые слова. Поля разделены переводом строки,
+    # чтобы ключевое слово не совпало на стыке двух полей
+    texts = pd.Series(
+        [
+            "\n".join(
+                (field_value or "").strip()
+                for field_value in (item.name, item.type, item.location, item.notes)
+            ).lower()
+            for item in items
+        ],
+        dtype=object,
+    )
+    unresolved = pd.Series([result is None for result in results])
+    for category_id in USAGE_CLASSIFICATION_PRIORITY:
+        pattern = _CATEGORY_KEYWORD_PATTERNS[category_id]
+        if not pattern or not unresolved.any():
+            continue
+        matched = texts.str.contains(pattern, regex=True) & unresolved
+        for index in matched[matched].index:
+            results[index] = category_id
+        unresolved &= ~matched
+
+    # Приоритеты 3-4: узлы учета (location узлов приводятся к нижнему регистру
+    # один раз на весь список) и значение по умолчанию
+    node_locations = _node_locations_lower(nodes)
+    for index, result in enumerate(results):
+        if result is None:
+            item_location = items[index].location
+            results[index] = (
+                node_locations
+                and item_location
+                and _classify_by_node_locations(item_location.lower(), node_locations)
+            ) or ELECTRICITY_USAGE_PROD
+
+    return results
+
+
+def reload_keywords(keywords: Mapping[str, Sequence[str]]) -> bool:
+    """
+    Заменяет ключевые слова категорий без перезапуска сервиса.
+
+    Обновляет ELECTRICITY_USAGE_KEYWORDS (и производные словари в
+    passport_field_map), пересобирает индекс, автомат Aho-Corasick и
+    регулярные выражения и сбрасывает кэши классификации. Если отпечаток
+    конфигурации не изменился, ничего не делает.
+
+    Args:
+            keywords: {ID категории: ключевые слова}
+
+    Returns:
+            True, если ключевые слова изменились
+    """
+    global _KEYWORDS_HASH, _KEYWORD_INDEX, _KEYWORD_AUTOMATON
+    global _DIRECT_CATEGORY_LOOKUP, _CATEGORY_KEYWORD_PATTERNS, _CATEGORY_KEYWORD_REGEXES
+
+    keywords_hash = _keywords_hash(keywords)
+    if keywords_hash == _KEYWORDS_HASH:
+        return False
+
+    set_electricity_usage_keywords(keywords)
+    index = _build_keyword_index()
+    patterns = _build_category_keyword_patterns(index)
+    regexes = _compile_category_keyword_patterns(patterns)
+    automaton = _build_keyword_automaton(index)
+
+    _KEYWORD_INDEX = index
+    _KEYWORD_AUTOMATON = automaton
+    _CATEGORY_KEYWORD_PATTERNS = patterns
+    _CATEGORY_KEYWORD_REGEXES = regexes
+    _normalize_category_id.cache_clear()
+    _DIRECT_CATEGORY_LOOKUP = _build_direct_category_lookup()
+    _classify_by_fields.cache_clear()
+    _classify_usage_cached.cache_clear()
+    _KEYWORDS_HASH = keywords_hash
+
+    logger.info(f"Ключевые слова классификации обновлены (отпечаток {keywords_hash})")
+    return True
@@ -6,14 +6,23 @@
 """
 
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+import math
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from dataclasses import dataclass
 
 try:
-    from .energy_units import HOURS_PER_YEAR, MONTHS_PER_QUARTER
+    from .energy_units import HOURS_PER_MONTH, HOURS_PER_YEAR, MONTHS_PER_QUARTER
 except ImportError:
     # Fallback для случаев, когда модуль импортируется напрямую
-    from energy_units import HOURS_PER_YEAR, MONTHS_PER_QUARTER
+    from energy_units import HOURS_PER_MONTH, HOURS_PER_YEAR, MONTHS_PER_QUARTER
+
+# NumPy - для пакетных расчётов по многим кварталам сразу (опционально)
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +32,7 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class QuarterData:
     """Данные по кварталу."""
 
@@ -43,7 +52,7 @@ class QuarterData:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class EquipmentData:
     """Данные по оборудованию."""
 
@@ -53,7 +62,7 @@ class EquipmentData:
     vfd_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class LossesData:
     """Данные по потерям."""
 
@@ -68,6 +77,16 @@ class LossesData:
 # ============================================================================
 
 
+def _clamp01(value: float) -> float:
+    """Ограничивает значение диапазоном [0, 1] (NaN даёт 0)."""
+    return 1.0 if value > 1.0 else (value if value > 0.0 else 0.0)
+
+
+def _clamp100(value: float) -> float:
+    """Ограничивает значение диапазоном [0, 100] (NaN даёт 0)."""
+    return 100.0 if value > 100.0 else (value if value > 0.0 else 0.0)
+
+
 def calculate_quarter_losses(loss_month_kwh: float) -> float:
     """
     Расчёт потерь за квартал.
@@ -121,7 +140,7 @@ def calculate_loss_percentage(
         return 0.0
 
     percentage = (loss_kwh / total_energy) * 100.0
-    return min(100.0, max(0.0, percentage))  # Ограничиваем 0-100%
+    return _clamp100(percentage)  # Ограничиваем 0-100%
 
 
 def calculate_specific_consumption(
@@ -210,11 +229,11 @@ def calculate_equipment_usage_coefficient(
     coefficient = used_power_kw / installed_power_kw
 
     # Коэффициент не может быть больше 1.0
-    return min(1.0, max(0.0, coefficient))
+    return _clamp01(coefficient)
 
 
 def calculate_annual_consumption_from_power(
-    power_kw: float, hours_per_year: float = None
+    power_kw: float, hours_per_year: float = HOURS_PER_YEAR
 ) -> float:
     """
     Расчёт годового потребления из мощности.
@@ -230,9 +249,6 @@ def calculate_annual_consumption_from_power(
     Returns:
         Годовое потребление, кВт·ч
     """
-    if hours_per_year is None:
-        hours_per_year = HOURS_PER_YEAR
-
     if power_kw < 0:
         logger.warning(f"Отрицательная мощность: {power_kw} кВт. Использую 0.")
         power_kw = 0.0
@@ -241,7 +257,7 @@ def calculate_annual_consumption_from_power(
 
 
 def calculate_consumption_from_monthly_power(
-    monthly_power_kw: float, hours_per_month: float = None
+    monthly_power_kw: float, hours_per_month: float = HOURS_PER_MONTH
 ) -> float:
     """
     Расчёт месячного потребления из средней мощности за месяц.
@@ -257,14 +273,6 @@ def calculate_consumption_from_monthly_power(
     Returns:
         Месячное потребление, кВт·ч
     """
-    try:
-        from .energy_units import HOURS_PER_MONTH
-    except ImportError:
-        from energy_units import HOURS_PER_MONTH
-
-    if hours_per_month is None:
-        hours_per_month = HOURS_PER_MONTH
-
     if monthly_power_kw < 0:
         logger.warning(f"Отрицательная мощность: {monthly_power_kw} кВт. Использую 0.")
         monthly_power_kw = 0.0
@@ -273,7 +281,7 @@ def calculate_consumption_from_monthly_power(
 
 
 def calculate_quarter_consumption_from_monthly_power(
-    monthly_power_kw: float, hours_per_month: float = None
+    monthly_power_kw: float, hours_per_month: float = HOURS_PER_MONTH
 ) -> float:
     """
     Расчёт квартального потребления из средней мощности за месяц.
@@ -292,16 +300,11 @@ def calculate_quarter_consumption_from_monthly_power(
     monthly_consumption = calculate_consumption_from_monthly_power(
         monthly_power_kw, hours_per_month
     )
-    try:
-        from .energy_units import MONTHS_PER_QUARTER
-    except ImportError:
-        from energy_units import MONTHS_PER_QUARTER
-
     return monthly_consumption * MONTHS_PER_QUARTER
 
 
 def calculate_quarter_reactive_consumption_from_monthly_power(
-    monthly_reactive_power_kvar: float, hours_per_month: float = None
+    monthly_reactive_power_kvar: float, hours_per_month: float = HOURS_PER_MONTH
 ) -> float:
     """
     Расчёт квартального реактивного потребления из средней реактивной мощности за месяц.
@@ -317,14 +320,6 @@ def calculate_quarter_reactive_consumption_from_monthly_power(
     Returns:
         Квартальное реактивное потребление, кВАр·ч
     """
-    try:
-        from .energy_units import HOURS_PER_MONTH, MONTHS_PER_QUARTER
-    except ImportError:
-        from energy_units import HOURS_PER_MONTH, MONTHS_PER_QUARTER
-
-    if hours_per_month is None:
-        hours_per_month = HOURS_PER_MONTH
-
     if monthly_reactive_power_kvar < 0:
         logger.warning(
             f"Отрицательная реактивная мощность: {monthly_reactive_power_kvar} кВАр. Использую 0."
@@ -391,17 +386,14 @@ def calculate_balance_total(
     Returns:
         Итого, кВт·ч
     """
-    # Нормализуем отрицательные значения
-    values = [technological, own_needs, production, household]
-    normalized = [max(0.0, v) if v is not None else 0.0 for v in values]
-
-    total = sum(normalized)
-
-    if total < 0:
-        logger.warning(f"Отрицательный итог баланса: {total} кВт·ч. Возвращаю 0.")
-        return 0.0
-
-    return total
+    # Отрицательные и пустые (None) значения считаются равными 0,
+    # поэтому итог не может быть отрицательным
+    return (
+        (technological if technological and technological > 0 else 0.0)
+        + (own_needs if own_needs and own_needs > 0 else 0.0)
+        + (production if production and production > 0 else 0.0)
+        + (household if household and household > 0 else 0.0)
+    )
 
 
 def distribute_quarter_by_usage_categories(
@@ -453,6 +445,53 @@ def distribute_quarter_by_usage_categories(
     return result
 
 
+def distribute_quarters_by_usage_categories_batch(
+    quarter_totals: "np.ndarray", yearly_matrix: "np.ndarray"
+) -> "np.ndarray":
+    """
+    Пакетное распределение потребления многих кварталов по категориям.
+
+    Векторный аналог distribute_quarter_by_usage_categories: одна операция NumPy
+    на весь пакет вместо цикла по категориям для каждого квартала.
+
+    Формула: Категория_квартал = (Категория_год / Итого_год) * Итого_квартал
+
+    Единицы: кВт·ч
+
+    Args:
+        quarter_totals: Итого по кварталам, форма (n_quarters,)
+        yearly_matrix: Годовые значения категорий, форма (n_quarters, n_categories)
+
+    Returns:
+        Распределение по категориям, форма (n_quarters, n_categories)
+
+    Edge-кейсы:
+        - Отрицательные годовые значения категорий считаются равными 0
+        - Строки с годовым итогом <= 0 распределяются равномерно
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("Для пакетного распределения требуется numpy")
+
+    quarter_totals = np.asarray(quarter_totals, dtype=np.float64)
+    yearly_matrix = np.asarray(yearly_matrix, dtype=np.float64)
+    n_categories = yearly_matrix.shape[1]
+    if n_categories == 0:
+        return np.empty_like(yearly_matrix)
+
+    # Итог считается по исходным значениям - как в скалярной версии
+    yearly_totals = yearly_matrix.sum(axis=1, keepdims=True)
+    has_total = yearly_totals > 0
+    quarter_column = quarter_totals[:, None]
+
+    proportional = np.maximum(
+        np.clip(yearly_matrix, 0.0, None)
+        / np.where(has_total, yearly_totals, 1.0)
+        * quarter_column,
+        0.0,
+    )
+    return np.where(has_total, proportional, quarter_column / n_categories)
+
+
 def calculate_equipment_used_power(
     installed_power_kw: float, usage_factor: float = 0.8
 ) -> float:
@@ -481,7 +520,7 @@ def calculate_equipment_used_power(
             f"Некорректный коэффициент использования: {usage_factor}. "
             f"Ограничиваю до диапазона [0, 1]."
         )
-        usage_factor = max(0.0, min(1.0, usage_factor))
+        usage_factor = _clamp01(usage_factor)
 
     return installed_power_kw * usage_factor
 
@@ -491,6 +530,37 @@ def calculate_equipment_used_power(
 # ============================================================================
 
 
+def _sum_positive_numeric(values: Dict[str, Any]) -> float:
+    """Сумма положительных числовых значений словаря (прочие значения пропускаются)."""
+    total = 0.0
+    for value in values.values():
+        if isinstance(value, (int, float)) and value > 0:
+            total += value
+    return total
+
+
+# Ключи quarter_totals с объёмом ресурса, в порядке приоритета.
+# Единая таблица диспетчеризации по resource_type вместо цепочек if/elif
+_RESOURCE_TOTAL_KEYS: Dict[str, Tuple[str, ...]] = {
+    "electricity": ("active_kwh",),
+    "gas": ("volume_m3",),
+    "water": ("volume_m3",),
+    "fuel": ("volume_ton", "volume_t"),
+    "coal": ("volume_ton", "volume_t"),
+    "heat": ("volume_gcal",),
+}
+
+_COST_TOTAL_KEYS: Tuple[str, ...] = ("cost_sum",)
+
+
+def _quarter_total_value(totals: Dict[str, Any], key_priority: Tuple[str, ...]) -> float:
+    """Значение первого присутствующего ключа из key_priority; пустые значения дают 0."""
+    for key in key_priority:
+        if key in totals:
+            return totals[key] or 0
+    return 0
+
+
 def extract_quarter_data(quarter: str, agg_data: Dict[str, Any]) -> QuarterData:
     """
     Извлекает и нормализует данные по кварталу.
@@ -508,45 +578,38 @@ def extract_quarter_data(quarter: str, agg_data: Dict[str, Any]) -> QuarterData:
     year = int(quarter.split("-")[0]) if "-" in quarter else 2022
     quarter_num = int(quarter.split("-Q")[1]) if "-Q" in quarter else 1
 
+    # Ссылка на метод вместо повторного поиска атрибута для каждого ресурса
+    resources_get = resources.get
+
     # Электроэнергия
-    electricity = resources.get("electricity", {}).get(quarter, {})
+    electricity = resources_get("electricity", {}).get(quarter, {})
     elec_totals = electricity.get("quarter_totals", {})
-    active_kwh = elec_totals.get("active_kwh", 0) or 0
-    reactive_kvarh = elec_totals.get("reactive_kvarh", 0) or 0
+    active_kwh = elec_totals.get("active_kwh") or 0.0
+    reactive_kvarh = elec_totals.get("reactive_kvarh") or 0.0
 
     # Газ
-    gas = resources.get("gas", {}).get(quarter, {})
-    gas_totals = gas.get("quarter_totals", {})
-    gas_m3 = gas_totals.get("volume_m3", 0) or 0
+    gas_totals = resources_get("gas", {}).get(quarter, {}).get("quarter_totals", {})
+    gas_m3 = gas_totals.get("volume_m3") or 0.0
 
     # Вода
-    water = resources.get("water", {}).get(quarter, {})
-    water_totals = water.get("quarter_totals", {})
-    water_m3 = water_totals.get("volume_m3", 0) or 0
+    water_totals = resources_get("water", {}).get(quarter, {}).get("quarter_totals", {})
+    water_m3 = water_totals.get("volume_m3") or 0.0
 
     # Топливо
-    fuel = resources.get("fuel", {}).get(quarter, {})
-    fuel_totals = fuel.get("quarter_totals", {})
-    fuel_ton = fuel_totals.get("volume_ton", fuel_totals.get("volume_t", 0)) or 0
+    fuel_totals = resources_get("fuel", {}).get(quarter, {}).get("quarter_totals", {})
+    fuel_ton = _quarter_total_value(fuel_totals, _RESOURCE_TOTAL_KEYS["fuel"])
 
     # Уголь
-    coal = resources.get("coal", {}).get(quarter, {})
-    coal_totals = coal.get("quarter_totals", {})
-    coal_ton = coal_totals.get("volume_ton", coal_totals.get("volume_t", 0)) or 0
+    coal_totals = resources_get("coal", {}).get(quarter, {}).get("quarter_totals", {})
+    coal_ton = _quarter_total_value(coal_totals, _RESOURCE_TOTAL_KEYS["coal"])
 
     # Тепло
-    heat = resources.get("heat", {}).get(quarter, {})
-    heat_totals = heat.get("quarter_totals", {})
-    heat_gcal = heat_totals.get("volume_gcal", 0) or 0
+    heat_totals = resources_get("heat", {}).get(quarter, {}).get("quarter_totals", {})
+    heat_gcal = heat_totals.get("volume_gcal") or 0.0
 
     # Производство
-    production = resources.get("production", {}).get(quarter, {})
-    prod_totals = production.get("quarter_totals", {})
-    production_kg = (
-        sum(v for v in prod_totals.values() if isinstance(v, (int, float)) and v > 0)
-        if prod_totals
-        else 0.0
-    )
+    prod_totals = resources_get("production", {}).get(quarter, {}).get("quarter_totals", {})
+    production_kg = _sum_positive_numeric(prod_totals) if prod_totals else 0.0
 
     # Категории потребления
     by_usage = electricity.get("by_usage")
@@ -567,6 +630,81 @@ def extract_quarter_data(quarter: str, agg_data: Dict[str, Any]) -> QuarterData:
     )
 
 
+# Поля QuarterData по ресурсам: (поле, ключи quarter_totals в порядке приоритета)
+_QUARTER_ARRAY_FIELDS: Dict[str, Tuple[Tuple[str, Tuple[str, ...]], ...]] = {
+    "electricity": (
+        ("electricity_active_kwh", _RESOURCE_TOTAL_KEYS["electricity"]),
+        ("electricity_reactive_kvarh", ("reactive_kvarh",)),
+    ),
+    "gas": (("gas_m3", _RESOURCE_TOTAL_KEYS["gas"]),),
+    "water": (("water_m3", _RESOURCE_TOTAL_KEYS["water"]),),
+    "fuel": (("fuel_ton", _RESOURCE_TOTAL_KEYS["fuel"]),),
+    "coal": (("coal_ton", _RESOURCE_TOTAL_KEYS["coal"]),),
+    "heat": (("heat_gcal", _RESOURCE_TOTAL_KEYS["heat"]),),
+}
+
+
+def extract_all_quarters(agg_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Извлекает данные всех кварталов сразу в виде массивов (по массиву на поле).
+
+    Пакетный аналог extract_quarter_data: каждый ресурс обходится один раз,
+    а дальнейшие расчёты по кварталам выполняются как операции над массивами.
+
+    Args:
+        agg_data: Агрегированные данные
+
+    Returns:
+        Словарь:
+        {
+            "quarters": ["2022-Q1", ...],  # отсортированные кварталы
+            "electricity_active_kwh": np.ndarray,
+            ...  # остальные числовые поля QuarterData
+            "production_kg": np.ndarray,
+        }
+        Кварталы, отсутствующие у ресурса, заполняются нулями.
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("Для пакетного извлечения кварталов требуется numpy")
+
+    resources = agg_data.get("resources", {})
+    quarter_sources = list(_QUARTER_ARRAY_FIELDS) + ["production"]
+
+    quarters = sorted(
+        {
+            quarter
+            for resource_type in quarter_sources
+            for quarter, quarter_data in resources.get(resource_type, {}).items()
+            if isinstance(quarter_data, dict)
+        }
+    )
+    quarter_index = {quarter: index for index, quarter in enumerate(quarters)}
+    count = len(quarters)
+
+    result: Dict[str, Any] = {"quarters": quarters}
+    for resource_type, fields in _QUARTER_ARRAY_FIELDS.items():
+        columns = [np.zeros(count, dtype=np.float64) for _ in fields]
+        for quarter, quarter_data in resources.get(resource_type, {}).items():
+            if not isinstance(quarter_data, dict):
+                continue
+            totals = quarter_data.get("quarter_totals", {})
+            index = quarter_index[quarter]
+            for column, (_, key_priority) in zip(columns, fields):
+                column[index] = _quarter_total_value(totals, key_priority)
+        for column, (field_name, _) in zip(columns, fields):
+            result[field_name] = column
+
+    production_kg = np.zeros(count, dtype=np.float64)
+    for quarter, quarter_data in resources.get("production", {}).items():
+        if isinstance(quarter_data, dict):
+            prod_totals = quarter_data.get("quarter_totals", {})
+            if prod_totals:
+                production_kg[quarter_index[quarter]] = _sum_positive_numeric(prod_totals)
+    result["production_kg"] = production_kg
+
+    return result
+
+
 def extract_equipment_data(equipment_data: Dict[str, Any]) -> EquipmentData:
     """
     Извлекает данные по оборудованию.
@@ -631,11 +769,59 @@ def validate_quarter_data(quarter_data: QuarterData) -> Tuple[bool, List[str]]:
     return is_valid, warnings
 
 
+def validate_quarters_bulk(
+    quarters_data: List[QuarterData],
+) -> List[Tuple[bool, List[str]]]:
+    """
+    Валидирует список кварталов за один векторный проход.
+
+    Результат совпадает с validate_quarter_data для каждого элемента:
+    проверки выполняются сравнениями массивов NumPy, а сообщения
+    формируются только для кварталов с нарушениями.
+
+    Returns:
+        Список (is_valid, list_of_warnings) той же длины, что и quarters_data
+    """
+    if not HAS_NUMPY:
+        return [validate_quarter_data(quarter_data) for quarter_data in quarters_data]
+
+    count = len(quarters_data)
+    active = np.fromiter(
+        (q.electricity_active_kwh for q in quarters_data), dtype=np.float64, count=count
+    )
+    gas = np.fromiter((q.gas_m3 for q in quarters_data), dtype=np.float64, count=count)
+    production = np.fromiter(
+        (q.production_kg for q in quarters_data), dtype=np.float64, count=count
+    )
+
+    flagged = (active < 0) | (gas < 0) | (production < 0) | (active > 100000000)
+
+    results: List[Tuple[bool, List[str]]] = [(True, []) for _ in range(count)]
+    for index in np.flatnonzero(flagged):
+        results[index] = validate_quarter_data(quarters_data[index])
+    return results
+
+
 # ============================================================================
 # Функции для агрегации данных по всем кварталам (для Word-отчётов)
 # ============================================================================
 
 
+def _iter_quarter_totals(
+    resource_data: Dict[str, Any], key_priority: Tuple[str, ...]
+) -> Iterator[float]:
+    """
+    Значения quarter_totals по всем кварталам ресурса.
+
+    Для каждого квартала берётся первый присутствующий ключ из key_priority;
+    отсутствующие и пустые значения дают 0.
+    """
+    for quarter_data in resource_data.values():
+        if not isinstance(quarter_data, dict):
+            continue
+        yield _quarter_total_value(quarter_data.get("quarter_totals", {}), key_priority)
+
+
 def calculate_total_consumption_by_resource(
     agg_data: Dict[str, Any], resource_type: str
 ) -> float:
@@ -653,25 +839,12 @@ def calculate_total_consumption_by_resource(
         - Для fuel, coal: т
         - Для heat: Гкал
     """
-    resources = agg_data.get("resources", {})
-    resource_data = resources.get(resource_type, {})
-
-    total = 0.0
-
-    for quarter_data in resource_data.values():
-        if isinstance(quarter_data, dict):
-            totals = quarter_data.get("quarter_totals", {})
+    key_priority = _RESOURCE_TOTAL_KEYS.get(resource_type)
+    if key_priority is None:
+        return 0.0
 
-            if resource_type == "electricity":
-                total += totals.get("active_kwh", 0) or 0
-            elif resource_type in ("gas", "water"):
-                total += totals.get("volume_m3", 0) or 0
-            elif resource_type in ("fuel", "coal"):
-                total += totals.get("volume_ton", totals.get("volume_t", 0)) or 0
-            elif resource_type == "heat":
-                total += totals.get("volume_gcal", 0) or 0
-
-    return total
+    resource_data = agg_data.get("resources", {}).get(resource_type, {})
+    return math.fsum(_iter_quarter_totals(resource_data, key_priority))
 
 
 def calculate_total_cost_by_resource(
@@ -687,17 +860,8 @@ def calculate_total_cost_by_resource(
     Returns:
         Общие затраты, сум
     """
-    resources = agg_data.get("resources", {})
-    resource_data = resources.get(resource_type, {})
-
-    total_cost = 0.0
-
-    for quarter_data in resource_data.values():
-        if isinstance(quarter_data, dict):
-            totals = quarter_data.get("quarter_totals", {})
-            total_cost += totals.get("cost_sum", 0) or 0
-
-    return total_cost
+    resource_data = agg_data.get("resources", {}).get(resource_type, {})
+    return math.fsum(_iter_quarter_totals(resource_data, _COST_TOTAL_KEYS))
 
 
 def calculate_total_costs(agg_data: Dict[str, Any]) -> Dict[str, float]:
@@ -716,18 +880,17 @@ def calculate_total_costs(agg_data: Dict[str, Any]) -> Dict[str, float]:
             "total": float
         }
     """
-    electricity_cost = calculate_total_cost_by_resource(agg_data, "electricity")
-    gas_cost = calculate_total_cost_by_resource(agg_data, "gas")
-    water_cost = calculate_total_cost_by_resource(agg_data, "water")
-
-    total = electricity_cost + gas_cost + water_cost
-
-    return {
-        "electricity": electricity_cost,
-        "gas": gas_cost,
-        "water": water_cost,
-        "total": total,
+    # Один проход: resources извлекается один раз для всех трёх ресурсов
+    resources = agg_data.get("resources", {})
+    costs = {
+        resource_type: math.fsum(
+            _iter_quarter_totals(resources.get(resource_type, {}), _COST_TOTAL_KEYS)
+        )
+        for resource_type in ("electricity", "gas", "water")
     }
+    costs["total"] = costs["electricity"] + costs["gas"] + costs["water"]
+
+    return costs
 
 
 def calculate_average_payback_period(
@@ -5,9 +5,17 @@
 между ними для обеспечения консистентности расчётов.
 """
 
-from typing import Union
+from functools import lru_cache
+from typing import Callable, Tuple, Union
 from enum import Enum
 
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 class EnergyUnit(Enum):
     """Единицы измерения энергии."""
@@ -109,129 +117,302 @@ QUARTERS_PER_YEAR = 4.0
 # Функции конвертации
 
 
+def _unit_factors(factors: dict) -> dict:
+    """Дополняет таблицу {член Enum: множитель} ключами-строками (значениями Enum)."""
+    return {**factors, **{unit.value: factor for unit, factor in factors.items()}}
+
+
+# Множители приведения к базовой единице. Ключи - и члены Enum, и их строковые
+# значения: конвертация сводится к одному поиску в словаре без создания Enum
+_TO_KWH = _unit_factors(
+    {
+        EnergyUnit.KWH: 1.0,
+        EnergyUnit.MWH: MWH_TO_KWH,
+        EnergyUnit.GWH: GWH_TO_KWH,
+    }
+)
+
+_TO_KVARH = _unit_factors(
+    {
+        EnergyUnit.KVARH: 1.0,
+        EnergyUnit.MVARH: MVARH_TO_KVARH,
+    }
+)
+
+_TO_M3 = _unit_factors(
+    {
+        VolumeUnit.M3: 1.0,
+        VolumeUnit.THOUSAND_M3: THOUSAND_M3_TO_M3,
+        VolumeUnit.LITER: LITER_TO_M3,
+    }
+)
+
+_TO_TON = _unit_factors(
+    {
+        VolumeUnit.TON: 1.0,
+        VolumeUnit.KG: KG_TO_TON,
+    }
+)
+
+_TO_GCAL = _unit_factors(
+    {
+        HeatUnit.GCAL: 1.0,
+        HeatUnit.KCAL: KCAL_TO_GCAL,
+        HeatUnit.GJ: GJ_TO_GCAL,
+        HeatUnit.MJ: GJ_TO_GCAL * 0.001,  # МДж -> ГДж -> Гкал
+        HeatUnit.MWH_HEAT: MWH_TO_GCAL,
+    }
+)
+
+# Составные конвертации - тоже одной таблицей: множители посчитаны заранее,
+# а тождественные переходы точны (ГДж → ГДж = 1.0, а не GJ_TO_GCAL * GCAL_TO_GJ)
+_TO_MWH = _unit_factors(
+    {
+        EnergyUnit.KWH: KWH_TO_MWH,
+        EnergyUnit.MWH: 1.0,
+        EnergyUnit.GWH: GWH_TO_KWH * KWH_TO_MWH,
+    }
+)
+
+_TO_GJ = _unit_factors(
+    {
+        HeatUnit.GJ: 1.0,
+        HeatUnit.MJ: 0.001,
+        HeatUnit.GCAL: GCAL_TO_GJ,
+        HeatUnit.KCAL: KCAL_TO_GCAL * GCAL_TO_GJ,
+        HeatUnit.MWH_HEAT: MWH_TO_GCAL * GCAL_TO_GJ,
+    }
+)
+
+
+def _factor_array(table: dict) -> Tuple[dict, "np.ndarray"]:
+    """
+    Таблица множителей в виде кодов единиц и непрерывного массива множителей.
+
+    Член Enum и его строковое значение получают один код - индекс в массиве,
+    так что пакетная конвертация - это np.take по кодам и одно умножение.
+    """
+    codes = {}
+    factors = []
+    for unit, factor in table.items():
+        if isinstance(unit, Enum):
+            codes[unit] = codes[unit.value] = len(factors)
+            factors.append(factor)
+    return codes, np.array(factors, dtype=np.float64)
+
+
+if HAS_NUMPY:
+    _KWH_CODES, _KWH_FACTORS = _factor_array(_TO_KWH)
+    _KVARH_CODES, _KVARH_FACTORS = _factor_array(_TO_KVARH)
+    _M3_CODES, _M3_FACTORS = _factor_array(_TO_M3)
+    _TON_CODES, _TON_FACTORS = _factor_array(_TO_TON)
+    _GCAL_CODES, _GCAL_FACTORS = _factor_array(_TO_GCAL)
+
+
+def _convert_array(
+    values: "np.ndarray", units, codes: dict, factors: "np.ndarray", target: str
+) -> "np.ndarray":
+    """Пакетная конвертация по кодам единиц; неизвестная единица - ValueError."""
+    if not HAS_NUMPY:
+        raise RuntimeError("Для пакетной конвертации требуется numpy")
+
+    values = np.asarray(values, dtype=np.float64)
+    units = list(units)
+    try:
+        unit_codes = np.fromiter(
+            (codes[unit] for unit in units), dtype=np.intp, count=len(units)
+        )
+    except KeyError as e:
+        raise ValueError(
+            f"Неподдерживаемая единица для конвертации в {target}: {e.args[0]}"
+        ) from None
+    return values * np.take(factors, unit_codes).reshape(values.shape)
+
+
 def to_kwh(value: float, from_unit: Union[str, EnergyUnit]) -> float:
     """Конвертирует значение в кВт·ч."""
-    if isinstance(from_unit, str):
-        from_unit = EnergyUnit(from_unit)
-
-    if from_unit == EnergyUnit.KWH:
-        return value
-    elif from_unit == EnergyUnit.MWH:
-        return value * MWH_TO_KWH
-    elif from_unit == EnergyUnit.GWH:
-        return value * GWH_TO_KWH
-    else:
+    try:
+        return value * _TO_KWH[from_unit]
+    except KeyError:
         raise ValueError(
             f"Неподдерживаемая единица для конвертации в кВт·ч: {from_unit}"
-        )
+        ) from None
 
 
 def to_mwh(value: float, from_unit: Union[str, EnergyUnit]) -> float:
     """Конвертирует значение в МВт·ч."""
-    return to_kwh(value, from_unit) * KWH_TO_MWH
+    try:
+        return value * _TO_MWH[from_unit]
+    except KeyError:
+        raise ValueError(
+            f"Неподдерживаемая единица для конвертации в МВт·ч: {from_unit}"
+        ) from None
 
 
 def to_kvarh(value: float, from_unit: Union[str, EnergyUnit]) -> float:
     """Конвертирует значение в кВАр·ч."""
-    if isinstance(from_unit, str):
-        from_unit = EnergyUnit(from_unit)
-
-    if from_unit == EnergyUnit.KVARH:
-        return value
-    elif from_unit == EnergyUnit.MVARH:
-        return value * MVARH_TO_KVARH
-    else:
+    try:
+        return value * _TO_KVARH[from_unit]
+    except KeyError:
         raise ValueError(
             f"Неподдерживаемая единица для конвертации в кВАр·ч: {from_unit}"
-        )
+        ) from None
 
 
 def to_m3(value: float, from_unit: Union[str, VolumeUnit]) -> float:
     """Конвертирует значение в м³."""
-    if isinstance(from_unit, str):
-        from_unit = VolumeUnit(from_unit)
-
-    if from_unit == VolumeUnit.M3:
-        return value
-    elif from_unit == VolumeUnit.THOUSAND_M3:
-        return value * THOUSAND_M3_TO_M3
-    elif from_unit == VolumeUnit.LITER:
-        return value * LITER_TO_M3
-    else:
-        raise ValueError(f"Неподдерживаемая единица для конвертации в м³: {from_unit}")
+    try:
+        return value * _TO_M3[from_unit]
+    except KeyError:
+        raise ValueError(
+            f"Неподдерживаемая единица для конвертации в м³: {from_unit}"
+        ) from None
 
 
 def to_ton(value: float, from_unit: Union[str, VolumeUnit]) -> float:
     """Конвертирует значение в тонны."""
-    if isinstance(from_unit, str):
-        from_unit = VolumeUnit(from_unit)
-
-    if from_unit == VolumeUnit.TON:
-        return value
-    elif from_unit == VolumeUnit.KG:
-        return value * KG_TO_TON
-    else:
+    try:
+        return value * _TO_TON[from_unit]
+    except KeyError:
         raise ValueError(
             f"Неподдерживаемая единица для конвертации в тонны: {from_unit}"
-        )
+        ) from None
 
 
 def to_gcal(value: float, from_unit: Union[str, HeatUnit]) -> float:
     """Конвертирует значение в Гкал."""
-    if isinstance(from_unit, str):
-        from_unit = HeatUnit(from_unit)
-
-    if from_unit == HeatUnit.GCAL:
-        return value
-    elif from_unit == HeatUnit.KCAL:
-        return value * KCAL_TO_GCAL
-    elif from_unit == HeatUnit.GJ:
-        return value * GJ_TO_GCAL
-    elif from_unit == HeatUnit.MJ:
-        return value * GJ_TO_GCAL * 0.001  # МДж -> ГДж -> Гкал
-    elif from_unit == HeatUnit.MWH_HEAT:
-        return value * MWH_TO_GCAL
-    else:
+    try:
+        return value * _TO_GCAL[from_unit]
+    except KeyError:
         raise ValueError(
             f"Неподдерживаемая единица для конвертации в Гкал: {from_unit}"
-        )
+        ) from None
 
 
 def to_gj(value: float, from_unit: Union[str, HeatUnit]) -> float:
     """Конвертирует значение в ГДж."""
-    return to_gcal(value, from_unit) * GCAL_TO_GJ
+    try:
+        return value * _TO_GJ[from_unit]
+    except KeyError:
+        raise ValueError(
+            f"Неподдерживаемая единица для конвертации в ГДж: {from_unit}"
+        ) from None
 
 
-def normalize_energy_to_kwh(value: float, unit: str) -> float:
+def to_kwh_array(values: "np.ndarray", units) -> "np.ndarray":
     """
-    Нормализует значение энергии к кВт·ч.
+    Пакетный вариант to_kwh: значения и единицы (строки или члены Enum) поэлементно.
 
     Args:
-        value: Значение
-        unit: Единица измерения (строка)
+        values: Значения
+        units: Единицы измерения, по одной на значение
 
     Returns:
-        Значение в кВт·ч
+        Массив значений в кВт·ч
     """
+    return _convert_array(values, units, _KWH_CODES, _KWH_FACTORS, "кВт·ч")
+
+
+def to_kvarh_array(values: "np.ndarray", units) -> "np.ndarray":
+    """Пакетный вариант to_kvarh."""
+    return _convert_array(values, units, _KVARH_CODES, _KVARH_FACTORS, "кВАр·ч")
+
+
+def to_m3_array(values: "np.ndarray", units) -> "np.ndarray":
+    """Пакетный вариант to_m3."""
+    return _convert_array(values, units, _M3_CODES, _M3_FACTORS, "м³")
+
+
+def to_ton_array(values: "np.ndarray", units) -> "np.ndarray":
+    """Пакетный вариант to_ton."""
+    return _convert_array(values, units, _TON_CODES, _TON_FACTORS, "тонны")
+
+
+def to_gcal_array(values: "np.ndarray", units) -> "np.ndarray":
+    """Пакетный вариант to_gcal."""
+    return _convert_array(values, units, _GCAL_CODES, _GCAL_FACTORS, "Гкал")
+
+
+# Различных строк единиц в данных немного: множители кэшируются по самой
+# строке, повторный вызов - один поиск в кэше вместо цепочки проверок
+@lru_cache(maxsize=1024)
+def _energy_to_kwh_factor(unit: str) -> float:
+    """Множитель строковой единицы энергии к кВт·ч (неизвестная единица - 1.0)."""
     unit_upper = unit.upper()
 
-    # Электроэнергия
+    # Проверки идут по порядку, первое совпадение определяет множитель
     if "КВТ·Ч" in unit_upper or "КВТЧ" in unit_upper or "KWH" in unit_upper:
-        return value
+        return 1.0
     elif "МВТ·Ч" in unit_upper or "МВТЧ" in unit_upper or "MWH" in unit_upper:
-        return value * MWH_TO_KWH
+        return MWH_TO_KWH
     elif "ГВТ·Ч" in unit_upper or "ГВТЧ" in unit_upper or "GWH" in unit_upper:
-        return value * GWH_TO_KWH
-
-    # Реактивная энергия
+        return GWH_TO_KWH
+    # Реактивная энергия: кВАр·ч не конвертируется в кВт·ч напрямую
     elif "КВАР·Ч" in unit_upper or "КВАРЧ" in unit_upper or "KVARH" in unit_upper:
-        return value  # кВАр·ч не конвертируется в кВт·ч напрямую
+        return 1.0
     elif "МВАР·Ч" in unit_upper or "МВАРЧ" in unit_upper or "MVARH" in unit_upper:
-        return value * MVARH_TO_KVARH
+        return MVARH_TO_KVARH
+    return 1.0
+
+
+@lru_cache(maxsize=1024)
+def _volume_to_m3_factor(unit: str) -> float:
+    """Множитель строковой единицы объёма к м³ (неизвестная единица - 1.0)."""
+    unit_upper = unit.upper()
 
-    else:
-        # По умолчанию считаем, что это уже кВт·ч
-        return value
+    if "М³" in unit_upper or "M3" in unit_upper:
+        return 1.0
+    elif "ТЫС. М³" in unit_upper or "ТЫС М³" in unit_upper or "THOUSAND" in unit_upper:
+        return THOUSAND_M3_TO_M3
+    elif "Л" in unit_upper or "L" in unit_upper or "ЛИТР" in unit_upper:
+        return LITER_TO_M3
+    return 1.0
+
+
+@lru_cache(maxsize=1024)
+def _mass_to_ton_factor(unit: str) -> float:
+    """Множитель строковой единицы массы к тоннам (неизвестная единица - 1.0)."""
+    unit_upper = unit.upper()
+
+    if "Т" in unit_upper or "ТОНН" in unit_upper or "TON" in unit_upper:
+        return 1.0
+    elif "КГ" in unit_upper or "KG" in unit_upper or "КИЛОГРАММ" in unit_upper:
+        return KG_TO_TON
+    return 1.0
+
+
+def _normalize_array_by_factor(
+    values: "np.ndarray", units: "np.ndarray", unit_factor: Callable[[str], float]
+) -> "np.ndarray":
+    """
+    Векторная нормализация: множитель определяется один раз для каждой
+    уникальной единицы, затем весь массив умножается одной операцией.
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("Для пакетной нормализации требуется numpy")
+
+    values = np.asarray(values, dtype=np.float64)
+    unique_units, inverse = np.unique(np.asarray(units).astype(str), return_inverse=True)
+    factors = np.fromiter(
+        (unit_factor(unit) for unit in unique_units),
+        dtype=np.float64,
+        count=len(unique_units),
+    )
+    return values * factors[inverse.reshape(values.shape)]
+
+
+def normalize_energy_to_kwh(value: float, unit: str) -> float:
+    """
+    Нормализует значение энергии к кВт·ч.
+
+    Args:
+        value: Значение
+        unit: Единица измерения (строка)
+
+    Returns:
+        Значение в кВт·ч (неизвестная единица считается кВт·ч)
+    """
+    return value * _energy_to_kwh_factor(unit)
 
 
 def normalize_volume_to_m3(value: float, unit: str) -> float:
@@ -243,19 +424,9 @@ def normalize_volume_to_m3(value: float, unit: str) -> float:
         unit: Единица измерения (строка)
 
     Returns:
-        Значение в м³
+        Значение в м³ (неизвестная единица считается м³)
     """
-    unit_upper = unit.upper()
-
-    if "М³" in unit_upper or "M3" in unit_upper:
-        return value
-    elif "ТЫС. М³" in unit_upper or "ТЫС М³" in unit_upper or "THOUSAND" in unit_upper:
-        return value * THOUSAND_M3_TO_M3
-    elif "Л" in unit_upper or "L" in unit_upper or "ЛИТР" in unit_upper:
-        return value * LITER_TO_M3
-    else:
-        # По умолчанию считаем, что это уже м³
-        return value
+    return value * _volume_to_m3_factor(unit)
 
 
 def normalize_mass_to_ton(value: float, unit: str) -> float:
@@ -267,17 +438,33 @@ def normalize_mass_to_ton(value: float, unit: str) -> float:
         unit: Единица измерения (строка)
 
     Returns:
-        Значение в тоннах
+        Значение в тоннах (неизвестная единица считается тоннами)
     """
-    unit_upper = unit.upper()
+    return value * _mass_to_ton_factor(unit)
 
-    if "Т" in unit_upper or "ТОНН" in unit_upper or "TON" in unit_upper:
-        return value
-    elif "КГ" in unit_upper or "KG" in unit_upper or "КИЛОГРАММ" in unit_upper:
-        return value * KG_TO_TON
-    else:
-        # По умолчанию считаем, что это уже тонны
-        return value
+
+def normalize_energy_to_kwh_array(values: "np.ndarray", units: "np.ndarray") -> "np.ndarray":
+    """
+    Пакетный вариант normalize_energy_to_kwh для колонок значений и единиц.
+
+    Args:
+        values: Значения
+        units: Единицы измерения (строки) той же формы
+
+    Returns:
+        Массив значений в кВт·ч
+    """
+    return _normalize_array_by_factor(values, units, _energy_to_kwh_factor)
+
+
+def normalize_volume_to_m3_array(values: "np.ndarray", units: "np.ndarray") -> "np.ndarray":
+    """Пакетный вариант normalize_volume_to_m3 для колонок значений и единиц."""
+    return _normalize_array_by_factor(values, units, _volume_to_m3_factor)
+
+
+def normalize_mass_to_ton_array(values: "np.ndarray", units: "np.ndarray") -> "np.ndarray":
+    """Пакетный вариант normalize_mass_to_ton для колонок значений и единиц."""
+    return _normalize_array_by_factor(values, units, _mass_to_ton_factor)
 
 
 def validate_unit_consistency(
@@ -307,6 +494,13 @@ def validate_unit_consistency(
 
 # Утилиты для работы с периодами
 
+_PERIOD_HOURS = {
+    "day": HOURS_PER_DAY,
+    "month": HOURS_PER_MONTH,
+    "quarter": HOURS_PER_QUARTER,
+    "year": HOURS_PER_YEAR,
+}
+
 
 def hours_in_period(period_type: str, period_value: Union[int, str] = None) -> float:
     """
@@ -319,16 +513,10 @@ def hours_in_period(period_type: str, period_value: Union[int, str] = None) -> f
     Returns:
         Количество часов
     """
-    if period_type.lower() == "month":
-        return HOURS_PER_MONTH
-    elif period_type.lower() == "quarter":
-        return HOURS_PER_QUARTER
-    elif period_type.lower() == "year":
-        return HOURS_PER_YEAR
-    elif period_type.lower() == "day":
-        return HOURS_PER_DAY
-    else:
+    hours = _PERIOD_HOURS.get(period_type.lower())
+    if hours is None:
         raise ValueError(f"Неподдерживаемый тип периода: {period_type}")
+    return hours
 
 
 def months_to_quarters(months: float) -> float:
@@ -3,14 +3,30 @@
 Извлекает формулы, нормативы и требования из документов (PDF, Word, Excel)
 """
 
+import asyncio
 import json
 import hashlib
+import io
 import logging
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import BinaryIO, Dict, Any, Optional, List, Tuple
+
+from utils import fast_json
 
 logger = logging.getLogger(__name__)
 
+try:
+    import tiktoken
+
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
 # Импорт AI-модулей
 try:
     from ai_parser import get_ai_parser
@@ -36,6 +52,13 @@ except ImportError:
     HAS_FILE_PARSER = False
     logger.warning("file_parser модуль не найден.")
 
+try:
+    from domain.normative_validator import invalidate_normative_cache
+
+    HAS_NORMATIVE_VALIDATOR = True
+except ImportError:
+    HAS_NORMATIVE_VALIDATOR = False
+
 # Импорт database функций
 try:
     import database
@@ -46,6 +69,116 @@ except ImportError:
     logger.error("database модуль не найден.")
 
 
+@lru_cache(maxsize=1)
+def _get_token_encoder():
+    """Кодировщик cl100k_base (создаётся один раз на процесс)."""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _truncate_prompt_text(text_content: str) -> str:
+    """
+    Обрезать текст документа под бюджет промпта.
+
+    При наличии tiktoken бюджет считается в токенах, иначе - в символах.
+    Обрезка идёт по границе абзаца ("\n\n"), чтобы не рвать слово или
+    строку таблицы посередине; если абзацы слишком длинные - по границе среза.
+
+    Args:
+        text_content: Полный текст документа
+
+    Returns:
+        Текст в пределах бюджета (с пометкой об обрезке, если она была)
+    """
+    head = None
+    if HAS_TIKTOKEN:
+        try:
+            encoder = _get_token_encoder()
+            tokens = encoder.encode(text_content)
+            if len(tokens) <= _PROMPT_TEXT_MAX_TOKENS:
+                return text_content
+            head = encoder.decode(tokens[:_PROMPT_TEXT_MAX_TOKENS])
+        except Exception as e:
+            # Словарь cl100k_base скачивается при первом обращении
+            logger.debug(f"tiktoken недоступен, обрезка по символам: {e}")
+
+    if head is None:
+        if len(text_content) <= _PROMPT_TEXT_MAX_CHARS:
+            return text_content
+        head = text_content[:_PROMPT_TEXT_MAX_CHARS]
+
+    # Абзац, начатый во второй половине бюджета, отбрасываем целиком
+    boundary = head.rfind("\n\n")
+    if boundary > len(head) // 2:
+        head = head[:boundary]
+    return head + _TRUNCATED_MARKER
+
+
+def _row_to_text(row: List[Any]) -> str:
+    """
+    Строка листа Excel как текст: ячейки через табуляцию, None - пустая ячейка.
+
+    str.join по списку быстрее, чем по генератору: длина известна заранее
+    и не нужен промежуточный проход по итератору.
+    """
+    return "\t".join(["" if cell is None else str(cell) for cell in row])
+
+
+def _sha1_of_stream(stream: BinaryIO) -> str:
+    """SHA1 содержимого бинарного потока (читается до конца)."""
+    # Python 3.11+: чтение и хеширование в C без Python-цикла по блокам
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(stream, "sha1").hexdigest()
+
+    sha1 = hashlib.sha1()
+    while chunk := stream.read(_HASH_CHUNK_SIZE):
+        sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def _dumps_parsed_result(parsed_result: Dict[str, Any]) -> str:
+    """
+    Сериализовать результат парсинга для normative_documents.parsed_data_json.
+
+    Результаты парсинга бывают многомегабайтными - сериализуем через orjson;
+    если в них есть типы, которые orjson не поддерживает, - стандартным json.
+    """
+    try:
+        return fast_json.dumps(parsed_result)
+    except TypeError:
+        return json.dumps(parsed_result, ensure_ascii=False)
+
+
+# Размер блока чтения при хешировании файла (fallback для Python < 3.11)
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Максимум одновременно импортируемых документов в асинхронном пакетном импорте
+_ASYNC_IMPORT_CONCURRENCY = 8
+
+# LRU-кэш ответов AI: (blake2b(prompt), model) → ответ. Сохраняются только
+# ответы, которые разобрались в словарь правил
+_AI_RESPONSE_CACHE_MAX_SIZE = 256
+_AI_RESPONSE_CACHE: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+# Бюджет текста документа в промпте: в токенах (tiktoken) или в символах
+_PROMPT_TEXT_MAX_TOKENS = 6000
+_PROMPT_TEXT_MAX_CHARS = 15000
+_TRUNCATED_MARKER = "\n... [текст обрезан]"
+
+# Блоки кода в ответе AI; незакрытый блок тянется до конца ответа
+_JSON_FENCE_RE = re.compile(r"```json(.*?)(?:```|\Z)", re.S)
+_FENCE_RE = re.compile(r"```(.*?)(?:```|\Z)", re.S)
+
+# Тип документа по имени файла: (шаблон, тип) в порядке приоритета
+_DOCUMENT_TYPE_RULES = (
+    (re.compile("pkm|690"), "PKM690"),
+    (re.compile("gost|гост"), "GOST"),
+    (re.compile("snip|снип"), "SNiP"),
+    (re.compile("sanpin|санпин"), "SanPiN"),
+    (re.compile("pue|пуэ"), "PUE"),
+    (re.compile("ptee|птээп"), "PTEEP"),
+)
+
+
 class NormativeImporter:
     """
     Класс для импорта и анализа нормативных документов
@@ -74,6 +207,7 @@ class NormativeImporter:
         file_path: str,
         title: Optional[str] = None,
         document_type: Optional[str] = None,
+        file_hash: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Импортировать нормативный документ с AI-анализом
@@ -82,13 +216,22 @@ class NormativeImporter:
             file_path: Путь к файлу документа
             title: Название документа (если None, берется из имени файла)
             document_type: Тип документа (PKM690, GOST, SNiP и т.д.)
+            file_hash: Заранее вычисленный SHA1 файла (если None, вычисляется здесь)
 
         Returns:
             Словарь с результатами импорта
         """
         path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+        # Хеш и размер файла: один open + fstat (или один stat, если хеш
+        # уже вычислен) вместо отдельных exists/stat/open
+        try:
+            if file_hash:
+                file_size = os.stat(file_path).st_size
+            else:
+                file_hash, file_size = self._calculate_file_hash_and_size(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Файл не найден: {file_path}") from None
 
         # Определяем тип документа если не указан
         if not document_type:
@@ -98,10 +241,6 @@ class NormativeImporter:
         if not title:
             title = path.stem
 
-        # Вычисляем хеш файла
-        file_hash = self._calculate_file_hash(file_path)
-        file_size = path.stat().st_size
-
         # Проверка на дубликаты (дедупликация)
         if not HAS_DATABASE:
             raise RuntimeError("database модуль недоступен")
@@ -151,7 +290,7 @@ class NormativeImporter:
 
         # Извлекаем полный текст
         full_text = self._extract_text_content(parsed_result)
-        parsed_data_json = json.dumps(parsed_result, ensure_ascii=False) if parsed_result else None
+        parsed_data_json = _dumps_parsed_result(parsed_result) if parsed_result else None
 
         # Создаем запись в БД с полным текстом
         doc_record = database.create_normative_document(
@@ -234,33 +373,180 @@ class NormativeImporter:
                 "status": "partial",
                 "error": str(e),
             }
+        finally:
+            # Новые связи правил с полями паспорта (в т.ч. сохранённые до
+            # ошибки) должны сразу учитываться при проверке нормативов
+            if HAS_NORMATIVE_VALIDATOR:
+                invalidate_normative_cache()
+
+    def import_normative_documents(
+        self,
+        file_paths: List[str],
+        document_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Импортировать пакет нормативных документов
+
+        Хеши всех файлов вычисляются параллельно в пуле потоков (hashlib
+        освобождает GIL), затем документы импортируются по очереди: запись в БД
+        и AI-анализ остаются последовательными, поэтому повторы внутри пакета
+        распознаются как дубликаты.
+
+        Args:
+            file_paths: Пути к файлам документов
+            document_type: Тип документов (если None, определяется по имени файла)
+
+        Returns:
+            Список результатов импорта в порядке file_paths; ошибка импорта
+            отдельного файла возвращается как запись со статусом "error"
+        """
+        if not file_paths:
+            return []
+
+        def hash_or_none(file_path: str) -> Optional[str]:
+            try:
+                return self._calculate_file_hash(file_path)
+            except OSError:
+                return None  # Ошибку сообщит import_normative_document
+
+        max_workers = min(len(file_paths), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            file_hashes = list(executor.map(hash_or_none, file_paths))
+
+        results = []
+        for file_path, file_hash in zip(file_paths, file_hashes):
+            try:
+                results.append(
+                    self.import_normative_document(
+                        file_path, document_type=document_type, file_hash=file_hash
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Ошибка импорта нормативного документа {file_path}: {e}")
+                results.append({"file_path": file_path, "status": "error", "error": str(e)})
+        return results
+
+    async def import_normative_document_async(
+        self,
+        file_path: str,
+        title: Optional[str] = None,
+        document_type: Optional[str] = None,
+        file_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Асинхронный вариант import_normative_document
+
+        Парсинг, AI-вызов и запись в БД выполняются в отдельном потоке, поэтому
+        event loop не блокируется на время ожидания ответа AI.
+
+        Args:
+            file_path: Путь к файлу документа
+            title: Название документа (если None, берется из имени файла)
+            document_type: Тип документа (PKM690, GOST, SNiP и т.д.)
+            file_hash: Заранее вычисленный SHA1 файла (если None, вычисляется здесь)
+
+        Returns:
+            Словарь с результатами импорта
+        """
+        return await asyncio.to_thread(
+            self.import_normative_document,
+            file_path,
+            title=title,
+            document_type=document_type,
+            file_hash=file_hash,
+        )
+
+    async def import_normative_documents_async(
+        self,
+        file_paths: List[str],
+        document_type: Optional[str] = None,
+        max_concurrency: int = _ASYNC_IMPORT_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Импортировать пакет нормативных документов конкурентно
+
+        До max_concurrency документов обрабатываются одновременно: пока один
+        ждёт ответа AI, другие парсятся и пишутся в БД. Повторы одного файла
+        внутри пакета ждут импорта первого экземпляра и получают статус
+        "duplicate", как и в последовательном import_normative_documents.
+
+        Args:
+            file_paths: Пути к файлам документов
+            document_type: Тип документов (если None, определяется по имени файла)
+            max_concurrency: Максимум одновременно импортируемых документов
+
+        Returns:
+            Список результатов импорта в порядке file_paths; ошибка импорта
+            отдельного файла возвращается как запись со статусом "error"
+        """
+        if not file_paths:
+            return []
+
+        def hash_or_none(file_path: str) -> Optional[str]:
+            try:
+                return self._calculate_file_hash(file_path)
+            except OSError:
+                return None  # Ошибку сообщит import_normative_document
+
+        file_hashes = await asyncio.gather(
+            *(asyncio.to_thread(hash_or_none, file_path) for file_path in file_paths)
+        )
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        first_imports: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+        async def import_one(file_path: str, file_hash: Optional[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.import_normative_document_async(
+                    file_path, document_type=document_type, file_hash=file_hash
+                )
+
+        async def import_after_first(
+            first: "asyncio.Task[Dict[str, Any]]", file_path: str, file_hash: str
+        ) -> Dict[str, Any]:
+            await asyncio.gather(first, return_exceptions=True)
+            return await import_one(file_path, file_hash)
+
+        tasks = []
+        for file_path, file_hash in zip(file_paths, file_hashes):
+            first = first_imports.get(file_hash) if file_hash else None
+            if first is None:
+                task = asyncio.ensure_future(import_one(file_path, file_hash))
+                if file_hash:
+                    first_imports[file_hash] = task
+            else:
+                task = asyncio.ensure_future(import_after_first(first, file_path, file_hash))
+            tasks.append(task)
+
+        results = []
+        for file_path, outcome in zip(
+            file_paths, await asyncio.gather(*tasks, return_exceptions=True)
+        ):
+            if isinstance(outcome, Exception):
+                logger.error(f"Ошибка импорта нормативного документа {file_path}: {outcome}")
+                outcome = {"file_path": file_path, "status": "error", "error": str(outcome)}
+            results.append(outcome)
+        return results
 
     def _detect_document_type(self, file_path: str) -> str:
         """Определить тип документа по имени файла"""
         path_lower = Path(file_path).name.lower()
 
-        if "pkm" in path_lower or "690" in path_lower:
-            return "PKM690"
-        elif "gost" in path_lower or "гост" in path_lower:
-            return "GOST"
-        elif "snip" in path_lower or "снип" in path_lower:
-            return "SNiP"
-        elif "sanpin" in path_lower or "санпин" in path_lower:
-            return "SanPiN"
-        elif "pue" in path_lower or "пуэ" in path_lower:
-            return "PUE"
-        elif "ptee" in path_lower or "птээп" in path_lower:
-            return "PTEEP"
-        else:
-            return "normative"
+        for pattern, document_type in _DOCUMENT_TYPE_RULES:
+            if pattern.search(path_lower):
+                return document_type
+        return "normative"
 
     def _calculate_file_hash(self, file_path: str) -> str:
         """Вычислить SHA1 хеш файла"""
-        sha1 = hashlib.sha1()
         with open(file_path, "rb") as f:
-            while chunk := f.read(8192):
-                sha1.update(chunk)
-        return sha1.hexdigest()
+            return _sha1_of_stream(f)
+
+    def _calculate_file_hash_and_size(self, file_path: str) -> Tuple[str, int]:
+        """Вычислить SHA1 хеш и размер файла по одному открытому дескриптору"""
+        with open(file_path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            return _sha1_of_stream(f), file_size
 
     def _parse_document(self, file_path: str) -> Dict[str, Any]:
         """Парсить документ используя file_parser"""
@@ -310,9 +596,13 @@ class NormativeImporter:
             ai_response = self._call_ai_extraction(prompt)
 
             # Парсим ответ AI
-            extracted_rules = self._parse_ai_extraction_result(
-                ai_response, document_type
-            )
+            extracted_rules = self._parse_ai_rules(ai_response)
+            if extracted_rules is None:
+                return []
+
+            # Неразбираемый ответ не кэшируется: повторный анализ того же
+            # текста снова обратится к AI, а не получит тот же ответ
+            self._remember_ai_response(prompt, ai_response)
 
             logger.info(f"AI извлек {len(extracted_rules)} правил из документа")
             return extracted_rules
@@ -323,55 +613,51 @@ class NormativeImporter:
 
     def _extract_text_content(self, parsed_result: Dict[str, Any]) -> str:
         """Извлечь текстовое содержимое из результата парсинга"""
-        # Пробуем разные источники текста
-        text_parts = []
+        parsing_data = parsed_result.get("parsing")
+        data = parsing_data.get("data") if isinstance(parsing_data, dict) else None
+        if not isinstance(data, dict):
+            return ""
+
+        # Части текста пишутся в один буфер через "\n\n" без промежуточного списка
+        buffer = io.StringIO()
+        separator = ""
 
         # Из parsing.data.text (для PDF)
-        parsing_data = parsed_result.get("parsing", {})
-        if isinstance(parsing_data, dict):
-            data = parsing_data.get("data", {})
-            if isinstance(data, dict):
-                text = data.get("text")
-                if text and isinstance(text, str):
-                    text_parts.append(text)
+        text = data.get("text")
+        if text and isinstance(text, str):
+            buffer.write(text)
+            separator = "\n\n"
 
         # Из parsing.data.paragraphs (для Word)
-        if isinstance(parsing_data, dict):
-            data = parsing_data.get("data", {})
-            if isinstance(data, dict):
-                paragraphs = data.get("paragraphs", [])
-                if paragraphs:
-                    para_texts = [
-                        p.get("text", "")
-                        for p in paragraphs
-                        if isinstance(p, dict) and p.get("text")
-                    ]
-                    text_parts.append("\n".join(para_texts))
+        paragraphs = data.get("paragraphs")
+        if paragraphs:
+            buffer.write(separator)
+            buffer.write(
+                "\n".join(
+                    paragraph_text
+                    for p in paragraphs
+                    if isinstance(p, dict) and (paragraph_text := p.get("text"))
+                )
+            )
+            separator = "\n\n"
 
         # Из parsing.data.sheets (для Excel) - извлекаем текст из ячеек
-        if isinstance(parsing_data, dict):
-            data = parsing_data.get("data", {})
-            if isinstance(data, dict):
-                sheets = data.get("sheets", [])
-                for sheet in sheets:
-                    if isinstance(sheet, dict):
-                        rows = sheet.get("rows", [])
-                        for row in rows:
-                            if isinstance(row, list):
-                                row_text = "\t".join(
-                                    str(cell) if cell is not None else ""
-                                    for cell in row
-                                )
-                                text_parts.append(row_text)
-
-        return "\n\n".join(text_parts)
+        for sheet in data.get("sheets") or ():
+            if not isinstance(sheet, dict):
+                continue
+            rows = sheet.get("rows") or ()
+            lines = [_row_to_text(row) for row in rows if isinstance(row, list)]
+            if lines:
+                buffer.write(separator)
+                buffer.write("\n\n".join(lines))
+                separator = "\n\n"
+
+        return buffer.getvalue()
 
     def _build_extraction_prompt(self, text_content: str, document_type: str) -> str:
         """Построить промпт для AI-извлечения правил"""
         # Ограничиваем размер текста для экономии токенов
-        max_chars = 15000
-        if len(text_content) > max_chars:
-            text_content = text_content[:max_chars] + "\n... [текст обрезан]"
+        text_content = _truncate_prompt_text(text_content)
 
         prompt = f"""Проанализируй нормативный документ типа "{document_type}" и извлеки все формулы, нормативы и правила.
 
@@ -416,6 +702,24 @@ class NormativeImporter:
 """
         return prompt
 
+    def _ai_model(self) -> str:
+        """Text-модель для анализа структурированного текста"""
+        if hasattr(self.ai_parser, "model_text"):
+            return self.ai_parser.model_text
+        return "deepseek-chat"
+
+    def _ai_response_cache_key(self, prompt: str) -> Tuple[str, str]:
+        """Ключ кэша ответов AI: (blake2b(prompt), model)"""
+        return hashlib.blake2b(prompt.encode("utf-8")).hexdigest(), self._ai_model()
+
+    def _remember_ai_response(self, prompt: str, ai_response: str) -> None:
+        """Сохранить разобранный ответ AI в LRU-кэш"""
+        cache_key = self._ai_response_cache_key(prompt)
+        _AI_RESPONSE_CACHE[cache_key] = ai_response
+        _AI_RESPONSE_CACHE.move_to_end(cache_key)
+        if len(_AI_RESPONSE_CACHE) > _AI_RESPONSE_CACHE_MAX_SIZE:
+            _AI_RESPONSE_CACHE.popitem(last=False)
+
     def _call_ai_extraction(self, prompt: str) -> str:
         """Вызвать AI для извлечения правил"""
         if not self.ai_parser:
@@ -424,10 +728,16 @@ class NormativeImporter:
         try:
             # Используем text-модель для анализа структурированного текста
             if hasattr(self.ai_parser, "client") and self.ai_parser.client:
-                if hasattr(self.ai_parser, "model_text"):
-                    model = self.ai_parser.model_text
-                else:
-                    model = "deepseek-chat"
+                model = self._ai_model()
+
+                # Повторный анализ того же текста (например, после частичной
+                # ошибки импорта) берётся из кэша без повторного платного вызова
+                cache_key = self._ai_response_cache_key(prompt)
+                cached_response = _AI_RESPONSE_CACHE.get(cache_key)
+                if cached_response is not None:
+                    _AI_RESPONSE_CACHE.move_to_end(cache_key)
+                    logger.info("Ответ AI для документа взят из кэша")
+                    return cached_response
 
                 response = self.ai_parser.client.chat.completions.create(
                     model=model,
@@ -454,15 +764,23 @@ class NormativeImporter:
         self, ai_response: str, document_type: str
     ) -> List[Dict[str, Any]]:
         """Распарсить результат AI-извлечения"""
+        rules = self._parse_ai_rules(ai_response)
+        return rules if rules is not None else []
+
+    def _parse_ai_rules(self, ai_response: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Распарсить ответ AI в список правил
+
+        Returns:
+            Нормализованные правила или None, если ответ не разбирается
+        """
         try:
             # Извлекаем JSON из ответа
-            json_text = ai_response
-            if "```json" in json_text:
-                json_text = json_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in json_text:
-                json_text = json_text.split("```")[1].split("```")[0].strip()
+            # (предпочтительно блок ```json, иначе первый блок ```)
+            fence = _JSON_FENCE_RE.search(ai_response) or _FENCE_RE.search(ai_response)
+            json_text = fence.group(1).strip() if fence else ai_response
 
-            result = json.loads(json_text)
+            result = fast_json.loads(json_text)
             rules = result.get("rules", [])
 
             # Валидируем и нормализуем правила
@@ -482,10 +800,10 @@ class NormativeImporter:
         except json.JSONDecodeError as e:
             logger.error(f"Ошибка парсинга JSON ответа AI: {e}")
             logger.debug(f"Ответ AI: {ai_response[:500]}")
-            return []
+            return None
         except Exception as e:
             logger.error(f"Ошибка обработки результата AI: {e}")
-            return []
+            return None
 
 
 def get_normative_importer() -> Optional[NormativeImporter]:
@@ -2,9 +2,11 @@
 Модуль интеграции проверки нормативов в процесс заполнения энергопаспорта
 """
 import logging
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple
 from openpyxl import Workbook
 from openpyxl.comments import Comment
+from openpyxl.utils.cell import coordinate_to_tuple
 
 logger = logging.getLogger(__name__)
 
@@ -28,28 +30,44 @@ except ImportError:
     logger.warning("database модуль не найден. Логирование нарушений недоступно.")
 
 
+# Шаблоны комментариев по статусу проверки: a - факт, n - норматив,
+# d - отклонение в процентах, m - сообщение валидатора
+_COMMENT_TEMPLATES = {
+    "violation": (
+        "⚠️ ПРЕВЫШЕНИЕ НОРМАТИВА\n"
+        "Факт: {a}\n"
+        "Норматив: {n}\n"
+        "Отклонение: {d:.1f}%\n"
+        "{m}"
+    ),
+    "compliant": (
+        "✅ Соответствует нормативу\n"
+        "Факт: {a}\n"
+        "Норматив: {n}\n"
+        "Отклонение: {d:.1f}%"
+    ),
+    "below_norm": (
+        "✅ Значение ниже норматива\n"
+        "Факт: {a}\n"
+        "Норматив: {n}\n"
+        "Отклонение: {d:.1f}%"
+    ),
+}
+_MISSING_NORMATIVE_TEMPLATE = "ℹ️ Норматив не найден для поля '{f}'"
+
+
+@dataclass(slots=True)
 class NormativeValidationResult:
     """Результат проверки соответствия нормативу"""
 
-    def __init__(
-        self,
-        field_name: str,
-        sheet_name: str,
-        actual_value: float,
-        status: str,
-        normative_value: Optional[float] = None,
-        deviation_percent: float = 0.0,
-        message: str = "",
-        rule: Optional[Dict[str, Any]] = None,
-    ):
-        self.field_name = field_name
-        self.sheet_name = sheet_name
-        self.actual_value = actual_value
-        self.status = status  # "compliant", "violation", "below_norm", "unknown"
-        self.normative_value = normative_value
-        self.deviation_percent = deviation_percent
-        self.message = message
-        self.rule = rule
+    field_name: str
+    sheet_name: str
+    actual_value: float
+    status: str  # "compliant", "violation", "below_norm", "unknown"
+    normative_value: Optional[float] = None
+    deviation_percent: float = 0.0
+    message: str = ""
+    rule: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Преобразовать в словарь"""
@@ -70,30 +88,15 @@ class NormativeValidationResult:
 
     def get_comment_text(self) -> str:
         """Получить текст для комментария в Excel"""
-        if self.status == "violation":
-            return (
-                f"⚠️ ПРЕВЫШЕНИЕ НОРМАТИВА\n"
-                f"Факт: {self.actual_value}\n"
-                f"Норматив: {self.normative_value}\n"
-                f"Отклонение: {self.deviation_percent:.1f}%\n"
-                f"{self.message}"
-            )
-        elif self.status == "compliant":
-            return (
-                f"✅ Соответствует нормативу\n"
-                f"Факт: {self.actual_value}\n"
-                f"Норматив: {self.normative_value}\n"
-                f"Отклонение: {self.deviation_percent:.1f}%"
-            )
-        elif self.status == "below_norm":
-            return (
-                f"✅ Значение ниже норматива\n"
-                f"Факт: {self.actual_value}\n"
-                f"Норматив: {self.normative_value}\n"
-                f"Отклонение: {self.deviation_percent:.1f}%"
-            )
-        else:
-            return f"ℹ️ Норматив не найден для поля '{self.field_name}'"
+        template = _COMMENT_TEMPLATES.get(self.status)
+        if template is None:
+            return _MISSING_NORMATIVE_TEMPLATE.format(f=self.field_name)
+        return template.format(
+            a=self.actual_value,
+            n=self.normative_value,
+            d=self.deviation_percent,
+            m=self.message,
+        )
 
 
 def validate_field_value(
@@ -131,15 +134,16 @@ def validate_field_value(
             tolerance_percent=tolerance_percent,
         )
 
+        # validate_against_normative всегда заполняет эти ключи
         return NormativeValidationResult(
-            field_name=field_name,
-            sheet_name=sheet_name,
-            actual_value=actual_value,
-            status=validation.get("status", "unknown"),
-            normative_value=validation.get("normative"),
-            deviation_percent=validation.get("deviation_percent", 0.0),
-            message=validation.get("message", ""),
-            rule=validation.get("rule"),
+            field_name,
+            sheet_name,
+            actual_value,
+            validation["status"],
+            validation["normative"],
+            validation["deviation_percent"],
+            validation["message"],
+            validation["rule"],
         )
     except Exception as e:
         logger.error(f"Ошибка проверки норматива для поля {field_name}: {e}")
@@ -152,18 +156,75 @@ def validate_field_value(
         )
 
 
-def add_validation_comment_to_cell(cell, validation_result: NormativeValidationResult):
+# Автор всех комментариев проверки нормативов
+_COMMENT_AUTHOR = "Система проверки нормативов"
+
+
+class PendingComments:
+    """
+    Отложенные комментарии проверки нормативов для ячеек Excel
+
+    Комментарии копятся во время заполнения паспорта и записываются
+    в книгу одним проходом по листам (flush), а не по одному на каждую
+    проверенную ячейку. Повторный комментарий к ячейке заменяет прежний.
+    """
+
+    def __init__(self):
+        self._by_sheet: Dict[str, Dict[str, str]] = {}
+
+    def add(self, sheet_name: str, coordinate: str, text: str) -> None:
+        """Запомнить комментарий для ячейки coordinate (например, "G2") листа sheet_name"""
+        self._by_sheet.setdefault(sheet_name, {})[coordinate] = text
+
+    def __len__(self) -> int:
+        return sum(len(comments) for comments in self._by_sheet.values())
+
+    def flush(self, workbook: Workbook) -> int:
+        """
+        Записать накопленные комментарии в книгу
+
+        Args:
+            workbook: Книга openpyxl
+
+        Returns:
+            Количество записанных комментариев
+        """
+        written = 0
+        for sheet_name, comments in self._by_sheet.items():
+            if sheet_name not in workbook.sheetnames:
+                logger.warning(f"Лист '{sheet_name}' не найден, комментарии пропущены")
+                continue
+            sheet = workbook[sheet_name]
+            # В порядке строк и колонок - лист пишется последовательно
+            for coordinate in sorted(comments, key=coordinate_to_tuple):
+                sheet[coordinate].comment = Comment(comments[coordinate], _COMMENT_AUTHOR)
+                written += 1
+        self._by_sheet.clear()
+        return written
+
+
+def add_validation_comment_to_cell(
+    cell,
+    validation_result: NormativeValidationResult,
+    pending: Optional[PendingComments] = None,
+):
     """
     Добавить комментарий с результатом проверки в ячейку Excel
 
     Args:
         cell: Ячейка openpyxl
         validation_result: Результат проверки
+        pending: Очередь отложенных комментариев (если задана - комментарий
+            записывается при pending.flush, а не сразу)
     """
     try:
         comment_text = validation_result.get_comment_text()
-        if comment_text:
-            cell.comment = Comment(comment_text, "Система проверки нормативов")
+        if not comment_text:
+            return
+        if pending is not None:
+            pending.add(cell.parent.title, cell.coordinate, comment_text)
+        else:
+            cell.comment = Comment(comment_text, _COMMENT_AUTHOR)
     except Exception as e:
         logger.warning(f"Не удалось добавить комментарий в ячейку {cell.coordinate}: {e}")
 
@@ -227,6 +288,7 @@ def validate_and_log_critical_field(
     batch_id: Optional[str] = None,
     tolerance_percent: float = 10.0,
     add_comment: bool = True,
+    pending_comments: Optional[PendingComments] = None,
 ) -> NormativeValidationResult:
     """
     Проверить критическое поле на соответствие нормативу и залогировать результат
@@ -240,6 +302,7 @@ def validate_and_log_critical_field(
         batch_id: ID загрузки (для логирования)
         tolerance_percent: Допустимое отклонение
         add_comment: Добавить комментарий в ячейку
+        pending_comments: Очередь отложенных комментариев (см. PendingComments)
 
     Returns:
         NormativeValidationResult с результатами проверки
@@ -254,7 +317,7 @@ def validate_and_log_critical_field(
 
     # Добавляем комментарий в ячейку
     if add_comment and cell:
-        add_validation_comment_to_cell(cell, validation_result)
+        add_validation_comment_to_cell(cell, validation_result, pending_comments)
 
     # Логируем нарушение
     if enterprise_id:
@@ -279,10 +342,19 @@ CRITICAL_FIELDS = [
 ]
 
 
+# Индекс критических полей по (field_name, sheet_name) - поиск за O(1)
+_CRITICAL_BY_KEY: Dict[Tuple[str, str], Dict[str, Any]] = {
+    (field["field_name"], field["sheet_name"]): field for field in CRITICAL_FIELDS
+}
+_CRITICAL_KEYS = frozenset(_CRITICAL_BY_KEY)
+
+
 def is_critical_field(field_name: str, sheet_name: str) -> bool:
     """Проверить, является ли поле критическим"""
-    for field in CRITICAL_FIELDS:
-        if field["field_name"] == field_name and field["sheet_name"] == sheet_name:
-            return True
-    return False
+    return (field_name, sheet_name) in _CRITICAL_KEYS
+
+
+def get_critical_field(field_name: str, sheet_name: str) -> Optional[Dict[str, Any]]:
+    """Получить настройки критического поля (в т.ч. tolerance_percent) или None"""
+    return _CRITICAL_BY_KEY.get((field_name, sheet_name))
 
@@ -3,7 +3,9 @@
 Автоматическая проверка всех критических полей и генерация отчета
 """
 import logging
-from typing import Dict, Any, Optional, List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from openpyxl import load_workbook
 
@@ -11,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 # Импорт функций проверки
 try:
-    from domain.normative_validator import validate_against_normative
+    from domain.normative_validator import validate_against_normative_batch
     from domain.normative_integration import validate_and_log_critical_field, NormativeValidationResult
 
     HAS_VALIDATOR = True
@@ -51,18 +53,18 @@ CRITICAL_FIELDS = [
 ]
 
 
-def read_field_value_from_passport(
-    passport_path: str,
+def _read_field_value(
+    workbook,
     field_name: str,
     sheet_name: str,
     column: Optional[int] = None,
     row: Optional[int] = None,
 ) -> Optional[float]:
     """
-    Прочитать значение поля из энергопаспорта
+    Прочитать значение поля из уже открытой книги энергопаспорта
 
     Args:
-        passport_path: Путь к файлу паспорта
+        workbook: Книга openpyxl (открытая с data_only=True, read_only=True)
         field_name: Название поля
         sheet_name: Имя листа
         column: Номер колонки (если известен)
@@ -71,47 +73,106 @@ def read_field_value_from_passport(
     Returns:
         Значение поля или None
     """
-    try:
-        workbook = load_workbook(passport_path, data_only=True)
-        
-        if sheet_name not in workbook.sheetnames:
-            logger.warning(f"Лист '{sheet_name}' не найден в паспорте")
-            return None
+    if sheet_name not in workbook.sheetnames:
+        logger.warning(f"Лист '{sheet_name}' не найден в паспорте")
+        return None
+
+    sheet = workbook[sheet_name]
 
-        sheet = workbook[sheet_name]
+    # Строки читаются потоком через iter_rows(values_only=True): в режиме
+    # read_only это не создаёт объектов Cell и не требует max_row/max_column
 
-        # Если указаны колонка и строка - читаем напрямую
-        if column and row:
-            cell = sheet.cell(row=row, column=column)
-            value = cell.value
+    # Если указаны колонка и строка - читаем напрямую
+    if column and row:
+        for (value,) in sheet.iter_rows(
+            min_row=row, max_row=row, min_col=column, max_col=column, values_only=True
+        ):
             if isinstance(value, (int, float)):
                 return float(value)
-            return None
+        return None
 
-        # Иначе ищем по названию поля в заголовках
-        # Простой поиск по первой строке
-        for col_idx in range(1, sheet.max_column + 1):
-            header = sheet.cell(row=1, column=col_idx).value
-            if header and field_name.lower() in str(header).lower():
-                # Ищем первое числовое значение в этой колонке
-                for row_idx in range(2, sheet.max_row + 1):
-                    cell_value = sheet.cell(row=row_idx, column=col_idx).value
-                    if isinstance(cell_value, (int, float)):
-                        workbook.close()
-                        return float(cell_value)
+    # Иначе ищем по названию поля в заголовках первой строки и берём первое
+    # числовое значение под найденной колонкой. Лист читается одним потоком
+    # и чтение прекращается на первом подходящем значении
+    rows = sheet.iter_rows(values_only=True)
+    header_row = next(rows, ())
+    # casefold - регистронезависимое сравнение по Unicode (надёжнее lower)
+    needle = field_name.casefold()
+    header_columns = [
+        col_idx
+        for col_idx, header in enumerate(header_row)
+        if header and needle in (header if isinstance(header, str) else str(header)).casefold()
+    ]
+    if not header_columns:
+        return None
 
-        workbook.close()
+    # При нескольких подходящих заголовках приоритет у левой колонки
+    found: List[Optional[float]] = [None] * len(header_columns)
+    for data_row in rows:
+        for i, col_idx in enumerate(header_columns):
+            if found[i] is None and col_idx < len(data_row):
+                cell_value = data_row[col_idx]
+                if isinstance(cell_value, (int, float)):
+                    found[i] = float(cell_value)
+        if found[0] is not None:
+            return found[0]
+
+    return next((value for value in found if value is not None), None)
+
+
+def read_field_value_from_passport(
+    passport_path: str,
+    field_name: str,
+    sheet_name: str,
+    column: Optional[int] = None,
+    row: Optional[int] = None,
+) -> Optional[float]:
+    """
+    Прочитать значение поля из энергопаспорта
+
+    Args:
+        passport_path: Путь к файлу паспорта
+        field_name: Название поля
+        sheet_name: Имя листа
+        column: Номер колонки (если известен)
+        row: Номер строки (если известен)
+
+    Returns:
+        Значение поля или None
+    """
+    try:
+        workbook = load_workbook(passport_path, data_only=True, read_only=True)
+    except Exception as e:
+        logger.error(f"Ошибка чтения поля {field_name} из паспорта: {e}")
         return None
 
+    try:
+        return _read_field_value(workbook, field_name, sheet_name, column=column, row=row)
     except Exception as e:
         logger.error(f"Ошибка чтения поля {field_name} из паспорта: {e}")
         return None
+    finally:
+        workbook.close()
+
+
+def _load_critical_rules() -> Optional[Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]]:
+    """Нормативы всех критических полей одним запросом (None - БД недоступна)"""
+    if not HAS_DATABASE:
+        return None
+    try:
+        return database.get_normative_rules_bulk(
+            [(field["field_name"], field["sheet_name"]) for field in CRITICAL_FIELDS]
+        )
+    except Exception as e:
+        logger.error(f"Ошибка загрузки нормативов критических полей: {e}")
+        return None
 
 
 def monitor_critical_fields_from_passport(
     passport_path: str,
     enterprise_id: Optional[int] = None,
     batch_id: Optional[str] = None,
+    rules_cache: Optional[Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]] = None,
 ) -> Dict[str, Any]:
     """
     Мониторинг всех критических полей из энергопаспорта
@@ -120,6 +181,8 @@ def monitor_critical_fields_from_passport(
         passport_path: Путь к файлу энергопаспорта
         enterprise_id: ID предприятия
         batch_id: ID загрузки
+        rules_cache: Заранее загруженные нормативы критических полей
+            (если None, загружаются из БД)
 
     Returns:
         Словарь с результатами мониторинга
@@ -147,23 +210,65 @@ def monitor_critical_fields_from_passport(
             "unknown": [],
         }
 
-    # Проверяем каждое критическое поле
-    for field_config in CRITICAL_FIELDS:
+    # Книга читается один раз на весь прогон, а не на каждое поле
+    try:
+        workbook = load_workbook(passport_path, data_only=True, read_only=True)
+    except Exception as e:
+        logger.error(f"Ошибка открытия паспорта {passport_path}: {e}")
+        workbook = None
+
+    def read_value(field_name, sheet_name, column, row) -> Optional[float]:
+        if workbook is None:
+            return None
+        try:
+            return _read_field_value(workbook, field_name, sheet_name, column=column, row=row)
+        except Exception as e:
+            logger.error(f"Ошибка чтения поля {field_name} из паспорта: {e}")
+            return None
+
+    # Читаем значения всех критических полей
+    # Для упрощения проверяем первую строку данных.
+    # read_only-книга держит zip-файл открытым до close(), поэтому она
+    # закрывается сразу после чтения и при любой ошибке
+    try:
+        actual_values = [
+            read_value(
+                field_config["field_name"],
+                field_config["sheet_name"],
+                field_config.get("column"),
+                field_config.get("row_start", 2),
+            )
+            for field_config in CRITICAL_FIELDS
+        ]
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+    # Нормативы всех критических полей - одним запросом к БД
+    if rules_cache is None:
+        rules_cache = _load_critical_rules()
+
+    # Проверяем соответствие нормативам все найденные значения одной пачкой
+    checks = [
+        (
+            actual_value,
+            field_config["field_name"],
+            field_config["sheet_name"],
+            field_config.get("tolerance_percent", 10.0),
+        )
+        for field_config, actual_value in zip(CRITICAL_FIELDS, actual_values)
+        if actual_value is not None
+    ]
+    validation_error = None
+    try:
+        validations = iter(validate_against_normative_batch(checks, rules_cache=rules_cache))
+    except Exception as e:
+        logger.error(f"Ошибка проверки критических полей: {e}")
+        validation_error = e
+
+    for field_config, actual_value in zip(CRITICAL_FIELDS, actual_values):
         field_name = field_config["field_name"]
         sheet_name = field_config["sheet_name"]
-        column = field_config.get("column")
-        row_start = field_config.get("row_start", 2)
-        tolerance = field_config.get("tolerance_percent", 10.0)
-
-        # Пытаемся прочитать значение из паспорта
-        # Для упрощения проверяем первую строку данных
-        actual_value = read_field_value_from_passport(
-            passport_path,
-            field_name,
-            sheet_name,
-            column=column,
-            row=row_start,
-        )
 
         if actual_value is None:
             unknown.append({
@@ -173,39 +278,31 @@ def monitor_critical_fields_from_passport(
             })
             continue
 
-        # Проверяем соответствие нормативу
-        try:
-            validation = validate_against_normative(
-                actual_value=actual_value,
-                field_name=field_name,
-                sheet_name=sheet_name,
-                tolerance_percent=tolerance,
-            )
-
-            result = {
-                "field_name": field_name,
-                "sheet_name": sheet_name,
-                "actual_value": actual_value,
-                "status": validation.get("status", "unknown"),
-                "normative_value": validation.get("normative"),
-                "deviation_percent": validation.get("deviation_percent", 0.0),
-                "message": validation.get("message", ""),
-            }
-
-            if validation.get("status") == "violation":
-                violations.append(result)
-            elif validation.get("status") == "compliant":
-                compliant.append(result)
-            else:
-                unknown.append(result)
-
-        except Exception as e:
-            logger.error(f"Ошибка проверки поля {field_name}: {e}")
+        if validation_error is not None:
             unknown.append({
                 "field_name": field_name,
                 "sheet_name": sheet_name,
-                "reason": f"Ошибка проверки: {e}",
+                "reason": f"Ошибка проверки: {validation_error}",
             })
+            continue
+
+        validation = next(validations)
+        result = {
+            "field_name": field_name,
+            "sheet_name": sheet_name,
+            "actual_value": actual_value,
+            "status": validation.get("status", "unknown"),
+            "normative_value": validation.get("normative"),
+            "deviation_percent": validation.get("deviation_percent", 0.0),
+            "message": validation.get("message", ""),
+        }
+
+        if validation.get("status") == "violation":
+            violations.append(result)
+        elif validation.get("status") == "compliant":
+            compliant.append(result)
+        else:
+            unknown.append(result)
 
     return {
         "passport_path": str(passport_path),
@@ -222,6 +319,42 @@ def monitor_critical_fields_from_passport(
     }
 
 
+def monitor_critical_fields_from_passports(
+    passport_paths: List[str],
+    enterprise_id: Optional[int] = None,
+    batch_id: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Мониторинг критических полей для пакета энергопаспортов
+
+    Нормативы загружаются из БД один раз на весь пакет, паспорта читаются
+    параллельно в пуле потоков (чтение файлов и распаковка xlsx перекрываются).
+
+    Args:
+        passport_paths: Пути к файлам энергопаспортов
+        enterprise_id: ID предприятия
+        batch_id: ID загрузки
+        max_workers: Размер пула потоков (по умолчанию - по числу CPU)
+
+    Returns:
+        Результаты monitor_critical_fields_from_passport в порядке passport_paths
+    """
+    if not passport_paths:
+        return []
+
+    rules_cache = _load_critical_rules() if HAS_VALIDATOR else None
+
+    def monitor(passport_path: str) -> Dict[str, Any]:
+        return monitor_critical_fields_from_passport(
+            passport_path, enterprise_id, batch_id, rules_cache=rules_cache
+        )
+
+    max_workers = max_workers or min(len(passport_paths), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(monitor, passport_paths))
+
+
 def get_monitoring_summary(enterprise_id: Optional[int] = None) -> Dict[str, Any]:
     """
     Получить сводку мониторинга для предприятия
@@ -247,26 +380,25 @@ def get_monitoring_summary(enterprise_id: Optional[int] = None) -> Dict[str, Any
             limit=20,
         )
 
-        # Группируем по полям
+        # Группируем по полям (нарушения приходят от новых к старым)
         fields_summary = {}
         for violation in violations:
-            field_key = f"{violation.get('field_name')}_{violation.get('sheet_name')}"
-            if field_key not in fields_summary:
-                fields_summary[field_key] = {
-                    "field_name": violation.get("field_name"),
-                    "sheet_name": violation.get("sheet_name"),
+            field_name = violation.get("field_name")
+            sheet_name = violation.get("sheet_name")
+            entry = fields_summary.get((field_name, sheet_name))
+            if entry is None:
+                entry = fields_summary[(field_name, sheet_name)] = {
+                    "field_name": field_name,
+                    "sheet_name": sheet_name,
                     "count": 0,
                     "max_deviation": 0.0,
-                    "latest": None,
+                    "latest": violation,
                 }
-            
-            fields_summary[field_key]["count"] += 1
-            deviation = violation.get("deviation_percent", 0.0)
-            if deviation > fields_summary[field_key]["max_deviation"]:
-                fields_summary[field_key]["max_deviation"] = deviation
-            
-            if not fields_summary[field_key]["latest"]:
-                fields_summary[field_key]["latest"] = violation
+
+            entry["count"] += 1
+            deviation = violation.get("deviation_percent") or 0.0
+            if deviation > entry["max_deviation"]:
+                entry["max_deviation"] = deviation
 
         return {
             "total_violations": len(violations),
@@ -2,7 +2,8 @@
 Модуль для проверки соответствия фактических значений нормативным требованиям
 """
 import logging
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Callable, Dict, Any, NamedTuple, Optional, List, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +16,71 @@ except ImportError:
     HAS_DATABASE = False
     logger.error("database модуль не найден.")
 
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+class _PreparedRule(NamedTuple):
+    """Лучшее правило поля и производные величины, не зависящие от факта"""
+
+    rule: Dict[str, Any]
+    normative_value: Optional[float]
+    # 100 / |норматив| - отклонение в % считается одним умножением (None для нуля)
+    percent_scale: Optional[float]
+
+
+def _prepare_rule(rule: Optional[Dict[str, Any]]) -> Optional[_PreparedRule]:
+    """Подготовить правило к проверкам (None - правил нет)"""
+    if rule is None:
+        return None
+    normative_value = rule.get("numeric_value")
+    percent_scale = None
+    if isinstance(normative_value, (int, float)) and normative_value != 0:
+        percent_scale = 100.0 / abs(normative_value)
+    return _PreparedRule(rule, normative_value, percent_scale)
+
+
+@lru_cache(maxsize=1024)
+def _best_rule_for_field(field_name: str, sheet_name: Optional[str]) -> Optional[_PreparedRule]:
+    """
+    Подготовленный норматив с наивысшей уверенностью для поля (None - нормативов нет).
+
+    Таблица нормативов меняется только при импорте документов, а проверка
+    вызывается для каждой ячейки паспорта - результат запроса кэшируется.
+    Ошибки БД не кэшируются. После изменения нормативов вызывайте
+    invalidate_normative_cache().
+    """
+    return _prepare_rule(
+        _select_best_rule(database.get_normative_rules_for_field(field_name, sheet_name))
+    )
+
+
+def _select_best_rule(rules: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Правило с наивысшей уверенностью (confidence) или None, если правил нет"""
+    if not rules:
+        return None
+    return max(
+        rules,
+        key=lambda r: r.get("extraction_confidence", 0.0) or 0.0,
+    )
+
+
+def invalidate_normative_cache() -> None:
+    """Сбросить кэш нормативов (после импорта или изменения правил)."""
+    _best_rule_for_field.cache_clear()
+    _cached_validator.cache_clear()
+
 
 def validate_against_normative(
     actual_value: float,
     field_name: str,
     sheet_name: Optional[str] = None,
     tolerance_percent: float = 10.0,
+    rules_cache: Optional[Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]] = None,
 ) -> Dict[str, Any]:
     """
     Проверить соответствие фактического значения нормативу
@@ -30,6 +90,8 @@ def validate_against_normative(
         field_name: Название поля энергопаспорта
         sheet_name: Имя листа (опционально)
         tolerance_percent: Допустимое отклонение в процентах (по умолчанию 10%)
+        rules_cache: Заранее загруженные правила {(field_name, sheet_name): правила}
+            (см. database.get_normative_rules_bulk); если задан - БД не опрашивается
 
     Returns:
         Словарь с результатами проверки:
@@ -42,93 +104,270 @@ def validate_against_normative(
             "rule": dict | None  # Правило из БД
         }
     """
-    if not HAS_DATABASE:
+    return make_validator(field_name, sheet_name, tolerance_percent, rules_cache)(actual_value)
+
+
+def make_validator(
+    field_name: str,
+    sheet_name: Optional[str] = None,
+    tolerance_percent: float = 10.0,
+    rules_cache: Optional[Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]] = None,
+) -> Callable[[float], Dict[str, Any]]:
+    """
+    Получить функцию проверки значений одного поля
+
+    Норматив и границы допуска вычисляются один раз при создании функции,
+    сама проверка - два сравнения. Функции для пар (поле, лист, допуск)
+    кэшируются вместе с нормативами и сбрасываются invalidate_normative_cache().
+
+    Args:
+        field_name: Название поля энергопаспорта
+        sheet_name: Имя листа (опционально)
+        tolerance_percent: Допустимое отклонение в процентах (по умолчанию 10%)
+        rules_cache: Заранее загруженные правила (см. validate_against_normative);
+            функции для них не кэшируются
+
+    Returns:
+        Функция actual_value -> результат, как у validate_against_normative
+    """
+    if rules_cache is None:
+        if not HAS_DATABASE:
+            logger.warning("database модуль недоступен, проверка невозможна")
+            return _unknown_validator("База данных недоступна")
+        try:
+            return _cached_validator(field_name, sheet_name, tolerance_percent)
+        except Exception as e:
+            logger.error(f"Ошибка получения нормативов для поля {field_name}: {e}")
+            return _unknown_validator(f"Ошибка получения нормативов: {e}")
+
+    prepared = _prepare_rule(_select_best_rule(rules_cache.get((field_name, sheet_name), [])))
+    return _build_validator(field_name, prepared, tolerance_percent)
+
+
+@lru_cache(maxsize=1024)
+def _cached_validator(
+    field_name: str, sheet_name: Optional[str], tolerance_percent: float
+) -> Callable[[float], Dict[str, Any]]:
+    """Функция проверки по нормативу из БД (ошибки БД не кэшируются)"""
+    return _build_validator(
+        field_name, _best_rule_for_field(field_name, sheet_name), tolerance_percent
+    )
+
+
+def _unknown_validator(
+    message: str, rule: Optional[Dict[str, Any]] = None
+) -> Callable[[float], Dict[str, Any]]:
+    """Функция проверки, всегда возвращающая unknown"""
+
+    def validate(actual_value: float) -> Dict[str, Any]:
+        return _unknown_result(actual_value, message, rule)
+
+    return validate
+
+
+def _build_validator(
+    field_name: str, prepared: Optional[_PreparedRule], tolerance_percent: float
+) -> Callable[[float], Dict[str, Any]]:
+    """Функция проверки с границами допуска, посчитанными заранее"""
+    if prepared is None:
+        return _unknown_validator(f"Норматив не найден для поля '{field_name}'")
+
+    normative_value = prepared.normative_value
+    if normative_value is None:
+        return _unknown_validator("Норматив не имеет числового значения", prepared.rule)
+
+    # Границы считаются как normative * (1 ± t/100): n + n*t/100 округляется
+    # иначе и сдвигает результат ровно на границе допуска
+    upper = normative_value * (1 + tolerance_percent / 100)
+    lower = normative_value * (1 - tolerance_percent / 100)
+    percent_scale = prepared.percent_scale
+
+    def validate(actual_value: float) -> Dict[str, Any]:
+        # Вычисляем отклонение
+        if percent_scale is not None:
+            deviation_percent = abs(actual_value - normative_value) * percent_scale
+        elif normative_value == 0:
+            deviation_percent = 0.0 if actual_value == 0 else float("inf")
+        else:
+            deviation_percent = abs(actual_value - normative_value) / abs(normative_value) * 100
+
+        # Определяем статус
+        if actual_value > upper:
+            status = "violation"
+        elif actual_value < lower:
+            status = "below_norm"
+        else:
+            status = "compliant"
+
+        return _compliance_result(actual_value, prepared, deviation_percent, status)
+
+    return validate
+
+
+def validate_against_normative_batch(
+    checks: List[Tuple[float, str, Optional[str], float]],
+    rules_cache: Optional[Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Проверить пачку значений на соответствие нормативам
+
+    Нормативы подбираются для каждого значения как в validate_against_normative,
+    а отклонения и статусы всех числовых проверок считаются одной векторной
+    операцией numpy (без numpy - по одной).
+
+    Args:
+        checks: Кортежи (actual_value, field_name, sheet_name, tolerance_percent)
+        rules_cache: Заранее загруженные правила (см. validate_against_normative)
+
+    Returns:
+        Результаты в порядке checks - такие же, как у validate_against_normative
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(checks)
+    pending: List[Tuple[int, _PreparedRule]] = []
+
+    for i, (actual_value, field_name, sheet_name, tolerance_percent) in enumerate(checks):
+        prepared, result = _resolve_normative(actual_value, field_name, sheet_name, rules_cache)
+        if result is not None:
+            results[i] = result
+        elif HAS_NUMPY and isinstance(prepared.normative_value, (int, float)):
+            pending.append((i, prepared))
+        else:
+            results[i] = validate_against_normative(
+                actual_value, field_name, sheet_name, tolerance_percent, rules_cache
+            )
+
+    if pending:
+        indices = [i for i, _ in pending]
+        actuals = np.array([checks[i][0] for i in indices], dtype=np.float64)
+        normatives = np.array(
+            [prepared.normative_value for _, prepared in pending], dtype=np.float64
+        )
+        tolerances = np.array([checks[i][3] for i in indices], dtype=np.float64)
+
+        status_codes, deviations = _classify_batch(actuals, normatives, tolerances)
+
+        for (i, prepared), code, deviation in zip(
+            pending, status_codes.tolist(), deviations.tolist()
+        ):
+            results[i] = _compliance_result(
+                checks[i][0], prepared, deviation, _BATCH_STATUSES[code]
+            )
+
+    return results
+
+
+# Коды статусов векторной проверки
+_BATCH_STATUSES = ("below_norm", "compliant", "violation")
+
+
+def _classify_batch(
+    actuals: "np.ndarray", normatives: "np.ndarray", tolerances: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Векторная проверка: коды статусов (индексы _BATCH_STATUSES) и отклонения в %.
+
+    Формулы те же, что в validate_against_normative, поэтому результаты
+    совпадают с поэлементной проверкой, в том числе ровно на границе допуска.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviations = np.abs(actuals - normatives) * (100.0 / np.abs(normatives))
+    zero = normatives == 0
+    deviations[zero] = np.where(actuals[zero] == 0, 0.0, np.inf)
+
+    status_codes = np.ones(len(actuals), dtype=np.int8)
+    status_codes[actuals < normatives * (1 - tolerances / 100)] = 0
+    status_codes[actuals > normatives * (1 + tolerances / 100)] = 2
+    return status_codes, deviations
+
+
+def _unknown_result(
+    actual_value: float, message: str, rule: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Результат проверки со статусом unknown"""
+    return {
+        "status": "unknown",
+        "actual": actual_value,
+        "normative": None,
+        "deviation_percent": 0.0,
+        "message": message,
+        # Правило берётся из кэша нормативов - в результат отдаётся копия
+        "rule": dict(rule) if rule is not None else None,
+    }
+
+
+def _resolve_normative(
+    actual_value: float,
+    field_name: str,
+    sheet_name: Optional[str],
+    rules_cache: Optional[Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]],
+) -> Tuple[Optional[_PreparedRule], Optional[Dict[str, Any]]]:
+    """
+    Подобрать числовой норматив для поля
+
+    Returns:
+        (подготовленное правило, None) или (None, готовый результат unknown),
+        если норматив получить не удалось
+    """
+    if not HAS_DATABASE and rules_cache is None:
         logger.warning("database модуль недоступен, проверка невозможна")
-        return {
-            "status": "unknown",
-            "actual": actual_value,
-            "normative": None,
-            "deviation_percent": 0.0,
-            "message": "База данных недоступна",
-            "rule": None,
-        }
+        return None, _unknown_result(actual_value, "База данных недоступна")
 
-    # Получаем нормативы для поля
+    # Получаем норматив с наивысшей уверенностью (confidence) для поля
     try:
-        rules = database.get_normative_rules_for_field(field_name, sheet_name)
+        if rules_cache is not None:
+            prepared = _prepare_rule(
+                _select_best_rule(rules_cache.get((field_name, sheet_name), []))
+            )
+        else:
+            prepared = _best_rule_for_field(field_name, sheet_name)
     except Exception as e:
         logger.error(f"Ошибка получения нормативов для поля {field_name}: {e}")
-        return {
-            "status": "unknown",
-            "actual": actual_value,
-            "normative": None,
-            "deviation_percent": 0.0,
-            "message": f"Ошибка получения нормативов: {e}",
-            "rule": None,
-        }
+        return None, _unknown_result(actual_value, f"Ошибка получения нормативов: {e}")
 
-    if not rules:
-        return {
-            "status": "unknown",
-            "actual": actual_value,
-            "normative": None,
-            "deviation_percent": 0.0,
-            "message": f"Норматив не найден для поля '{field_name}'",
-            "rule": None,
-        }
-
-    # Берем норматив с наивысшей уверенностью (confidence)
-    best_rule = max(
-        rules,
-        key=lambda r: r.get("extraction_confidence", 0.0) or 0.0,
-    )
+    if prepared is None:
+        return None, _unknown_result(
+            actual_value, f"Норматив не найден для поля '{field_name}'"
+        )
 
-    normative_value = best_rule.get("numeric_value")
+    if prepared.normative_value is None:
+        return None, _unknown_result(
+            actual_value, "Норматив не имеет числового значения", prepared.rule
+        )
 
-    if normative_value is None:
-        return {
-            "status": "unknown",
-            "actual": actual_value,
-            "normative": None,
-            "deviation_percent": 0.0,
-            "message": "Норматив не имеет числового значения",
-            "rule": best_rule,
-        }
+    return prepared, None
 
-    # Вычисляем отклонение
-    if normative_value == 0:
-        deviation_percent = 0.0 if actual_value == 0 else float("inf")
-    else:
-        deviation_percent = abs(actual_value - normative_value) / abs(normative_value) * 100
 
-    # Определяем статус
-    if actual_value > normative_value * (1 + tolerance_percent / 100):
-        status = "violation"
+def _compliance_result(
+    actual_value: float, prepared: _PreparedRule, deviation_percent: float, status: str
+) -> Dict[str, Any]:
+    """Результат проверки значения, для которого найден числовой норматив"""
+    normative_value = prepared.normative_value
+    if status == "violation":
         message = (
             f"⚠️ Превышение норматива на {deviation_percent:.1f}%. "
             f"Факт: {actual_value}, Норматив: {normative_value}"
         )
-    elif actual_value < normative_value * (1 - tolerance_percent / 100):
-        status = "below_norm"
+    elif status == "below_norm":
         message = (
             f"✅ Значение ниже норматива на {deviation_percent:.1f}%. "
             f"Факт: {actual_value}, Норматив: {normative_value}"
         )
     else:
-        status = "compliant"
         message = (
             f"✅ Соответствует нормативу. "
             f"Факт: {actual_value}, Норматив: {normative_value} "
             f"(отклонение: {deviation_percent:.1f}%)"
         )
 
+    best_rule = prepared.rule
     return {
         "status": status,
         "actual": actual_value,
         "normative": normative_value,
         "deviation_percent": deviation_percent,
         "message": message,
-        "rule": best_rule,
+        # Правило берётся из кэша нормативов - в результат отдаётся копия
+        "rule": dict(best_rule),
         "unit": best_rule.get("unit"),
         "document_title": best_rule.get("document_title"),
     }
@@ -164,23 +403,23 @@ def check_critical_fields(
 
     # TODO: Получить фактические значения из паспорта
     # Пока заглушка - нужно интегрировать с fill_energy_passport.py
-    for field in critical_fields:
-        # Здесь нужно получить фактическое значение из паспорта
-        # actual_value = get_field_value_from_passport(enterprise_id, field)
-        # Пока пропускаем
+    # actual_value = get_field_value_from_passport(enterprise_id, field)
 
-        # Проверяем наличие нормативов
-        rules = database.get_normative_rules_for_field(
-            field["field_name"], field.get("sheet_name")
-        )
+    # Проверяем наличие нормативов - количество правил по всем полям одним запросом
+    rules_counts = database.count_normative_rules_bulk(
+        [(field["field_name"], field.get("sheet_name")) for field in critical_fields]
+    )
 
-        if rules:
+    for field in critical_fields:
+        rules_count = rules_counts.get((field["field_name"], field.get("sheet_name")), 0)
+
+        if rules_count:
             compliant.append(
                 {
                     "field_name": field["field_name"],
                     "sheet_name": field.get("sheet_name"),
                     "has_normative": True,
-                    "rules_count": len(rules),
+                    "rules_count": rules_count,
                 }
             )
         else:
@@ -206,6 +445,18 @@ def check_critical_fields(
     }
 
 
+_TOP_FIELDS_SQL = """
+    SELECT
+        nref.field_name,
+        nref.sheet_name,
+        COUNT(DISTINCT nref.rule_id) AS rules_count
+    FROM normative_references nref
+    GROUP BY nref.field_name, nref.sheet_name
+    ORDER BY rules_count DESC
+    LIMIT ?
+"""
+
+
 def get_top_fields_with_normatives(limit: int = 10) -> List[Dict[str, Any]]:
     """
     Получить топ полей с наибольшим количеством нормативов
@@ -220,30 +471,11 @@ def get_top_fields_with_normatives(limit: int = 10) -> List[Dict[str, Any]]:
         return []
 
     try:
+        # get_connection уже выставляет row_factory=sqlite3.Row и кэширует
+        # подготовленные выражения, текст запроса - константа модуля
         with database.get_connection() as conn:
-            conn.row_factory = database.sqlite3.Row
-            rows = conn.execute(
-                """
-                SELECT 
-                    nref.field_name,
-                    nref.sheet_name,
-                    COUNT(DISTINCT nref.rule_id) as rules_count
-                FROM normative_references nref
-                GROUP BY nref.field_name, nref.sheet_name
-                ORDER BY rules_count DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-
-            return [
-                {
-                    "field_name": row["field_name"],
-                    "sheet_name": row["sheet_name"],
-                    "rules_count": row["rules_count"],
-                }
-                for row in rows
-            ]
+            rows = conn.execute(_TOP_FIELDS_SQL, (limit,)).fetchall()
+        return [dict(row) for row in rows]
     except Exception as e:
         logger.error(f"Ошибка получения топ полей: {e}")
         return []
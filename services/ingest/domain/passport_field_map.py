@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PassportSectionMapping:
     """
     Declarative mapping for a passport section.
@@ -12,74 +14,78 @@ class PassportSectionMapping:
     """
 
     section_name: str
-    required_resources: List[str] = field(
-        default_factory=list
-    )  # e.g., ["electricity", "gas", "water", "heat"]
-    optional_resources: List[str] = field(default_factory=list)
+    required_resources: Tuple[str, ...] = ()  # e.g., ("electricity", "gas", "water", "heat")
+    optional_resources: Tuple[str, ...] = ()
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PassportFieldMap:
     """
     Top-level field map describing how CanonicalSourceData populates the ПКМ 690 template.
     This is design-first and will be expanded in subsequent iterations.
     """
 
-    sections: Dict[str, PassportSectionMapping] = field(default_factory=dict)
+    sections: Mapping[str, PassportSectionMapping] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
 
 
+@lru_cache(maxsize=1)
 def get_default_passport_field_map() -> PassportFieldMap:
     """
     Default mapping sketch for ПКМ 690 sections.
+
+    The map is built once and shared by all callers, so it is immutable:
+    frozen dataclasses, a read-only sections mapping and tuple resources.
     """
     return PassportFieldMap(
-        sections={
+        sections=MappingProxyType({
             "Структура пр 2": PassportSectionMapping(
                 section_name="Структура пр 2",
-                required_resources=["electricity", "gas", "water", "heat"],
+                required_resources=("electricity", "gas", "water", "heat"),
                 notes="Structure by resource shares (quarterly/annual).",
             ),
             "Баланс": PassportSectionMapping(
                 section_name="Баланс",
-                required_resources=[
+                required_resources=(
                     "electricity",
                     "gas",
                     "water",
                     "heat",
                     "fuel",
                     "coal",
-                ],
+                ),
                 notes="Balance of resources and uses.",
             ),
             "Динамика ср": PassportSectionMapping(
                 section_name="Динамика ср",
-                required_resources=["electricity", "gas", "water", "heat"],
+                required_resources=("electricity", "gas", "water", "heat"),
                 notes="Time series dynamics per resource.",
             ),
             "мазут,уголь 5": PassportSectionMapping(
                 section_name="мазут,уголь 5",
-                required_resources=["fuel", "coal"],
+                required_resources=("fuel", "coal"),
             ),
             "Расход на ед.п": PassportSectionMapping(
                 section_name="Расход на ед.п",
-                required_resources=["electricity", "gas", "water", "heat"],
+                required_resources=("electricity", "gas", "water", "heat"),
             ),
             "Узел учета": PassportSectionMapping(
                 section_name="Узел учета",
-                required_resources=[],
+                required_resources=(),
                 notes="Feeds from canonical nodes list.",
             ),
             "Equipment": PassportSectionMapping(
                 section_name="Equipment",
-                required_resources=[],
+                required_resources=(),
                 notes="Feeds from canonical equipment list.",
             ),
-        }
+        })
     )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UsageCategory:
     """
     Usage category for electricity breakdown expected by Balance sheet.
@@ -114,8 +120,8 @@ ELECTRICITY_USAGE_HOUSEHOLD = "household"
 
 # Configuration: keywords mapping for usage classification
 # This is the single source of truth for keyword-based classification
-ELECTRICITY_USAGE_KEYWORDS: Dict[str, List[str]] = {
-    ELECTRICITY_USAGE_TECH: [
+ELECTRICITY_USAGE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    ELECTRICITY_USAGE_TECH: (
         # RU keywords
         "технолог",
         "технологический",
@@ -139,13 +145,12 @@ ELECTRICITY_USAGE_KEYWORDS: Dict[str, List[str]] = {
         # UZ keywords (if needed)
         "texnologik",
         "texnologiya",
-    ],
-    ELECTRICITY_USAGE_OWN: [
+    ),
+    ELECTRICITY_USAGE_OWN: (
         # RU keywords
         "собственные нужды",
         "с.н.",
         "собств. нужды",
-        "собственные нужды",
         "котельная",
         "котел",
         "котёл",
@@ -161,8 +166,8 @@ ELECTRICITY_USAGE_KEYWORDS: Dict[str, List[str]] = {
         # UZ keywords
         "kotelxona",
         "podstansiya",
-    ],
-    ELECTRICITY_USAGE_PROD: [
+    ),
+    ELECTRICITY_USAGE_PROD: (
         # RU keywords
         "производств",
         "производственный",
@@ -181,8 +186,8 @@ ELECTRICITY_USAGE_KEYWORDS: Dict[str, List[str]] = {
         "sex",
         "uchastok",
         "konveyer",
-    ],
-    ELECTRICITY_USAGE_HOUSEHOLD: [
+    ),
+    ELECTRICITY_USAGE_HOUSEHOLD: (
         # RU keywords
         "хоз-быт",
         "хозбыт",
@@ -208,11 +213,52 @@ ELECTRICITY_USAGE_KEYWORDS: Dict[str, List[str]] = {
         "ofis",
         "ombor",
         "idora",
-    ],
+    ),
 }
 
+
+def _keywords_lower(keywords: Mapping[str, Sequence[str]]) -> Dict[str, Tuple[str, ...]]:
+    """Lower-cased keywords per category; duplicates dropped, first occurrence kept."""
+    return {
+        category_id: tuple(dict.fromkeys(keyword.lower() for keyword in category_keywords))
+        for category_id, category_keywords in keywords.items()
+    }
+
+
+# Keywords in lower case, computed once (classification matches lower-cased text)
+ELECTRICITY_USAGE_KEYWORDS_LOWER: Dict[str, Tuple[str, ...]] = _keywords_lower(
+    ELECTRICITY_USAGE_KEYWORDS
+)
+
+# Lower-cased keyword sets for exact (token-equality) membership checks
+ELECTRICITY_USAGE_KEYWORD_SETS: Dict[str, FrozenSet[str]] = {
+    category_id: frozenset(keywords)
+    for category_id, keywords in ELECTRICITY_USAGE_KEYWORDS_LOWER.items()
+}
+
+
+def set_electricity_usage_keywords(keywords: Mapping[str, Sequence[str]]) -> None:
+    """
+    Replace the usage keywords and their derived views in place.
+
+    Modules that imported the dicts see the new keywords; the classifier's
+    own caches are rebuilt by electricity_usage_classifier.reload_keywords.
+    """
+    keywords_lower = _keywords_lower(keywords)
+    ELECTRICITY_USAGE_KEYWORDS.clear()
+    ELECTRICITY_USAGE_KEYWORDS.update(
+        (category_id, tuple(category_keywords)) for category_id, category_keywords in keywords.items()
+    )
+    ELECTRICITY_USAGE_KEYWORDS_LOWER.clear()
+    ELECTRICITY_USAGE_KEYWORDS_LOWER.update(keywords_lower)
+    ELECTRICITY_USAGE_KEYWORD_SETS.clear()
+    ELECTRICITY_USAGE_KEYWORD_SETS.update(
+        (category_id, frozenset(category_keywords))
+        for category_id, category_keywords in keywords_lower.items()
+    )
+
 # Possible column names in RU/UZ that might contain usage category
-ELECTRICITY_USAGE_COLUMN_MAP: List[str] = [
+ELECTRICITY_USAGE_COLUMN_MAP: Tuple[str, ...] = (
     "назначение",
     "purpose",
     "maqsad",
@@ -225,13 +271,16 @@ ELECTRICITY_USAGE_COLUMN_MAP: List[str] = [
     "примечание",
     "notes",
     "eslatma",
-]
+)
+
+# Set view of the column names for O(1) membership checks
+ELECTRICITY_USAGE_COLUMN_SET: FrozenSet[str] = frozenset(ELECTRICITY_USAGE_COLUMN_MAP)
 
 # Priority order for classification when multiple categories match
 # Higher priority = checked first
-USAGE_CLASSIFICATION_PRIORITY: List[str] = [
+USAGE_CLASSIFICATION_PRIORITY: Tuple[str, ...] = (
     ELECTRICITY_USAGE_TECH,  # Highest priority
     ELECTRICITY_USAGE_OWN,
     ELECTRICITY_USAGE_PROD,
     ELECTRICITY_USAGE_HOUSEHOLD,  # Lowest priority
-]
+)
@@ -3,9 +3,22 @@
 Определяет, откуда берется каждое поле паспорта и как оно заполняется
 """
 
-from typing import Dict, Any, Optional, List, Tuple
+import logging
+import threading
+from typing import Callable, Dict, Any, Iterator, Optional, List, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property, lru_cache
+from string import Formatter
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 
 class FieldType(Enum):
@@ -17,6 +30,12 @@ class FieldType(Enum):
     REFERENCE = "reference"  # Ссылочное поле (ссылка на другой лист)
 
 
+# Числовые коды типов полей для колоночного представления листа (int8)
+FIELD_TYPE_CODES: Dict[FieldType, int] = {
+    field_type: code for code, field_type in enumerate(FieldType)
+}
+
+
 class DataSource(Enum):
     """Источник данных"""
 
@@ -29,7 +48,7 @@ class DataSource(Enum):
     CALCULATION = "calculation"  # Расчетное поле
 
 
-@dataclass
+@dataclass(slots=True)
 class PassportField:
     """Описание поля энергопаспорта"""
 
@@ -54,6 +73,406 @@ class PassportField:
         default_factory=list
     )  # Ссылки на нормативные документы
 
+    def resolve_path(self, **context: Any) -> Optional[str]:
+        """
+        Подставить значения в шаблон data_path
+
+        Args:
+            **context: Значения плейсхолдеров (например, quarter="2022-Q1")
+
+        Returns:
+            Путь к данным (None, если data_path не задан); то же, что
+            data_path.format(**context)
+        """
+        if self.data_path is None:
+            return None
+        return _compile_data_path(self.data_path)(context)
+
+
+@lru_cache(maxsize=256)
+def _compile_data_path(template: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Разобрать шаблон data_path один раз и вернуть функцию подстановки
+
+    Простые плейсхолдеры ({quarter}) подставляются склейкой строк без
+    повторного разбора шаблона; форматы и составные имена - через str.format.
+    """
+    parts: List[Tuple[str, Optional[str]]] = []
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        if field_name is not None and (
+            format_spec or conversion or not field_name.isidentifier()
+        ):
+            return lambda context: template.format(**context)
+        parts.append((literal, field_name))
+
+    if all(field_name is None for _, field_name in parts):
+        return lambda context: template
+
+    def substitute(context: Dict[str, Any]) -> str:
+        chunks = []
+        for literal, field_name in parts:
+            chunks.append(literal)
+            if field_name is not None:
+                chunks.append(str(context[field_name]))
+        return "".join(chunks)
+
+    return substitute
+
+
+def _build_struktura_fields() -> List[PassportField]:
+    """Поля листа 'Структура пр 2'"""
+    return [
+        # Установленная мощность
+        PassportField(
+            field_name="Установленная электрическая мощность",
+            sheet_name="Структура пр 2",
+            row=7,
+            column=2,
+            cell_reference="B7",
+            field_type=FieldType.INPUT,
+            data_source=DataSource.MANUAL_INPUT,
+            data_path="enterprise.installed_power_kw",
+            unit="кВт",
+            is_required=False,
+            description="Установленная электрическая мощность предприятия",
+        ),
+        # Общее потребление по предприятию (квартально)
+        PassportField(
+            field_name="Общее потребление по предприятию - электроэнергия",
+            sheet_name="Структура пр 2",
+            row=9,
+            field_type=FieldType.SUMMARY,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.quarter_totals.active_kwh",
+            unit="кВт·ч",
+            is_required=True,
+            description="Общее потребление электроэнергии активной за квартал",
+            validation_rules=[">= 0", "должно равняться итогу листа Баланс"],
+        ),
+        # Потребление по категориям (технологические нужды)
+        PassportField(
+            field_name="Потребление для технологических нужд",
+            sheet_name="Структура пр 2",
+            row=10,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.by_usage.technological",
+            unit="кВт·ч",
+            is_required=False,
+            description="Потребление электроэнергии на технологические нужды",
+        ),
+        # Потребление по категориям (собственные нужды)
+        PassportField(
+            field_name="Потребление для собственных нужд",
+            sheet_name="Структура пр 2",
+            row=11,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.by_usage.own_needs",
+            unit="кВт·ч",
+            is_required=False,
+        ),
+        # Потребление по категориям (производственные нужды)
+        PassportField(
+            field_name="Потребление для производственных нужд",
+            sheet_name="Структура пр 2",
+            row=12,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.by_usage.production",
+            unit="кВт·ч",
+            is_required=False,
+        ),
+        # Потребление по категориям (хоз-бытовые нужды)
+        PassportField(
+            field_name="Потребление для хозяйственно-бытовых нужд",
+            sheet_name="Структура пр 2",
+            row=13,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.by_usage.household",
+            unit="кВт·ч",
+            is_required=False,
+        ),
+        # Газ (квартально)
+        PassportField(
+            field_name="Общее потребление газа",
+            sheet_name="Структура пр 2",
+            row=9,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.gas.{quarter}.quarter_totals.volume_m3",
+            unit="м³",
+            description="Потребление газа за квартал (конвертируется в тыс. м³)",
+        ),
+        # Вода (квартально)
+        PassportField(
+            field_name="Общее потребление воды",
+            sheet_name="Структура пр 2",
+            row=9,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.water.{quarter}.quarter_totals.volume_m3",
+            unit="м³",
+        ),
+    ]
+
+
+def _build_balans_fields() -> List[PassportField]:
+    """Поля листа 'Баланс'"""
+    return [
+        PassportField(
+            field_name="Технологические",
+            sheet_name="Баланс",
+            column=2,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.by_usage.technological",
+            unit="кВт·ч",
+            is_required=False,
+        ),
+        PassportField(
+            field_name="Собственные нужды",
+            sheet_name="Баланс",
+            column=3,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.by_usage.own_needs",
+            unit="кВт·ч",
+            is_required=False,
+        ),
+        PassportField(
+            field_name="Производственные",
+            sheet_name="Баланс",
+            column=4,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.by_usage.production",
+            unit="кВт·ч",
+            is_required=False,
+        ),
+        PassportField(
+            field_name="Хоз-бытовые",
+            sheet_name="Баланс",
+            column=5,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.by_usage.household",
+            unit="кВт·ч",
+            is_required=False,
+        ),
+        PassportField(
+            field_name="Итого",
+            sheet_name="Баланс",
+            column=6,
+            field_type=FieldType.SUMMARY,
+            data_source=DataSource.CALCULATION,
+            formula="=SUM(B{row}:E{row})",
+            calculation_function="sum_categories",
+            unit="кВт·ч",
+            is_required=True,
+            validation_rules=[
+                "должно равняться общему потреблению из Структура пр 2"
+            ],
+        ),
+    ]
+
+
+def _build_dinamika_fields() -> List[PassportField]:
+    """Поля листа 'Динамика ср'"""
+    return [
+        PassportField(
+            field_name="Электроэнергия",
+            sheet_name="Динамика ср",
+            column=3,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.electricity.{quarter}.quarter_totals.active_kwh",
+            unit="кВт·ч",
+        ),
+        PassportField(
+            field_name="Газ",
+            sheet_name="Динамика ср",
+            column=4,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.gas.{quarter}.quarter_totals.volume_m3",
+            unit="м³",
+        ),
+        PassportField(
+            field_name="Вода",
+            sheet_name="Динамика ср",
+            column=5,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.water.{quarter}.quarter_totals.volume_m3",
+            unit="м³",
+        ),
+        PassportField(
+            field_name="Производство",
+            sheet_name="Динамика ср",
+            column=6,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.production.{quarter}.quarter_totals",
+            unit="кг",
+            description="Сумма всех значений производства за квартал",
+        ),
+        PassportField(
+            field_name="Удельный расход",
+            sheet_name="Динамика ср",
+            column=7,
+            field_type=FieldType.CALCULATED,
+            data_source=DataSource.CALCULATION,
+            formula="=IF(G{row}>0,C{row}/G{row},0)",
+            calculation_function="specific_consumption_kwh_per_kg",
+            unit="кВт·ч/кг",
+            validation_rules=[">= 0", "если производство = 0, то расход = 0"],
+            description="Удельный расход электроэнергии на единицу продукции",
+        ),
+    ]
+
+
+def _build_specific_fields() -> List[PassportField]:
+    """Поля листа 'Расход на ед.п'"""
+    return [
+        PassportField(
+            field_name="Удельный расход по кварталам",
+            sheet_name="Расход на ед.п",
+            field_type=FieldType.CALCULATED,
+            data_source=DataSource.CALCULATION,
+            calculation_function="specific_consumption_kwh_per_kg",
+            unit="кВт·ч/кг",
+            description="Удельный расход электроэнергии на единицу продукции по кварталам",
+        ),
+    ]
+
+
+def _build_nodes_fields() -> List[PassportField]:
+    """Поля листа 'Узел учета'"""
+    return [
+        PassportField(
+            field_name="Пункты учёта",
+            sheet_name="Узел учета",
+            column=1,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.NODES_PARSER,
+            data_path="nodes.{index}.name",
+            description="Название узла учета",
+        ),
+        PassportField(
+            field_name="Вид учёта мощности P",
+            sheet_name="Узел учета",
+            column=2,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.NODES_PARSER,
+            data_path="nodes.{index}.power_type",
+        ),
+        PassportField(
+            field_name="Место установки",
+            sheet_name="Узел учета",
+            column=4,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.NODES_PARSER,
+            data_path="nodes.{index}.location",
+        ),
+        PassportField(
+            field_name="Коэффициент учёта",
+            sheet_name="Узел учета",
+            column=5,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.NODES_PARSER,
+            data_path="nodes.{index}.coefficient",
+            unit="-",
+        ),
+    ]
+
+
+def _build_measures_fields() -> List[PassportField]:
+    """Поля листа 'Мериаприятия 1'"""
+    return [
+        PassportField(
+            field_name="Мероприятие",
+            sheet_name="Мериаприятия 1",
+            column=1,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.MANUAL_INPUT,
+            data_path="measures.{index}.name",
+        ),
+        PassportField(
+            field_name="Экономия",
+            sheet_name="Мериаприятия 1",
+            column=2,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.MANUAL_INPUT,
+            data_path="measures.{index}.savings",
+            unit="зависит от единицы измерения",
+        ),
+        PassportField(
+            field_name="Ед. изм.",
+            sheet_name="Мериаприятия 1",
+            column=3,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.MANUAL_INPUT,
+            data_path="measures.{index}.unit",
+        ),
+        PassportField(
+            field_name="Стоимость",
+            sheet_name="Мериаприятия 1",
+            column=4,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.MANUAL_INPUT,
+            data_path="measures.{index}.cost_usd",
+            unit="USD",
+        ),
+        PassportField(
+            field_name="Срок окупаемости",
+            sheet_name="Мериаприятия 1",
+            column=5,
+            field_type=FieldType.CALCULATED,
+            data_source=DataSource.CALCULATION,
+            calculation_function="payback_period_years",
+            unit="лет",
+            description="Срок окупаемости мероприятия",
+        ),
+    ]
+
+
+def _build_fuel_fields() -> List[PassportField]:
+    """Поля листа 'мазут,уголь 5'"""
+    return [
+        PassportField(
+            field_name="Мазут",
+            sheet_name="мазут,уголь 5",
+            column=3,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.fuel.{quarter}.quarter_totals.volume_ton",
+            unit="тонна",
+        ),
+        PassportField(
+            field_name="Уголь",
+            sheet_name="мазут,уголь 5",
+            column=8,
+            field_type=FieldType.INPUT,
+            data_source=DataSource.AGGREGATOR,
+            data_path="resources.coal.{quarter}.quarter_totals.volume_ton",
+            unit="тонна",
+        ),
+    ]
+
+
+# Построители полей по листам: поля листа создаются при первом обращении к нему
+_SHEET_FIELD_BUILDERS: Dict[str, Callable[[], List[PassportField]]] = {
+    "Структура пр 2": _build_struktura_fields,
+    "Баланс": _build_balans_fields,
+    "Динамика ср": _build_dinamika_fields,
+    "Расход на ед.п": _build_specific_fields,
+    "Узел учета": _build_nodes_fields,
+    "Мериаприятия 1": _build_measures_fields,
+    "мазут,уголь 5": _build_fuel_fields,
+}
+
 
 class PassportFieldMapping:
     """
@@ -62,394 +481,121 @@ class PassportFieldMapping:
 
     def __init__(self):
         self._mappings: Dict[str, List[PassportField]] = {}
-        self._init_mappings()
-
-    def _init_mappings(self):
-        """Инициализация маппингов для всех листов"""
-
-        # === ЛИСТ "Структура пр 2" ===
-        struktura_fields = [
-            # Установленная мощность
-            PassportField(
-                field_name="Установленная электрическая мощность",
-                sheet_name="Структура пр 2",
-                row=7,
-                column=2,
-                cell_reference="B7",
-                field_type=FieldType.INPUT,
-                data_source=DataSource.MANUAL_INPUT,
-                data_path="enterprise.installed_power_kw",
-                unit="кВт",
-                is_required=False,
-                description="Установленная электрическая мощность предприятия",
-            ),
-            # Общее потребление по предприятию (квартально)
-            PassportField(
-                field_name="Общее потребление по предприятию - электроэнергия",
-                sheet_name="Структура пр 2",
-                row=9,
-                field_type=FieldType.SUMMARY,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.quarter_totals.active_kwh",
-                unit="кВт·ч",
-                is_required=True,
-                description="Общее потребление электроэнергии активной за квартал",
-                validation_rules=[">= 0", "должно равняться итогу листа Баланс"],
-            ),
-            # Потребление по категориям (технологические нужды)
-            PassportField(
-                field_name="Потребление для технологических нужд",
-                sheet_name="Структура пр 2",
-                row=10,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.by_usage.technological",
-                unit="кВт·ч",
-                is_required=False,
-                description="Потребление электроэнергии на технологические нужды",
-            ),
-            # Потребление по категориям (собственные нужды)
-            PassportField(
-                field_name="Потребление для собственных нужд",
-                sheet_name="Структура пр 2",
-                row=11,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.by_usage.own_needs",
-                unit="кВт·ч",
-                is_required=False,
-            ),
-            # Потребление по категориям (производственные нужды)
-            PassportField(
-                field_name="Потребление для производственных нужд",
-                sheet_name="Структура пр 2",
-                row=12,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.by_usage.production",
-                unit="кВт·ч",
-                is_required=False,
-            ),
-            # Потребление по категориям (хоз-бытовые нужды)
-            PassportField(
-                field_name="Потребление для хозяйственно-бытовых нужд",
-                sheet_name="Структура пр 2",
-                row=13,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.by_usage.household",
-                unit="кВт·ч",
-                is_required=False,
-            ),
-            # Газ (квартально)
-            PassportField(
-                field_name="Общее потребление газа",
-                sheet_name="Структура пр 2",
-                row=9,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.gas.{quarter}.quarter_totals.volume_m3",
-                unit="м³",
-                description="Потребление газа за квартал (конвертируется в тыс. м³)",
-            ),
-            # Вода (квартально)
-            PassportField(
-                field_name="Общее потребление воды",
-                sheet_name="Структура пр 2",
-                row=9,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.water.{quarter}.quarter_totals.volume_m3",
-                unit="м³",
-            ),
-        ]
-        self._mappings["Структура пр 2"] = struktura_fields
-
-        # === ЛИСТ "Баланс" ===
-        balans_fields = [
-            PassportField(
-                field_name="Технологические",
-                sheet_name="Баланс",
-                column=2,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.by_usage.technological",
-                unit="кВт·ч",
-                is_required=False,
-            ),
-            PassportField(
-                field_name="Собственные нужды",
-                sheet_name="Баланс",
-                column=3,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.by_usage.own_needs",
-                unit="кВт·ч",
-                is_required=False,
-            ),
-            PassportField(
-                field_name="Производственные",
-                sheet_name="Баланс",
-                column=4,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.by_usage.production",
-                unit="кВт·ч",
-                is_required=False,
-            ),
-            PassportField(
-                field_name="Хоз-бытовые",
-                sheet_name="Баланс",
-                column=5,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.by_usage.household",
-                unit="кВт·ч",
-                is_required=False,
-            ),
-            PassportField(
-                field_name="Итого",
-                sheet_name="Баланс",
-                column=6,
-                field_type=FieldType.SUMMARY,
-                data_source=DataSource.CALCULATION,
-                formula="=SUM(B{row}:E{row})",
-                calculation_function="sum_categories",
-                unit="кВт·ч",
-                is_required=True,
-                validation_rules=[
-                    "должно равняться общему потреблению из Структура пр 2"
-                ],
-            ),
-        ]
-        self._mappings["Баланс"] = balans_fields
-
-        # === ЛИСТ "Динамика ср" ===
-        dinamika_fields = [
-            PassportField(
-                field_name="Электроэнергия",
-                sheet_name="Динамика ср",
-                column=3,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.electricity.{quarter}.quarter_totals.active_kwh",
-                unit="кВт·ч",
-            ),
-            PassportField(
-                field_name="Газ",
-                sheet_name="Динамика ср",
-                column=4,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.gas.{quarter}.quarter_totals.volume_m3",
-                unit="м³",
-            ),
-            PassportField(
-                field_name="Вода",
-                sheet_name="Динамика ср",
-                column=5,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.water.{quarter}.quarter_totals.volume_m3",
-                unit="м³",
-            ),
-            PassportField(
-                field_name="Производство",
-                sheet_name="Динамика ср",
-                column=6,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.production.{quarter}.quarter_totals",
-                unit="кг",
-                description="Сумма всех значений производства за квартал",
-            ),
-            PassportField(
-                field_name="Удельный расход",
-                sheet_name="Динамика ср",
-                column=7,
-                field_type=FieldType.CALCULATED,
-                data_source=DataSource.CALCULATION,
-                formula="=IF(G{row}>0,C{row}/G{row},0)",
-                calculation_function="specific_consumption_kwh_per_kg",
-                unit="кВт·ч/кг",
-                validation_rules=[">= 0", "если производство = 0, то расход = 0"],
-                description="Удельный расход электроэнергии на единицу продукции",
-            ),
-        ]
-        self._mappings["Динамика ср"] = dinamika_fields
-
-        # === ЛИСТ "Расход на ед.п" ===
-        specific_fields = [
-            PassportField(
-                field_name="Удельный расход по кварталам",
-                sheet_name="Расход на ед.п",
-                field_type=FieldType.CALCULATED,
-                data_source=DataSource.CALCULATION,
-                calculation_function="specific_consumption_kwh_per_kg",
-                unit="кВт·ч/кг",
-                description="Удельный расход электроэнергии на единицу продукции по кварталам",
-            ),
-        ]
-        self._mappings["Расход на ед.п"] = specific_fields
-
-        # === ЛИСТ "Узел учета" ===
-        nodes_fields = [
-            PassportField(
-                field_name="Пункты учёта",
-                sheet_name="Узел учета",
-                column=1,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.NODES_PARSER,
-                data_path="nodes.{index}.name",
-                description="Название узла учета",
-            ),
-            PassportField(
-                field_name="Вид учёта мощности P",
-                sheet_name="Узел учета",
-                column=2,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.NODES_PARSER,
-                data_path="nodes.{index}.power_type",
-            ),
-            PassportField(
-                field_name="Место установки",
-                sheet_name="Узел учета",
-                column=4,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.NODES_PARSER,
-                data_path="nodes.{index}.location",
-            ),
-            PassportField(
-                field_name="Коэффициент учёта",
-                sheet_name="Узел учета",
-                column=5,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.NODES_PARSER,
-                data_path="nodes.{index}.coefficient",
-                unit="-",
-            ),
-        ]
-        self._mappings["Узел учета"] = nodes_fields
-
-        # === ЛИСТ "Мериаприятия 1" ===
-        measures_fields = [
-            PassportField(
-                field_name="Мероприятие",
-                sheet_name="Мериаприятия 1",
-                column=1,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.MANUAL_INPUT,
-                data_path="measures.{index}.name",
-            ),
-            PassportField(
-                field_name="Экономия",
-                sheet_name="Мериаприятия 1",
-                column=2,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.MANUAL_INPUT,
-                data_path="measures.{index}.savings",
-                unit="зависит от единицы измерения",
-            ),
-            PassportField(
-                field_name="Ед. изм.",
-                sheet_name="Мериаприятия 1",
-                column=3,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.MANUAL_INPUT,
-                data_path="measures.{index}.unit",
-            ),
-            PassportField(
-                field_name="Стоимость",
-                sheet_name="Мериаприятия 1",
-                column=4,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.MANUAL_INPUT,
-                data_path="measures.{index}.cost_usd",
-                unit="USD",
-            ),
-            PassportField(
-                field_name="Срок окупаемости",
-                sheet_name="Мериаприятия 1",
-                column=5,
-                field_type=FieldType.CALCULATED,
-                data_source=DataSource.CALCULATION,
-                calculation_function="payback_period_years",
-                unit="лет",
-                description="Срок окупаемости мероприятия",
-            ),
-        ]
-        self._mappings["Мериаприятия 1"] = measures_fields
-
-        # === ЛИСТ "мазут,уголь 5" ===
-        fuel_fields = [
-            PassportField(
-                field_name="Мазут",
-                sheet_name="мазут,уголь 5",
-                column=3,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.fuel.{quarter}.quarter_totals.volume_ton",
-                unit="тонна",
-            ),
-            PassportField(
-                field_name="Уголь",
-                sheet_name="мазут,уголь 5",
-                column=8,
-                field_type=FieldType.INPUT,
-                data_source=DataSource.AGGREGATOR,
-                data_path="resources.coal.{quarter}.quarter_totals.volume_ton",
-                unit="тонна",
-            ),
-        ]
-        self._mappings["мазут,уголь 5"] = fuel_fields
+        # (лист, имя поля) -> первое поле с этим именем на листе
+        self._by_sheet_and_name: Dict[Tuple[str, str], PassportField] = {}
+        # Колоночные представления листов (см. get_columns_for_sheet)
+        self._columns: Dict[str, Dict[str, Any]] = {}
+
+    def _all_fields(self) -> Iterator[PassportField]:
+        """Все поля всех листов (в порядке листов _SHEET_FIELD_BUILDERS)"""
+        for sheet_name in _SHEET_FIELD_BUILDERS:
+            yield from self.get_fields_for_sheet(sheet_name)
 
     def get_fields_for_sheet(self, sheet_name: str) -> List[PassportField]:
         """Получить все поля для указанного листа"""
-        return self._mappings.get(sheet_name, [])
+        fields = self._mappings.get(sheet_name)
+        if fields is None:
+            builder = _SHEET_FIELD_BUILDERS.get(sheet_name)
+            if builder is None:
+                return []
+            fields = self._mappings[sheet_name] = builder()
+            for field_item in fields:
+                self._by_sheet_and_name.setdefault((sheet_name, field_item.field_name), field_item)
+        return fields
+
+    def get_columns_for_sheet(self, sheet_name: str) -> Dict[str, Any]:
+        """
+        Получить поля листа в колоночном виде (для пакетной записи в Excel)
+
+        Атрибуты, которые читаются по всем полям листа подряд, собраны
+        в отдельные массивы в порядке get_fields_for_sheet; отсутствующие
+        row/column заменены на -1, а row_mask/column_mask отмечают заданные
+        значения - поля с адресом выбираются одной маской, например
+        rows[row_mask & column_mask], без ветвления на каждом поле.
+
+        Returns:
+            Словарь {"row", "column", "field_type", "data_path", "row_mask",
+            "column_mask"}: массивы numpy (без numpy - списки); field_type
+            хранится кодами из FIELD_TYPE_CODES
+        """
+        columns = self._columns.get(sheet_name)
+        if columns is None:
+            fields = self.get_fields_for_sheet(sheet_name)
+            columns = {
+                "row": [f.row if f.row is not None else -1 for f in fields],
+                "column": [f.column if f.column is not None else -1 for f in fields],
+                "field_type": [FIELD_TYPE_CODES[f.field_type] for f in fields],
+                "data_path": [f.data_path for f in fields],
+            }
+            if HAS_NUMPY:
+                columns["row"] = np.array(columns["row"], dtype=np.int32)
+                columns["column"] = np.array(columns["column"], dtype=np.int32)
+                columns["field_type"] = np.array(columns["field_type"], dtype=np.int8)
+                columns["data_path"] = np.array(columns["data_path"], dtype=object)
+                columns["row_mask"] = columns["row"] != -1
+                columns["column_mask"] = columns["column"] != -1
+            else:
+                columns["row_mask"] = [row != -1 for row in columns["row"]]
+                columns["column_mask"] = [column != -1 for column in columns["column"]]
+            if sheet_name in _SHEET_FIELD_BUILDERS:
+                self._columns[sheet_name] = columns
+        return columns
 
     def get_field_by_name(
         self, field_name: str, sheet_name: Optional[str] = None
     ) -> Optional[PassportField]:
         """Найти поле по имени"""
         if sheet_name:
-            fields = self.get_fields_for_sheet(sheet_name)
-            for field_item in fields:
-                if field_item.field_name == field_name:
-                    return field_item
-        else:
-            # Поиск по всем листам
-            for sheet_fields in self._mappings.values():
-                for sheet_field in sheet_fields:
-                    if sheet_field.field_name == field_name:
-                        return sheet_field
-        return None
+            self.get_fields_for_sheet(sheet_name)
+            return self._by_sheet_and_name.get((sheet_name, field_name))
+        # Поиск по всем листам
+        return self._by_name.get(field_name)
+
+    @cached_property
+    def _by_name(self) -> Dict[str, PassportField]:
+        by_name: Dict[str, PassportField] = {}
+        for sheet_field in self._all_fields():
+            first = by_name.setdefault(sheet_field.field_name, sheet_field)
+            if first is not sheet_field:
+                # Поиск без листа вернёт первое поле - остальные доступны только по листу
+                logger.debug(
+                    f"Поле '{sheet_field.field_name}' есть на листах '{first.sheet_name}' "
+                    f"и '{sheet_field.sheet_name}': без листа используется первое"
+                )
+        return by_name
+
+    # Индексы хранятся кортежами, а get_* возвращают новые списки: изменение
+    # результата вызывающим кодом не портит общий экземпляр маппинга
+    @cached_property
+    def _calculated_fields(self) -> Tuple[PassportField, ...]:
+        return tuple(
+            sheet_field
+            for sheet_field in self._all_fields()
+            if sheet_field.field_type is FieldType.CALCULATED
+        )
+
+    @cached_property
+    def _required_fields(self) -> Tuple[PassportField, ...]:
+        return tuple(sheet_field for sheet_field in self._all_fields() if sheet_field.is_required)
+
+    @cached_property
+    def _fields_by_data_source(self) -> Dict[DataSource, Tuple[PassportField, ...]]:
+        by_source: Dict[DataSource, List[PassportField]] = {}
+        for sheet_field in self._all_fields():
+            by_source.setdefault(sheet_field.data_source, []).append(sheet_field)
+        return {data_source: tuple(fields) for data_source, fields in by_source.items()}
 
     def get_calculated_fields(self) -> List[PassportField]:
         """Получить все расчетные поля"""
-        calculated = []
-        for sheet_fields in self._mappings.values():
-            for sheet_field in sheet_fields:
-                if sheet_field.field_type == FieldType.CALCULATED:
-                    calculated.append(sheet_field)
-        return calculated
+        return list(self._calculated_fields)
 
     def get_required_fields(self) -> List[PassportField]:
         """Получить все обязательные поля"""
-        required = []
-        for sheet_fields in self._mappings.values():
-            for sheet_field in sheet_fields:
-                if sheet_field.is_required:
-                    required.append(sheet_field)
-        return required
+        return list(self._required_fields)
 
     def get_fields_by_data_source(self, data_source: DataSource) -> List[PassportField]:
         """Получить поля по источнику данных"""
-        result = []
-        for sheet_fields in self._mappings.values():
-            for sheet_field in sheet_fields:
-                if sheet_field.data_source == data_source:
-                    result.append(sheet_field)
-        return result
+        return list(self._fields_by_data_source.get(data_source, ()))
 
     def build_quarter_mapping(
         self, year: str
@@ -463,34 +609,56 @@ class PassportFieldMapping:
         Returns:
             Словарь: {quarter: (start_row, elec_active_col, elec_reactive_col, gas_col, water_col)}
         """
-        # Базовая структура: каждый квартал занимает блок из ~16 столбцов
-        # Q1: колонки 3-16, Q2: 19-32, Q3: 35-48, Q4: 51-64
-
-        base_col = 3  # Первый столбец данных (C)
-        quarter_width = 16  # Ширина блока для квартала
-
-        mapping = {}
-        for q_num in range(1, 5):
-            quarter = f"{year}-Q{q_num}"
-            start_col = base_col + (q_num - 1) * quarter_width
-            mapping[quarter] = (
+        # Результат зависит только от года - кэшируется, вызывающий получает свою копию
+        return dict(_build_quarter_mapping(year))
+
+
+@lru_cache(maxsize=32)
+def _build_quarter_mapping(year: str) -> Tuple[Tuple[str, Tuple[int, int, int, int, int]], ...]:
+    """Пары (quarter, столбцы) для build_quarter_mapping"""
+    # Базовая структура: каждый квартал занимает блок из ~16 столбцов
+    # Q1: колонки 3-16, Q2: 19-32, Q3: 35-48, Q4: 51-64
+
+    base_col = 3  # Первый столбец данных (C)
+    quarter_width = 16  # Ширина блока для квартала
+
+    mapping = []
+    for q_num in range(1, 5):
+        quarter = f"{year}-Q{q_num}"
+        start_col = base_col + (q_num - 1) * quarter_width
+        mapping.append((
+            quarter,
+            (
                 9,  # start_row (строка "Общее потребление")
                 start_col,  # elec_active_col (активная электроэнергия)
                 start_col + 1,  # elec_reactive_col (реактивная)
                 start_col + 3,  # gas_col (газ, пропуская тепловую)
                 start_col + 11,  # water_col (вода)
-            )
+            ),
+        ))
 
-        return mapping
+    return tuple(mapping)
 
 
-# Глобальный экземпляр маппинга
-_field_mapping = None
+# Глобальный экземпляр маппинга (создаётся при первом обращении)
+_field_mapping: Optional[PassportFieldMapping] = None
+_field_mapping_lock = threading.Lock()
 
 
 def get_field_mapping() -> PassportFieldMapping:
     """Получить экземпляр маппинга полей"""
     global _field_mapping
     if _field_mapping is None:
-        _field_mapping = PassportFieldMapping()
+        # Двойная проверка: при одновременном первом обращении из нескольких
+        # потоков экземпляр создаётся ровно один раз
+        with _field_mapping_lock:
+            if _field_mapping is None:
+                _field_mapping = PassportFieldMapping()
     return _field_mapping
+
+
+def __getattr__(name: str) -> Any:
+    """Ленивый атрибут модуля field_mapping (PEP 562)"""
+    if name == "field_mapping":
+        return get_field_mapping()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Literal, Optional, Dict, Any, Set
+from typing import List, Literal, Optional, Dict, Any, Set, Tuple
 from enum import Enum
 
 from ai.ai_excel_semantic_parser import CanonicalSourceData, ResourceEntry
@@ -10,7 +10,7 @@ Severity = Literal["required", "recommended"]
 Overall = Literal["ready", "partially_ready", "blocked"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RequiredField:
     id: str
     section: str
@@ -27,73 +27,77 @@ class GenerationReadinessResult:
     notes: List[str] = field(default_factory=list)
 
 
-def get_default_passport_requirements() -> List[RequiredField]:
-    return [
-        RequiredField(
-            id="annual_electricity_total",
-            section="resources",
-            description="Annual electricity consumption total",
-            severity="required",
-            path_hint="resources.electricity.annual",
-        ),
-        # Recommended extensions (not blocking)
-        RequiredField(
-            id="annual_gas_total",
-            section="resources",
-            description="Annual gas consumption total",
-            severity="recommended",
-            path_hint="resources.gas.annual",
-        ),
-        RequiredField(
-            id="annual_water_total",
-            section="resources",
-            description="Annual water consumption total",
-            severity="recommended",
-            path_hint="resources.water.annual",
-        ),
-        RequiredField(
-            id="annual_fuel_total",
-            section="resources",
-            description="Annual fuel consumption total",
-            severity="recommended",
-            path_hint="resources.fuel.annual",
-        ),
-        RequiredField(
-            id="annual_coal_total",
-            section="resources",
-            description="Annual coal consumption total",
-            severity="recommended",
-            path_hint="resources.coal.annual",
-        ),
-        RequiredField(
-            id="annual_heat_total",
-            section="resources",
-            description="Annual heat consumption total",
-            severity="required",
-            path_hint="resources.heat.annual",
-        ),
-        RequiredField(
-            id="at_least_one_equipment_item",
-            section="equipment",
-            description="At least one equipment item with nominal_power_kw",
-            severity="required",
-            path_hint="equipment[*].nominal_power_kw",
-        ),
-        RequiredField(
-            id="at_least_one_node",
-            section="nodes",
-            description="At least one metering node",
-            severity="required",
-            path_hint="nodes[*]",
-        ),
-        RequiredField(
-            id="envelope_u_values",
-            section="envelope",
-            description="U-values for key envelope elements",
-            severity="recommended",
-            path_hint="envelope[*].u_value_w_m2k",
-        ),
-    ]
+# Immutable configuration, built once at import
+_DEFAULT_REQS: Tuple[RequiredField, ...] = (
+    RequiredField(
+        id="annual_electricity_total",
+        section="resources",
+        description="Annual electricity consumption total",
+        severity="required",
+        path_hint="resources.electricity.annual",
+    ),
+    # Recommended extensions (not blocking)
+    RequiredField(
+        id="annual_gas_total",
+        section="resources",
+        description="Annual gas consumption total",
+        severity="recommended",
+        path_hint="resources.gas.annual",
+    ),
+    RequiredField(
+        id="annual_water_total",
+        section="resources",
+        description="Annual water consumption total",
+        severity="recommended",
+        path_hint="resources.water.annual",
+    ),
+    RequiredField(
+        id="annual_fuel_total",
+        section="resources",
+        description="Annual fuel consumption total",
+        severity="recommended",
+        path_hint="resources.fuel.annual",
+    ),
+    RequiredField(
+        id="annual_coal_total",
+        section="resources",
+        description="Annual coal consumption total",
+        severity="recommended",
+        path_hint="resources.coal.annual",
+    ),
+    RequiredField(
+        id="annual_heat_total",
+        section="resources",
+        description="Annual heat consumption total",
+        severity="required",
+        path_hint="resources.heat.annual",
+    ),
+    RequiredField(
+        id="at_least_one_equipment_item",
+        section="equipment",
+        description="At least one equipment item with nominal_power_kw",
+        severity="required",
+        path_hint="equipment[*].nominal_power_kw",
+    ),
+    RequiredField(
+        id="at_least_one_node",
+        section="nodes",
+        description="At least one metering node",
+        severity="required",
+        path_hint="nodes[*]",
+    ),
+    RequiredField(
+        id="envelope_u_values",
+        section="envelope",
+        description="U-values for key envelope elements",
+        severity="recommended",
+        path_hint="envelope[*].u_value_w_m2k",
+    ),
+)
+
+
+def get_default_passport_requirements() -> Tuple[RequiredField, ...]:
+    return _DEFAULT_REQS
 
 
 def _annual_total_by_resource(
@@ -125,16 +129,15 @@ def evaluate_generation_readiness(
     if canonical is None:
         return GenerationReadinessResult(
             overall_status="blocked",
-            missing_required=get_default_passport_requirements(),
+            missing_required=list(_DEFAULT_REQS),
             notes=["CanonicalSourceData unavailable"],
         )
 
-    reqs = get_default_passport_requirements()
     missing_required: List[RequiredField] = []
     missing_optional: List[RequiredField] = []
 
     # Simple checks guided by path_hint
-    for rf in reqs:
+    for rf in _DEFAULT_REQS:
         ok = False
         if rf.id == "annual_electricity_total":
             ok = _annual_total_by_resource(canonical, "electricity") is not None
@@ -1668,6 +1668,9 @@ async def upload_file(
                         resources = aggregation_data.get("resources", {})
                         logger.info(f"📦 Найдено ресурсов для импорта: {list(resources.keys())}")
                         imported_total = 0
+                        from datetime import datetime
+                        # Одна метка времени на все ресурсы загрузки
+                        imported_at = datetime.utcnow().isoformat()
                         
                         # Импортируем все доступные ресурсы
                         for resource_type, resource_data in resources.items():
@@ -1680,6 +1683,7 @@ async def upload_file(
                                     batch_id=batch_id,
                                     resource_type=resource_type,
                                     resource_data=resource_data,
+                                    now=imported_at,
                                 )
                                 imported_total += len(imported_records)
                                 logger.info(
@@ -4054,8 +4058,8 @@ def get_normative_document_by_id(document_id: int):
                 "ai_processed": doc.get("ai_processed"),
                 "processing_status": doc.get("processing_status"),
             },
-            "has_full_text": bool(doc.get("full_text")),
-            "has_parsed_data": bool(doc.get("parsed_data_json")),
+            "has_full_text": doc.get("has_full_text", False),
+            "has_parsed_data": doc.get("has_parsed_data", False),
         }
     except HTTPException:
         raise
@@ -4068,7 +4072,7 @@ def get_normative_document_by_id(document_id: int):
 def get_normative_document_text(document_id: int):
     """Получить полный текст нормативного документа"""
     try:
-        doc = database.get_normative_document(document_id)
+        doc = database.get_normative_document_text(document_id)
         if not doc:
             raise HTTPException(status_code=404, detail=f"Документ с ID={document_id} не найден")
         
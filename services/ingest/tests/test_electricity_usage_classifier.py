@@ -6,8 +6,19 @@ from __future__ import annotations
 
 
 from ai.ai_excel_semantic_parser import EquipmentItem, NodeItem
-from domain.electricity_usage_classifier import classify_equipment_usage
+from domain.electricity_usage_classifier import (
+    classify_equipment_usage,
+    classify_equipment_usage_bulk,
+    classify_usage,
+    classify_series,
+    classify_usage_regex,
+    reload_keywords,
+    _classify_usage_cached,
+)
 from domain.passport_field_map import (
+    ELECTRICITY_USAGE_KEYWORDS,
+    ELECTRICITY_USAGE_KEYWORD_SETS,
+    ELECTRICITY_USAGE_KEYWORDS_LOWER,
     ELECTRICITY_USAGE_TECH,
     ELECTRICITY_USAGE_OWN,
     ELECTRICITY_USAGE_PROD,
@@ -138,3 +149,108 @@ class TestElectricityUsageClassifier:
         assert result == ELECTRICITY_USAGE_HOUSEHOLD, (
             f"Ожидалось {ELECTRICITY_USAGE_HOUSEHOLD}, получено {result}"
         )
+
+    def test_repeated_item_with_different_nodes(self):
+        """Тест 13: Кэш классификации по полям не подменяет эвристику по узлам учета."""
+        item = EquipmentItem(name="Насос", location="Блок А", nominal_power_kw=5.0)
+        boiler_nodes = [NodeItem(node_id="Узел-1", location="Блок А, котельная")]
+        office_nodes = [NodeItem(node_id="Узел-2", location="Блок А, офис")]
+
+        assert classify_equipment_usage(item, boiler_nodes) == ELECTRICITY_USAGE_OWN
+        assert classify_equipment_usage(item, office_nodes) == ELECTRICITY_USAGE_HOUSEHOLD
+        assert classify_equipment_usage(item) == ELECTRICITY_USAGE_PROD
+
+    def test_bulk_matches_single_item_classification(self):
+        """Тест 14: Пакетная классификация совпадает с поэлементной."""
+        items = [
+            EquipmentItem(name="Технологический насос ПН-100", nominal_power_kw=50.0),
+            EquipmentItem(name="Насос", location="Котельная", nominal_power_kw=10.0),
+            EquipmentItem(name="Станок", type="токарный", location="Цех №2"),
+            EquipmentItem(name="Кондиционер", location="Офис"),
+            EquipmentItem(name="Двигатель", extra={"назначение": "хоз-быт"}),
+            EquipmentItem(name="Насос", location="Блок А"),
+            EquipmentItem(name="Насос", type="технологический"),
+        ]
+        nodes = [NodeItem(node_id="Узел-1", location="Блок А, склад")]
+
+        expected = [classify_equipment_usage(item, nodes) for item in items]
+        assert classify_equipment_usage_bulk(items, nodes) == expected
+        assert expected[-2] == ELECTRICITY_USAGE_HOUSEHOLD
+        assert classify_equipment_usage_bulk([]) == []
+
+    def test_classify_usage_picks_highest_priority_category(self):
+        """Тест 15: Текст с ключевыми словами нескольких категорий - побеждает приоритетная."""
+        assert classify_usage("Склад цеха №2, технологическая линия") == ELECTRICITY_USAGE_TECH
+        assert classify_usage("Склад цеха №2") == ELECTRICITY_USAGE_PROD
+        assert classify_usage("КОТЕЛЬНАЯ") == ELECTRICITY_USAGE_OWN
+        assert classify_usage("Освещение бытовое") == ELECTRICITY_USAGE_HOUSEHOLD
+        assert classify_usage("Прочее") is None
+        assert classify_usage("") is None
+
+    def test_classify_usage_regex_matches_automaton(self):
+        """Тест 16: Классификация регулярными выражениями совпадает с Aho-Corasick."""
+        texts = [
+            "Склад цеха №2, технологическая линия",
+            "Склад цеха №2",
+            "КОТЕЛЬНАЯ",
+            "Освещение бытовое",
+            "ТП-10 у офиса",
+            "Прочее",
+            "",
+        ]
+        assert [classify_usage_regex(text) for text in texts] == [
+            classify_usage(text) for text in texts
+        ]
+
+    def test_classify_usage_is_cached_by_normalized_text(self):
+        """Тест 17: Повторы текста с другим регистром и пробелами берутся из кэша."""
+        _classify_usage_cached.cache_clear()
+
+        assert classify_usage("Цех №3") == ELECTRICITY_USAGE_PROD
+        assert classify_usage("  ЦЕХ №3 ") == ELECTRICITY_USAGE_PROD
+
+        info = _classify_usage_cached.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+    def test_classify_series_matches_classify_usage(self):
+        """Тест 18: Векторная классификация столбца совпадает с поштучной."""
+        import pandas as pd
+
+        texts = pd.Series(
+            ["Склад цеха №2, технологическая линия", None, "КОТЕЛЬНАЯ", "Прочее", "офис"],
+            index=[10, 11, 12, 13, 14],
+        )
+
+        result = classify_series(texts)
+
+        assert list(result.index) == list(texts.index)
+        assert list(result) == [
+            ELECTRICITY_USAGE_TECH, None, ELECTRICITY_USAGE_OWN, None, ELECTRICITY_USAGE_HOUSEHOLD,
+        ]
+
+    def test_keyword_tables_have_no_duplicates(self):
+        """Тест 19: Ключевые слова категорий не повторяются."""
+        for category_id, keywords in ELECTRICITY_USAGE_KEYWORDS_LOWER.items():
+            assert len(keywords) == len(ELECTRICITY_USAGE_KEYWORD_SETS[category_id])
+        assert "собственные нужды" in ELECTRICITY_USAGE_KEYWORD_SETS[ELECTRICITY_USAGE_OWN]
+
+    def test_reload_keywords_rebuilds_classifier_caches(self):
+        """Тест 20: Новые ключевые слова применяются без перезапуска, кэши сбрасываются."""
+        original = dict(ELECTRICITY_USAGE_KEYWORDS)
+        item = EquipmentItem(name="Насосная станция", nominal_power_kw=5.0)
+        assert classify_usage("Насосная станция") is None
+        assert classify_equipment_usage(item) == ELECTRICITY_USAGE_PROD
+
+        updated = dict(original)
+        updated[ELECTRICITY_USAGE_OWN] = (*original[ELECTRICITY_USAGE_OWN], "Насосная")
+        try:
+            assert reload_keywords(updated)
+            assert not reload_keywords(updated)
+            assert classify_usage("Насосная станция") == ELECTRICITY_USAGE_OWN
+            assert classify_usage_regex("Насосная станция") == ELECTRICITY_USAGE_OWN
+            assert classify_equipment_usage(item) == ELECTRICITY_USAGE_OWN
+            assert classify_equipment_usage_bulk([item]) == [ELECTRICITY_USAGE_OWN]
+        finally:
+            reload_keywords(original)
+
+        assert classify_usage("Насосная станция") is None
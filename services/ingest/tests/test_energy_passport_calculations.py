@@ -0,0 +1,222 @@
+"""
+Тесты формул энергопаспорта (domain.energy_passport_calculations).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from domain.energy_passport_calculations import (
+    distribute_quarter_by_usage_categories,
+    distribute_quarters_by_usage_categories_batch,
+)
+
+
+def test_batch_distribution_matches_scalar():
+    """Пакетное распределение совпадает с поквартальным, включая edge-кейсы."""
+    categories = ["technological", "own_needs", "production", "household"]
+    yearly_rows = [
+        [400.0, 100.0, 300.0, 200.0],
+        [0.0, 0.0, 0.0, 0.0],  # годовой итог = 0 - равномерно
+        [-50.0, 100.0, 50.0, 0.0],  # отрицательная категория считается 0
+        [-10.0, 0.0, 5.0, 0.0],  # отрицательный итог - равномерно
+    ]
+    quarter_totals = [1000.0, 400.0, 90.0, 80.0]
+
+    batch = distribute_quarters_by_usage_categories_batch(
+        np.array(quarter_totals), np.array(yearly_rows)
+    )
+
+    assert batch.shape == (4, 4)
+    for row, quarter_total, yearly in zip(batch, quarter_totals, yearly_rows):
+        expected = distribute_quarter_by_usage_categories(
+            quarter_total, dict(zip(categories, yearly))
+        )
+        assert np.allclose(row, [expected[cat] for cat in categories])
+
+
+def test_total_consumption_and_cost_by_resource():
+    """Итоги по ресурсу: приоритет ключей, пустые значения и служебные записи."""
+    from domain.energy_passport_calculations import (
+        calculate_total_consumption_by_resource,
+        calculate_total_cost_by_resource,
+    )
+
+    agg_data = {
+        "resources": {
+            "electricity": {
+                "2022-Q1": {"quarter_totals": {"active_kwh": 100.0, "cost_sum": 10.0}},
+                "2022-Q2": {"quarter_totals": {"active_kwh": None, "cost_sum": 5.5}},
+                "note": "не квартал",
+            },
+            "fuel": {
+                "2022-Q1": {"quarter_totals": {"volume_t": 2.0}},
+                "2022-Q2": {"quarter_totals": {"volume_ton": 3.0, "volume_t": 100.0}},
+            },
+        }
+    }
+
+    assert calculate_total_consumption_by_resource(agg_data, "electricity") == 100.0
+    assert calculate_total_consumption_by_resource(agg_data, "fuel") == 5.0
+    assert calculate_total_consumption_by_resource(agg_data, "gas") == 0.0
+    assert calculate_total_consumption_by_resource(agg_data, "unknown") == 0.0
+    assert calculate_total_cost_by_resource(agg_data, "electricity") == 15.5
+
+
+def test_total_costs_over_all_resources():
+    from domain.energy_passport_calculations import calculate_total_costs
+
+    agg_data = {
+        "resources": {
+            "electricity": {"2022-Q1": {"quarter_totals": {"cost_sum": 10.0}}},
+            "water": {"2022-Q1": {"quarter_totals": {"cost_sum": 2.5}}},
+        }
+    }
+
+    assert calculate_total_costs(agg_data) == {
+        "electricity": 10.0,
+        "gas": 0.0,
+        "water": 2.5,
+        "total": 12.5,
+    }
+
+
+def test_monthly_power_consumption_defaults():
+    from domain.energy_passport_calculations import (
+        calculate_consumption_from_monthly_power,
+        calculate_quarter_consumption_from_monthly_power,
+        calculate_quarter_reactive_consumption_from_monthly_power,
+    )
+
+    assert calculate_consumption_from_monthly_power(10.0) == 7200.0
+    assert calculate_consumption_from_monthly_power(-5.0) == 0.0
+    assert calculate_quarter_consumption_from_monthly_power(10.0) == 21600.0
+    assert calculate_quarter_consumption_from_monthly_power(10.0, 700.0) == 21000.0
+    assert calculate_quarter_reactive_consumption_from_monthly_power(2.0) == 4320.0
+
+
+def test_extract_quarter_data_sums_positive_production():
+    from domain.energy_passport_calculations import extract_quarter_data
+
+    agg_data = {
+        "resources": {
+            "electricity": {"2023-Q2": {"quarter_totals": {"active_kwh": 500.0}}},
+            "production": {
+                "2023-Q2": {
+                    "quarter_totals": {"мука": 120.0, "отруби": 30, "брак": -5.0, "ед": "кг"}
+                }
+            },
+        }
+    }
+
+    quarter = extract_quarter_data("2023-Q2", agg_data)
+
+    assert (quarter.year, quarter.quarter_num) == (2023, 2)
+    assert quarter.electricity_active_kwh == 500.0
+    assert quarter.production_kg == 150.0
+    assert quarter.gas_m3 == 0
+
+
+def test_balance_total_ignores_negative_and_missing():
+    from domain.energy_passport_calculations import calculate_balance_total
+
+    assert calculate_balance_total(100.0, 50.0, 25.0, 5.0) == 180.0
+    assert calculate_balance_total(100.0, -50.0, None, 0) == 100.0
+    assert calculate_balance_total(None, None, None, None) == 0.0
+
+
+def test_extract_all_quarters_matches_per_quarter_extraction():
+    from domain.energy_passport_calculations import (
+        extract_all_quarters,
+        extract_quarter_data,
+    )
+
+    agg_data = {
+        "resources": {
+            "electricity": {
+                "2022-Q1": {"quarter_totals": {"active_kwh": 100.0, "reactive_kvarh": 20.0}},
+                "2022-Q2": {"quarter_totals": {"active_kwh": 150.0}},
+            },
+            "gas": {"2022-Q2": {"quarter_totals": {"volume_m3": 30.0}}},
+            "coal": {"2022-Q3": {"quarter_totals": {"volume_t": 1.5}}},
+            "production": {"2022-Q1": {"quarter_totals": {"мука": 10.0, "брак": -1.0}}},
+        }
+    }
+
+    arrays = extract_all_quarters(agg_data)
+
+    assert arrays["quarters"] == ["2022-Q1", "2022-Q2", "2022-Q3"]
+    for index, quarter in enumerate(arrays["quarters"]):
+        expected = extract_quarter_data(quarter, agg_data)
+        for field_name in (
+            "electricity_active_kwh",
+            "electricity_reactive_kvarh",
+            "gas_m3",
+            "water_m3",
+            "fuel_ton",
+            "coal_ton",
+            "heat_gcal",
+            "production_kg",
+        ):
+            assert arrays[field_name][index] == getattr(expected, field_name)
+
+
+def test_validate_quarters_bulk_matches_single_validation():
+    from domain.energy_passport_calculations import (
+        QuarterData,
+        validate_quarter_data,
+        validate_quarters_bulk,
+    )
+
+    quarters = [
+        QuarterData("2022-Q1", 2022, 1, electricity_active_kwh=1000.0),
+        QuarterData("2022-Q2", 2022, 2, electricity_active_kwh=-1.0, gas_m3=-2.0),
+        QuarterData("2022-Q3", 2022, 3, electricity_active_kwh=2e8),
+        QuarterData("2022-Q4", 2022, 4, production_kg=-3.0),
+    ]
+
+    results = validate_quarters_bulk(quarters)
+
+    assert results == [validate_quarter_data(q) for q in quarters]
+    assert [is_valid for is_valid, _ in results] == [True, False, False, False]
+    assert validate_quarters_bulk([]) == []
+
+
+def test_clamped_ratios():
+    from domain.energy_passport_calculations import (
+        calculate_equipment_usage_coefficient,
+        calculate_equipment_used_power,
+        calculate_loss_percentage,
+    )
+
+    assert calculate_equipment_usage_coefficient(50.0, 100.0) == 0.5
+    assert calculate_equipment_usage_coefficient(150.0, 100.0) == 1.0
+    assert calculate_equipment_used_power(100.0, 1.5) == 100.0
+    assert calculate_equipment_used_power(100.0, -0.5) == 0.0
+    assert calculate_loss_percentage(90.0, 100.0, 10.0) == 10.0
+    assert calculate_loss_percentage(10000.0, 100.0, 10.0) == 100.0
+    assert calculate_loss_percentage(-5.0, 100.0, 10.0) == 0.0
+
+
+def test_resource_totals_follow_in_place_edits():
+    from domain.energy_passport_calculations import (
+        calculate_total_consumption_by_resource,
+        calculate_total_costs,
+    )
+
+    agg_data = {
+        "resources": {
+            "electricity": {"2022-Q1": {"quarter_totals": {"active_kwh": 100.0, "cost_sum": 10.0}}},
+        }
+    }
+    assert calculate_total_consumption_by_resource(agg_data, "electricity") == 100.0
+
+    agg_data["resources"]["electricity"]["2022-Q2"] = {
+        "quarter_totals": {"active_kwh": 50.0, "cost_sum": 5.0}
+    }
+    assert calculate_total_consumption_by_resource(agg_data, "electricity") == 150.0
+    assert calculate_total_costs(agg_data)["total"] == 15.0
+
+    # Изменение значения на месте сразу отражается в итогах
+    agg_data["resources"]["electricity"]["2022-Q2"]["quarter_totals"]["cost_sum"] = 7.0
+    assert calculate_total_costs(agg_data)["total"] == 17.0
@@ -0,0 +1,108 @@
+"""
+Тесты единиц измерения и конвертации (domain.energy_units).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from domain.energy_units import (
+    EnergyUnit,
+    HeatUnit,
+    VolumeUnit,
+    normalize_energy_to_kwh,
+    normalize_energy_to_kwh_array,
+    normalize_mass_to_ton,
+    normalize_volume_to_m3,
+    normalize_volume_to_m3_array,
+    to_gcal,
+    to_gcal_array,
+    to_gj,
+    to_kvarh,
+    to_kwh,
+    to_kwh_array,
+    to_m3,
+    to_mwh,
+    to_ton,
+)
+
+
+def test_converters_accept_strings_and_enum_members():
+    assert to_kwh(2.0, "МВт·ч") == 2000.0
+    assert to_kwh(2.0, EnergyUnit.GWH) == 2000000.0
+    assert to_mwh(500.0, EnergyUnit.KWH) == 0.5
+    assert to_kvarh(3.0, "МВАр·ч") == 3000.0
+    assert to_m3(5.0, VolumeUnit.THOUSAND_M3) == 5000.0
+    assert to_ton(250.0, "кг") == 0.25
+    assert to_gcal(2.0, HeatUnit.GCAL) == 2.0
+    assert to_gcal(1000.0, "МДж") == pytest.approx(0.238846)
+
+
+@pytest.mark.parametrize(
+    "converter, unit",
+    [
+        (to_kwh, "кВт"),  # мощность, а не энергия
+        (to_kwh, "неизвестно"),
+        (to_gcal, EnergyUnit.MWH),  # член другого Enum
+        (to_ton, VolumeUnit.M3),
+        (to_mwh, "кВАр·ч"),
+        (to_gj, "кВт·ч"),
+    ],
+)
+def test_converters_reject_unsupported_units(converter, unit):
+    with pytest.raises(ValueError):
+        converter(1.0, unit)
+
+
+@pytest.mark.parametrize(
+    "normalize, unit, expected",
+    [
+        (normalize_energy_to_kwh, "кВт·ч", 2.0),
+        (normalize_energy_to_kwh, "MWh", 2000.0),
+        (normalize_energy_to_kwh, "гвтч", 2000000.0),
+        (normalize_energy_to_kwh, "МВАр·ч", 2000.0),
+        (normalize_energy_to_kwh, "неизвестно", 2.0),
+        (normalize_volume_to_m3, "м³", 2.0),
+        (normalize_volume_to_m3, "thousand", 2000.0),
+        (normalize_volume_to_m3, "литр", 0.002),
+        (normalize_mass_to_ton, "тонн", 2.0),
+        (normalize_mass_to_ton, "килограмм", 0.002),
+    ],
+)
+def test_normalize_string_units(normalize, unit, expected):
+    assert normalize(2.0, unit) == pytest.approx(expected)
+
+
+def test_array_normalization_matches_scalar():
+    units = ["кВт·ч", "MWh", "кВт·ч", "неизвестно", "гвтч"]
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    result = normalize_energy_to_kwh_array(np.array(values), np.array(units))
+
+    assert result.tolist() == [
+        normalize_energy_to_kwh(value, unit) for value, unit in zip(values, units)
+    ]
+    assert normalize_volume_to_m3_array(np.array([1.0]), np.array(["thousand"]))[0] == 1000.0
+
+
+def test_array_converters_match_scalar_and_reject_unknown_units():
+    units = ["МВт·ч", EnergyUnit.KWH, EnergyUnit.GWH, "кВт·ч"]
+    values = [1.5, 2.0, 0.001, 4.0]
+
+    result = to_kwh_array(np.array(values), units)
+
+    assert result.tolist() == [to_kwh(value, unit) for value, unit in zip(values, units)]
+    assert to_gcal_array([1000.0], np.array(["МДж"]))[0] == to_gcal(1000.0, "МДж")
+    with pytest.raises(ValueError):
+        to_kwh_array([1.0, 2.0], ["кВт·ч", "кВт"])
+
+
+def test_composed_converters_are_exact_for_identity_and_metric_prefixes():
+    assert to_gj(2.5, HeatUnit.GJ) == 2.5
+    assert to_gj(2500.0, "МДж") == 2.5
+    assert to_gj(1.0, "Гкал") == 4.1868
+    assert to_gj(1e6, HeatUnit.KCAL) == pytest.approx(4.1868)
+    assert to_gj(1.0, HeatUnit.MWH_HEAT) == pytest.approx(3.6, rel=1e-5)
+    assert to_mwh(2.5, "МВт·ч") == 2.5
+    assert to_mwh(2.0, EnergyUnit.GWH) == 2000.0
@@ -0,0 +1,51 @@
+"""
+Тесты обёртки быстрой (де)сериализации JSON.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from database import safe_json_dumps
+from utils import fast_json
+
+
+def test_roundtrip_keeps_cyrillic_and_numbers():
+    data = {"узел": "Узел-1", "kwh": 1234.5, "values": [1, 2, 3]}
+    text = fast_json.dumps(data)
+    assert "Узел-1" in text
+    assert fast_json.loads(text) == data
+    assert fast_json.loads(text.encode("utf-8")) == data
+
+
+def test_loads_accepts_legacy_nan():
+    """Записи, сохранённые через json.dumps, могут содержать NaN."""
+    value = fast_json.loads('{"a": NaN}')["a"]
+    assert value != value
+
+
+def test_safe_json_dumps_serializes_dates():
+    text = safe_json_dumps({"ts": datetime(2024, 1, 2, 3, 4, 5), "day": date(2024, 1, 2)})
+    assert fast_json.loads(text) == {"ts": "2024-01-02T03:04:05", "day": "2024-01-02"}
+
+
+def test_lazy_json_parses_on_first_access():
+    lazy = fast_json.LazyJSON('{"kwh": 10.5}')
+    assert repr(lazy) == "LazyJSON(raw)"
+    assert lazy.get("kwh") == 10.5
+    assert repr(lazy) == "LazyJSON(parsed)"
+    assert dict(lazy) == {"kwh": 10.5}
+
+
+def test_lazy_json_invalid_payload_reads_as_empty():
+    assert fast_json.LazyJSON("{broken").as_dict() == {}
+
+
+def test_non_finite_floats_survive_roundtrip():
+    data = {"a": float("nan"), "b": [float("inf"), -float("inf")], "c": 1.5}
+
+    for text in (safe_json_dumps(data), fast_json.dumps(data), fast_json.dumps_bytes(data)):
+        restored = fast_json.loads(text)
+        assert restored["a"] != restored["a"]
+        assert restored["b"] == [float("inf"), -float("inf")]
+        assert restored["c"] == 1.5
@@ -0,0 +1,101 @@
+"""
+Тесты импорта потребления по узлам учёта (import_node_consumption_to_db).
+"""
+
+from __future__ import annotations
+
+
+def test_import_node_consumption_upserts_existing_rows(test_db):
+    """Повторный импорт того же узла/периода обновляет запись, а не дублирует её."""
+    import database
+
+    first = database.import_node_consumption_to_db(
+        enterprise_id=1,
+        batch_id="batch-1",
+        node_consumption_data=[
+            {"node_name": "Узел-1", "period": "2022-Q1", "active_energy_kwh": 100.0},
+            {"node_name": "Узел-2", "period": "2022-Q1", "active_energy_kwh": 50.0},
+            {"period": "2022-Q1"},  # без node_name - пропускается
+        ],
+    )
+    assert [record["node_name"] for record in first] == ["Узел-1", "Узел-2"]
+
+    second = database.import_node_consumption_to_db(
+        enterprise_id=1,
+        batch_id="batch-2",
+        node_consumption_data=[
+            {"node_name": "Узел-1", "period": "2022-Q1", "active_energy_kwh": 150.0},
+        ],
+    )
+    assert second[0]["id"] == first[0]["id"]
+
+    records = {r["node_name"]: r for r in database.get_node_consumption(enterprise_id=1)}
+    assert len(records) == 2
+    assert records["Узел-1"]["active_energy_kwh"] == 150.0
+    assert records["Узел-1"]["batch_id"] == "batch-2"
+    assert records["Узел-2"]["batch_id"] == "batch-1"
+
+
+def test_import_node_consumption_keeps_data_types_apart(test_db):
+    """Потребление и выработка одного узла за период хранятся раздельно."""
+    import database
+
+    records = database.import_node_consumption_to_db(
+        enterprise_id=1,
+        batch_id="batch-1",
+        node_consumption_data=[
+            {"node_name": "Узел-1", "period": "2022-Q1", "active_energy_kwh": 100.0},
+            {
+                "node_name": "Узел-1",
+                "period": "2022-Q1",
+                "active_energy_kwh": 30.0,
+                "data_type": "production",
+            },
+        ],
+    )
+    assert len(records) == 2
+    assert records[0]["id"] != records[1]["id"]
+    assert len(database.get_node_consumption(enterprise_id=1)) == 2
+
+
+def test_import_node_consumption_roundtrips_data_json(test_db):
+    """data_json хранится байтами (BLOB) и читается обратно словарём."""
+    import database
+
+    database.import_node_consumption_to_db(
+        enterprise_id=1,
+        batch_id="batch-1",
+        node_consumption_data=[
+            {
+                "node_name": "Узел-1",
+                "period": "2022-Q1",
+                "data_json": {"счётчик": "СЭТ-4ТМ", "months": [1, 2, 3]},
+            },
+        ],
+    )
+
+    record = database.get_node_consumption(enterprise_id=1)[0]
+    assert record["data_json"] == {"счётчик": "СЭТ-4ТМ", "months": [1, 2, 3]}
+
+    lazy_record = database.get_node_consumption(enterprise_id=1, lazy_json=True)[0]
+    assert lazy_record["data_json"]["счётчик"] == "СЭТ-4ТМ"
+
+
+def test_import_node_consumption_collapses_duplicates_in_batch(test_db):
+    """Повторы узла/периода внутри одного пакета пишутся одной строкой (побеждает последняя)."""
+    import database
+
+    records = database.import_node_consumption_to_db(
+        enterprise_id=1,
+        batch_id="batch-1",
+        node_consumption_data=[
+            {"node_name": "Узел-1", "period": "2022-Q1", "active_energy_kwh": 100.0},
+            {"node_name": "Узел-1", "period": "2022-Q1", "active_energy_kwh": 120.0},
+        ],
+    )
+    assert len(records) == 2
+    assert records[0]["id"] == records[1]["id"]
+
+    stored = database.get_node_consumption(enterprise_id=1)
+    assert len(stored) == 1
+    assert stored[0]["active_energy_kwh"] == 120.0
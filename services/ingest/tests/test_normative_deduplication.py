@@ -154,7 +154,7 @@ def test_full_text_saving():
                     doc_id = result["document_id"]
                     
                     # Проверяем, что текст сохранен
-                    doc = database.get_normative_document(doc_id)
+                    doc = database.get_normative_document_text(doc_id)
                     
                     if doc and doc.get("full_text"):
                         saved_text = doc["full_text"]
@@ -218,7 +218,7 @@ def test_get_document_text():
         doc_id = doc["id"]
         
         # Получаем документ
-        retrieved_doc = database.get_normative_document(doc_id)
+        retrieved_doc = database.get_normative_document_text(doc_id)
         
         if retrieved_doc:
             if retrieved_doc.get("full_text") == test_text:
@@ -240,6 +240,124 @@ def test_get_document_text():
         return False
 
 
+def test_batch_import_hashes_in_parallel_and_deduplicates(test_db, tmp_path):
+    """Пакетный импорт: повтор файла внутри пакета - дубликат, отсутствующий файл - error"""
+    from domain.normative_importer import NormativeImporter
+
+    importer = NormativeImporter()
+    first = tmp_path / "norm_a.txt"
+    first.write_text("Норматив A", encoding="utf-8")
+    copy = tmp_path / "norm_a_copy.txt"
+    copy.write_text("Норматив A", encoding="utf-8")
+    missing = tmp_path / "missing.txt"
+
+    with patch.object(importer, "_parse_document") as mock_parse, \
+         patch.object(importer, "_extract_rules_with_ai") as mock_ai:
+        mock_parse.return_value = {"parsing": {"data": {"text": "Норматив A"}}}
+        mock_ai.return_value = []
+
+        results = importer.import_normative_documents(
+            [str(first), str(copy), str(missing)], document_type="PKM690"
+        )
+
+    assert [r["status"] for r in results] == ["processed", "duplicate", "error"]
+    assert results[1]["document_id"] == results[0]["document_id"]
+    assert mock_parse.call_count == 1
+
+
+def test_async_batch_import_keeps_order_and_deduplicates(test_db, tmp_path):
+    """Асинхронный пакетный импорт: порядок результатов и дубликаты как у синхронного"""
+    import asyncio
+
+    from domain.normative_importer import NormativeImporter
+
+    importer = NormativeImporter()
+    paths = []
+    for name, text in (("a", "Норматив A"), ("b", "Норматив B"), ("a_copy", "Норматив A")):
+        path = tmp_path / f"norm_{name}.txt"
+        path.write_text(text, encoding="utf-8")
+        paths.append(str(path))
+    paths.append(str(tmp_path / "missing.txt"))
+
+    with patch.object(importer, "_parse_document") as mock_parse, \
+         patch.object(importer, "_extract_rules_with_ai") as mock_ai:
+        mock_parse.return_value = {"parsing": {"data": {"text": "Норматив"}}}
+        mock_ai.return_value = []
+
+        results = asyncio.run(
+            importer.import_normative_documents_async(paths, document_type="PKM690")
+        )
+
+    assert [r["status"] for r in results] == ["processed", "processed", "duplicate", "error"]
+    assert results[2]["document_id"] == results[0]["document_id"]
+    assert mock_parse.call_count == 2
+
+
+def test_ai_extraction_response_is_cached_per_prompt_and_model():
+    """Повторный анализ с тем же промптом и моделью берётся из кэша"""
+    from domain import normative_importer
+    from domain.normative_importer import NormativeImporter
+
+    importer = NormativeImporter()
+    importer.ai_parser = MagicMock(model_text="deepseek-chat")
+    create = importer.ai_parser.client.chat.completions.create
+    create.return_value.choices = [
+        MagicMock(message=MagicMock(content='{"rules": [{"rule_type": "normative"}]}'))
+    ]
+    parsed_result = {"parsing": {"data": {"text": "Норматив 0.15 кВт·ч/м²"}}}
+    normative_importer._AI_RESPONSE_CACHE.clear()
+
+    try:
+        for _ in range(2):
+            rules = importer._extract_rules_with_ai(parsed_result, 1, "PKM690")
+            assert [r["rule_type"] for r in rules] == ["normative"]
+        assert create.call_count == 1
+
+        importer.ai_parser.model_text = "deepseek-reasoner"
+        importer._extract_rules_with_ai(parsed_result, 1, "PKM690")
+        assert create.call_count == 2
+    finally:
+        normative_importer._AI_RESPONSE_CACHE.clear()
+
+
+def test_unparseable_ai_response_is_not_cached():
+    """Ответ, который не разбирается в правила, при повторе запрашивается заново"""
+    from domain import normative_importer
+    from domain.normative_importer import NormativeImporter
+
+    importer = NormativeImporter()
+    importer.ai_parser = MagicMock(model_text="deepseek-chat")
+    create = importer.ai_parser.client.chat.completions.create
+    create.return_value.choices = [MagicMock(message=MagicMock(content="Не JSON {"))]
+    parsed_result = {"parsing": {"data": {"text": "Норматив 0.15 кВт·ч/м²"}}}
+    normative_importer._AI_RESPONSE_CACHE.clear()
+
+    try:
+        assert importer._extract_rules_with_ai(parsed_result, 1, "PKM690") == []
+        assert importer._extract_rules_with_ai(parsed_result, 1, "PKM690") == []
+        assert create.call_count == 2
+        assert not normative_importer._AI_RESPONSE_CACHE
+    finally:
+        normative_importer._AI_RESPONSE_CACHE.clear()
+
+
+def test_prompt_text_is_truncated_at_paragraph_boundary():
+    """Длинный текст обрезается по границе абзаца, короткий - не меняется"""
+    from domain import normative_importer
+
+    assert normative_importer._truncate_prompt_text("Короткий текст") == "Короткий текст"
+
+    paragraph = "Норматив расхода электроэнергии " * 40
+    text = "\n\n".join([paragraph] * 200)
+    with patch.object(normative_importer, "HAS_TIKTOKEN", False):
+        truncated = normative_importer._truncate_prompt_text(text)
+
+    assert truncated.endswith(normative_importer._TRUNCATED_MARKER)
+    body = truncated[: -len(normative_importer._TRUNCATED_MARKER)]
+    assert len(body) <= normative_importer._PROMPT_TEXT_MAX_CHARS
+    assert all(chunk == paragraph for chunk in body.split("\n\n"))
+
+
 def run_all_tests():
     """Запустить все тесты дедупликации"""
     print("\n" + "=" * 70)
@@ -0,0 +1,91 @@
+"""
+Тесты для модуля normative_integration.py
+"""
+from unittest.mock import patch
+
+from openpyxl import Workbook
+
+from domain.normative_integration import (
+    NormativeValidationResult,
+    PendingComments,
+    add_validation_comment_to_cell,
+    get_critical_field,
+    is_critical_field,
+    validate_field_value,
+)
+
+
+def test_critical_field_lookup():
+    assert is_critical_field("Удельный расход", "Динамика ср")
+    assert not is_critical_field("Удельный расход", "Расход на ед.п")
+    assert get_critical_field("Удельный расход по кварталам", "Расход на ед.п")["tolerance_percent"] == 10.0
+    assert get_critical_field("Нет поля", "Динамика ср") is None
+
+
+def test_pending_comments_are_written_on_flush():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Динамика ср"
+    pending = PendingComments()
+
+    for coordinate, actual in (("G3", 0.20), ("G2", 0.14), ("G3", 0.30)):
+        result = NormativeValidationResult(
+            field_name="Удельный расход",
+            sheet_name="Динамика ср",
+            actual_value=actual,
+            status="violation" if actual > 0.15 else "compliant",
+            normative_value=0.15,
+        )
+        add_validation_comment_to_cell(sheet[coordinate], result, pending)
+
+    assert sheet["G2"].comment is None
+    assert len(pending) == 2
+
+    assert pending.flush(workbook) == 2
+    assert "Соответствует нормативу" in sheet["G2"].comment.text
+    assert "Факт: 0.3" in sheet["G3"].comment.text
+    assert len(pending) == 0
+
+
+def test_validate_field_value_wraps_validator_result():
+    validation = {
+        "status": "violation",
+        "actual": 0.2,
+        "normative": 0.15,
+        "deviation_percent": 33.3,
+        "message": "Превышение",
+        "rule": {"id": 7},
+    }
+    with patch("domain.normative_integration.validate_against_normative", return_value=validation):
+        result = validate_field_value("Удельный расход", 0.2, "Динамика ср")
+
+    assert result.is_violation()
+    assert result.to_dict() == {
+        "field_name": "Удельный расход",
+        "sheet_name": "Динамика ср",
+        "actual_value": 0.2,
+        "status": "violation",
+        "normative_value": 0.15,
+        "deviation_percent": 33.3,
+        "message": "Превышение",
+        "rule": {"id": 7},
+    }
+    assert not hasattr(result, "__dict__")
+
+
+def test_comment_text_by_status():
+    result = NormativeValidationResult(
+        field_name="Удельный расход",
+        sheet_name="Динамика ср",
+        actual_value=0.2,
+        status="violation",
+        normative_value=0.15,
+        deviation_percent=33.333,
+        message="Превышение",
+    )
+    assert result.get_comment_text() == (
+        "⚠️ ПРЕВЫШЕНИЕ НОРМАТИВА\nФакт: 0.2\nНорматив: 0.15\nОтклонение: 33.3%\nПревышение"
+    )
+
+    result.status = "unknown"
+    assert result.get_comment_text() == "ℹ️ Норматив не найден для поля 'Удельный расход'"
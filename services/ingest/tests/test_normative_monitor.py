@@ -0,0 +1,155 @@
+"""
+Тесты для модуля normative_monitor.py
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from openpyxl import Workbook
+
+from domain import normative_monitor
+from domain.normative_monitor import (
+    get_monitoring_summary,
+    monitor_critical_fields_from_passport,
+    monitor_critical_fields_from_passports,
+    read_field_value_from_passport,
+)
+
+
+def _make_passport(path):
+    """Паспорт с листами критических полей"""
+    workbook = Workbook()
+    dynamics = workbook.active
+    dynamics.title = "Динамика ср"
+    dynamics.cell(row=1, column=7, value="Удельный расход")
+    dynamics.cell(row=2, column=7, value=0.2)
+
+    per_unit = workbook.create_sheet("Расход на ед.п")
+    per_unit.cell(row=1, column=1, value="Период")
+    per_unit.cell(row=1, column=3, value="Удельный расход по кварталам")
+    per_unit.cell(row=2, column=3, value="н/д")
+    per_unit.cell(row=3, column=3, value=0.12)
+    workbook.save(path)
+
+
+def _validation_batch(checks, rules_cache=None):
+    return [
+        {
+            "status": "violation" if actual_value > 0.15 else "compliant",
+            "normative": 0.15,
+            "deviation_percent": 0.0,
+            "message": "",
+        }
+        for actual_value, _, _, _ in checks
+    ]
+
+
+def test_read_field_value_by_cell_and_by_header(tmp_path):
+    passport = tmp_path / "passport.xlsx"
+    _make_passport(passport)
+
+    assert read_field_value_from_passport(str(passport), "Удельный расход", "Динамика ср", 7, 2) == 0.2
+    assert read_field_value_from_passport(
+        str(passport), "удельный расход по кварталам", "Расход на ед.п"
+    ) == 0.12
+    assert read_field_value_from_passport(str(passport), "Нет поля", "Расход на ед.п") is None
+    assert read_field_value_from_passport(str(passport), "Удельный расход", "Нет листа") is None
+
+
+def test_monitor_opens_passport_once(tmp_path):
+    passport = tmp_path / "passport.xlsx"
+    _make_passport(passport)
+
+    validate = patch.object(
+        normative_monitor, "validate_against_normative_batch", side_effect=_validation_batch
+    )
+    load_spy = patch.object(
+        normative_monitor, "load_workbook", wraps=normative_monitor.load_workbook
+    )
+    with validate, load_spy as load:
+        result = monitor_critical_fields_from_passport(str(passport))
+
+    assert load.call_count == 1
+    assert result["fields_checked"] == len(normative_monitor.CRITICAL_FIELDS)
+    assert [v["field_name"] for v in result["violations"]] == ["Удельный расход"]
+    assert [c["actual_value"] for c in result["compliant"]] == [0.12]
+
+
+def test_bulk_rules_match_per_field_lookup(test_db):
+    import database
+
+    doc = database.create_normative_document(
+        title="ПКМ 690", document_type="PKM690", file_path="/tmp/pkm.pdf", file_hash="bulk-hash"
+    )
+    for value, confidence, sheet in ((0.15, 0.9, "Динамика ср"), (0.2, 0.5, "Расход на ед.п")):
+        rule = database.create_normative_rule(
+            document_id=doc["id"],
+            rule_type="normative",
+            numeric_value=value,
+            parameters={"k": value},
+            extraction_confidence=confidence,
+        )
+        database.create_normative_reference(
+            rule_id=rule["id"], field_name="Удельный расход", sheet_name=sheet
+        )
+
+    pairs = [("Удельный расход", "Динамика ср"), ("Удельный расход", None), ("Нет поля", None)]
+    bulk = database.get_normative_rules_bulk(pairs)
+
+    for field_name, sheet_name in pairs:
+        assert bulk[(field_name, sheet_name)] == database.get_normative_rules_for_field(
+            field_name, sheet_name
+        )
+    assert [r["numeric_value"] for r in bulk[("Удельный расход", None)]] == [0.15, 0.2]
+
+
+def test_monitoring_summary_groups_violations_by_field():
+    violations = [
+        {"id": 3, "field_name": "Удельный расход", "sheet_name": "Динамика ср", "deviation_percent": 12.0},
+        {"id": 2, "field_name": "Потери", "sheet_name": "08_Потери", "deviation_percent": None},
+        {"id": 1, "field_name": "Удельный расход", "sheet_name": "Динамика ср", "deviation_percent": 30.0},
+    ]
+
+    with patch.object(normative_monitor, "database") as mock_db:
+        mock_db.get_normative_violations.return_value = violations
+        summary = get_monitoring_summary(enterprise_id=1)
+
+    assert summary["total_violations"] == 3
+    by_field = {entry["field_name"]: entry for entry in summary["fields_summary"]}
+    assert by_field["Удельный расход"]["count"] == 2
+    assert by_field["Удельный расход"]["max_deviation"] == 30.0
+    assert by_field["Удельный расход"]["latest"]["id"] == 3
+    assert by_field["Потери"]["max_deviation"] == 0.0
+
+
+def test_batch_monitoring_loads_rules_once_and_keeps_order(tmp_path):
+    passports = []
+    for name in ("a", "b"):
+        passport = tmp_path / f"passport_{name}.xlsx"
+        _make_passport(passport)
+        passports.append(str(passport))
+    passports.append(str(tmp_path / "missing.xlsx"))
+
+    with patch.object(normative_monitor, "database") as mock_db, patch.object(
+        normative_monitor, "validate_against_normative_batch", side_effect=_validation_batch
+    ):
+        mock_db.get_normative_rules_bulk.return_value = {}
+        results = monitor_critical_fields_from_passports(passports, enterprise_id=1)
+
+    assert mock_db.get_normative_rules_bulk.call_count == 1
+    assert [r.get("passport_path") for r in results] == passports[:2] + [None]
+    assert "error" in results[2]
+    assert all(r["violations_count"] == 1 for r in results[:2])
+
+
+def test_monitor_closes_workbook_on_error(tmp_path):
+    passport = tmp_path / "passport.xlsx"
+    _make_passport(passport)
+
+    workbook = MagicMock()
+    with patch.object(normative_monitor, "load_workbook", return_value=workbook), patch.object(
+        normative_monitor, "CRITICAL_FIELDS", [{"sheet_name": "Динамика ср"}]
+    ):
+        with pytest.raises(KeyError):
+            monitor_critical_fields_from_passport(str(passport))
+
+    workbook.close.assert_called_once()
@@ -11,12 +11,23 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from domain.normative_validator import (
     validate_against_normative,
+    validate_against_normative_batch,
     check_critical_fields,
     get_top_fields_with_normatives,
     get_normative_statistics,
+    invalidate_normative_cache,
+    make_validator,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_normative_cache():
+    """Каждый тест мокает свои нормативы - кэш не должен переживать тест"""
+    invalidate_normative_cache()
+    yield
+    invalidate_normative_cache()
+
+
 class TestValidateAgainstNormative:
     """Тесты для функции validate_against_normative"""
 
@@ -127,6 +138,124 @@ class TestValidateAgainstNormative:
         assert result["status"] == "below_norm"
         assert "ниже норматива" in result["message"]
 
+    @patch("domain.normative_validator.database")
+    def test_rules_are_cached_until_invalidated(self, mock_db):
+        """Тест: нормативы поля запрашиваются из БД один раз до сброса кэша"""
+        mock_db.get_normative_rules_for_field.return_value = [
+            {"id": 1, "numeric_value": 0.10, "extraction_confidence": 0.5},
+            {"id": 2, "numeric_value": 0.15, "extraction_confidence": 0.95},
+        ]
+
+        first = validate_against_normative(0.14, "Удельный расход", "Динамика ср")
+        second = validate_against_normative(0.30, "Удельный расход", "Динамика ср")
+
+        assert first["rule"]["id"] == 2
+        assert second["status"] == "violation"
+        assert mock_db.get_normative_rules_for_field.call_count == 1
+
+        invalidate_normative_cache()
+        mock_db.get_normative_rules_for_field.return_value = []
+        result = validate_against_normative(0.14, "Удельный расход", "Динамика ср")
+
+        assert result["status"] == "unknown"
+        assert mock_db.get_normative_rules_for_field.call_count == 2
+
+    @patch("domain.normative_validator.database")
+    def test_result_rule_is_a_copy_of_cached_rule(self, mock_db):
+        """Тест: изменение result["rule"] не портит кэш нормативов"""
+        mock_db.get_normative_rules_for_field.return_value = [
+            {"id": 1, "numeric_value": 0.15, "unit": "кВт·ч/м²"}
+        ]
+
+        result = validate_against_normative(0.14, "Удельный расход", "Динамика ср")
+        result["rule"]["numeric_value"] = 99.0
+        batch = validate_against_normative_batch([(0.14, "Удельный расход", "Динамика ср", 10.0)])
+
+        assert batch[0]["rule"]["numeric_value"] == 0.15
+        assert batch[0]["rule"] is not result["rule"]
+
+    @patch("domain.normative_validator.database")
+    def test_preloaded_rules_skip_database(self, mock_db):
+        """Тест: с rules_cache нормативы берутся из него, а не из БД"""
+        rules_cache = {
+            ("Удельный расход", "Динамика ср"): [{"id": 3, "numeric_value": 0.15}],
+        }
+
+        found = validate_against_normative(
+            0.20, "Удельный расход", "Динамика ср", rules_cache=rules_cache
+        )
+        missing = validate_against_normative(0.20, "Потери", "08_Потери", rules_cache=rules_cache)
+
+        assert found["status"] == "violation"
+        assert found["rule"]["id"] == 3
+        assert missing["status"] == "unknown"
+        mock_db.get_normative_rules_for_field.assert_not_called()
+
+    @patch("domain.normative_validator.database")
+    def test_validators_are_cached_per_field_and_tolerance(self, mock_db):
+        """Тест: функция проверки создаётся один раз на поле, лист и допуск"""
+        mock_db.get_normative_rules_for_field.return_value = [{"id": 1, "numeric_value": 0.15}]
+
+        validate = make_validator("Удельный расход", "Динамика ср")
+
+        assert make_validator("Удельный расход", "Динамика ср") is validate
+        assert make_validator("Удельный расход", "Динамика ср", 20.0) is not validate
+        assert [validate(v)["status"] for v in (0.10, 0.15, 0.20)] == [
+            "below_norm", "compliant", "violation",
+        ]
+        assert mock_db.get_normative_rules_for_field.call_count == 1
+
+        invalidate_normative_cache()
+        assert make_validator("Удельный расход", "Динамика ср") is not validate
+
+    @patch("domain.normative_validator.database")
+    def test_validator_does_not_cache_database_errors(self, mock_db):
+        """Тест: ошибка БД даёт unknown и не запоминается"""
+        mock_db.get_normative_rules_for_field.side_effect = [
+            RuntimeError("database is locked"),
+            [{"id": 1, "numeric_value": 0.15}],
+        ]
+
+        assert make_validator("Удельный расход", "Динамика ср")(0.2)["status"] == "unknown"
+        assert make_validator("Удельный расход", "Динамика ср")(0.2)["status"] == "violation"
+
+    def test_value_exactly_at_tolerance_is_compliant(self):
+        """Тест: значение ровно на границе допуска - соответствует нормативу"""
+        rules_cache = {("Удельный расход", "Динамика ср"): [{"id": 1, "numeric_value": 7}]}
+
+        result = validate_against_normative(
+            7 * 1.1, "Удельный расход", "Динамика ср", rules_cache=rules_cache
+        )
+
+        assert result["status"] == "compliant"
+        assert result["deviation_percent"] == pytest.approx(10.0)
+
+    def test_batch_matches_single_validation(self):
+        """Тест: пакетная проверка даёт те же результаты, что и поштучная"""
+        rules_cache = {
+            ("Удельный расход", "Динамика ср"): [{"id": 1, "numeric_value": 7}],
+            ("Потери", "08_Потери"): [{"id": 2, "numeric_value": 0.0}],
+            ("Без значения", None): [{"id": 3, "numeric_value": None}],
+        }
+        checks = [
+            (7 * 1.1, "Удельный расход", "Динамика ср", 10.0),
+            (9.0, "Удельный расход", "Динамика ср", 10.0),
+            (5.0, "Удельный расход", "Динамика ср", 5.0),
+            (0.0, "Потери", "08_Потери", 10.0),
+            (1.0, "Потери", "08_Потери", 10.0),
+            (1.0, "Без значения", None, 10.0),
+            (1.0, "Нет норматива", None, 10.0),
+        ]
+
+        batch = validate_against_normative_batch(checks, rules_cache=rules_cache)
+
+        assert batch == [
+            validate_against_normative(*check, rules_cache=rules_cache) for check in checks
+        ]
+        assert [r["status"] for r in batch] == [
+            "compliant", "violation", "below_norm", "compliant", "violation", "unknown", "unknown",
+        ]
+
 
 class TestCheckCriticalFields:
     """Тесты для функции check_critical_fields"""
@@ -134,19 +263,48 @@ class TestCheckCriticalFields:
     @patch("domain.normative_validator.database")
     def test_check_critical_fields(self, mock_db):
         """Тест: проверка критических полей"""
-        # Мокаем правила для разных полей
-        def mock_get_rules(field_name, sheet_name=None):
-            if field_name == "Удельный расход":
-                return [{"id": 1, "numeric_value": 0.15}]
-            return []
+        # Мокаем количество правил для разных полей
+        def mock_count_rules(pairs):
+            return {pair: 1 if pair[0] == "Удельный расход" else 0 for pair in pairs}
 
-        mock_db.get_normative_rules_for_field.side_effect = mock_get_rules
+        mock_db.count_normative_rules_bulk.side_effect = mock_count_rules
 
         result = check_critical_fields(enterprise_id=1)
 
         assert result["enterprise_id"] == 1
         assert result["total_critical_fields"] > 0
         assert "compliant" in result or "has_violations" in result["status"]
+        assert mock_db.count_normative_rules_bulk.call_count == 1
+        assert [f["field_name"] for f in result["compliant"]] == ["Удельный расход"]
+        assert result["compliant"][0]["rules_count"] == 1
+
+    def test_rule_counts_match_per_field_lookup(self, test_db):
+        """Тест: количество правил одним запросом совпадает с поштучной выборкой"""
+        import database
+
+        doc = database.create_normative_document(
+            title="ПКМ 690", document_type="PKM690", file_path="/tmp/pkm.pdf", file_hash="count-hash"
+        )
+        for value, sheet in ((0.15, "Динамика ср"), (0.2, "Расход на ед.п"), (0.3, "Динамика ср")):
+            rule = database.create_normative_rule(
+                document_id=doc["id"], rule_type="normative", numeric_value=value
+            )
+            database.create_normative_reference(
+                rule_id=rule["id"], field_name="Удельный расход", sheet_name=sheet
+            )
+
+        pairs = [
+            ("Удельный расход", "Динамика ср"),
+            ("Удельный расход", None),
+            ("Удельный расход", "08_Потери"),
+            ("Нет поля", None),
+        ]
+        counts = database.count_normative_rules_bulk(pairs)
+
+        assert counts == {
+            pair: len(database.get_normative_rules_for_field(*pair)) for pair in pairs
+        }
+        assert counts[("Удельный расход", None)] == 3
 
 
 class TestGetTopFields:
@@ -188,6 +346,10 @@ class TestGetTopFields:
         assert isinstance(result, list)
         # Проверяем, что get_connection был вызван
         mock_db.get_connection.assert_called_once()
+        assert result == [
+            {"field_name": "Удельный расход", "sheet_name": "Динамика ср", "rules_count": 5},
+            {"field_name": "Потери", "sheet_name": "08_Потери", "rules_count": 3},
+        ]
 
 
 class TestGetNormativeStatistics:
@@ -0,0 +1,122 @@
+"""
+Тесты для модуля passport_field_mapping.py
+"""
+from unittest.mock import patch
+
+from domain.passport_field_mapping import (
+    FIELD_TYPE_CODES,
+    DataSource,
+    FieldType,
+    PassportField,
+    PassportFieldMapping,
+    get_field_mapping,
+)
+
+
+def test_sheet_fields_are_built_on_first_access():
+    mapping = PassportFieldMapping()
+
+    balans = mapping.get_fields_for_sheet("Баланс")
+
+    assert list(mapping._mappings) == ["Баланс"]
+    assert balans and all(f.sheet_name == "Баланс" for f in balans)
+    assert mapping.get_fields_for_sheet("Баланс") is balans
+    assert mapping.get_fields_for_sheet("Нет листа") == []
+    assert "Нет листа" not in mapping._mappings
+
+
+def test_cross_sheet_queries_cover_all_sheets():
+    mapping = PassportFieldMapping()
+
+    calculated = mapping.get_calculated_fields()
+
+    assert calculated and all(f.field_type == FieldType.CALCULATED for f in calculated)
+    assert "Расход на ед.п" in {f.sheet_name for f in calculated}
+    assert all(f.is_required for f in mapping.get_required_fields())
+    assert all(
+        f.data_source == DataSource.AGGREGATOR
+        for f in mapping.get_fields_by_data_source(DataSource.AGGREGATOR)
+    )
+    assert mapping.get_field_by_name("Уголь").sheet_name == "мазут,уголь 5"
+    assert mapping.get_field_by_name("Уголь", "мазут,уголь 5") is mapping.get_field_by_name("Уголь")
+    assert mapping.get_field_by_name("Уголь", "Баланс") is None
+
+    # Результат - копия: изменение списка не затрагивает маппинг
+    calculated.clear()
+    mapping.get_required_fields().clear()
+    assert mapping.get_calculated_fields() and mapping.get_required_fields()
+
+
+def test_quarter_mapping_is_cached_but_returned_as_copy():
+    mapping = PassportFieldMapping()
+
+    first = mapping.build_quarter_mapping("2022")
+    first["2022-Q1"] = None
+
+    assert mapping.build_quarter_mapping("2022")["2022-Q1"] == (9, 3, 4, 6, 14)
+    assert list(mapping.build_quarter_mapping("2023")) == [f"2023-Q{q}" for q in range(1, 5)]
+
+
+def test_field_mapping_singleton_is_created_once_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from domain import passport_field_mapping
+
+    with patch.object(passport_field_mapping, "_field_mapping", None):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            instances = list(executor.map(lambda _: get_field_mapping(), range(32)))
+
+        assert len({id(instance) for instance in instances}) == 1
+        assert passport_field_mapping.field_mapping is instances[0]
+
+
+def test_sheet_columns_follow_field_order():
+    mapping = PassportFieldMapping()
+    fields = mapping.get_fields_for_sheet("Структура пр 2")
+
+    columns = mapping.get_columns_for_sheet("Структура пр 2")
+
+    assert list(columns["row"]) == [f.row if f.row is not None else -1 for f in fields]
+    assert list(columns["column"]) == [f.column if f.column is not None else -1 for f in fields]
+    assert list(columns["field_type"]) == [FIELD_TYPE_CODES[f.field_type] for f in fields]
+    assert list(columns["data_path"]) == [f.data_path for f in fields]
+    assert list(columns["row_mask"]) == [f.row is not None for f in fields]
+    assert list(columns["column_mask"]) == [f.column is not None for f in fields]
+    assert mapping.get_columns_for_sheet("Структура пр 2") is columns
+    assert len(mapping.get_columns_for_sheet("Нет листа")["row"]) == 0
+
+
+def test_enums_keep_string_values_and_do_not_mix():
+    assert FieldType.CALCULATED.value == "calculated"
+    assert DataSource.NORMATIVE_DB.value == "normative_db"
+    assert FieldType.INPUT != DataSource.AGGREGATOR
+    assert PassportFieldMapping().get_fields_by_data_source(FieldType.INPUT) == []
+    assert sorted(FIELD_TYPE_CODES.values()) == list(range(len(FieldType)))
+
+
+def test_resolve_path_matches_str_format():
+    mapping = PassportFieldMapping()
+    fields = [f for f in mapping.get_fields_for_sheet("Структура пр 2") if f.data_path]
+    context = {"quarter": "2022-Q1", "index": 3}
+
+    assert [f.resolve_path(**context) for f in fields] == [
+        f.data_path.format(**context) for f in fields
+    ]
+    assert mapping.get_field_by_name("Уголь").resolve_path(quarter="2023-Q4") == (
+        "resources.coal.2023-Q4.quarter_totals.volume_ton"
+    )
+
+
+def test_name_lookup_without_sheet_prefers_first_sheet(caplog):
+    mapping = PassportFieldMapping()
+    first = mapping.get_field_by_name("Уголь")
+
+    with patch.dict(
+        "domain.passport_field_mapping._SHEET_FIELD_BUILDERS",
+        {"Дубль": lambda: [PassportField(field_name="Уголь", sheet_name="Дубль")]},
+    ), caplog.at_level("DEBUG", logger="domain.passport_field_mapping"):
+        mapping = PassportFieldMapping()
+        assert mapping.get_field_by_name("Уголь").sheet_name == first.sheet_name
+        assert mapping.get_field_by_name("Уголь", "Дубль").sheet_name == "Дубль"
+
+    assert "Уголь" in caplog.text
@@ -0,0 +1,130 @@
+"""
+Быстрая (де)сериализация JSON через orjson с fallback на стандартный json.
+
+orjson в 3-10 раз быстрее stdlib на типичных словарях с числами и нативно
+сериализует datetime/date. Если orjson не установлен, используется json.
+
+orjson записывает NaN/Infinity как null, поэтому данные с такими значениями
+сериализуются через stdlib (NaN/Infinity сохраняются и читаются обратно).
+"""
+
+import json
+import logging
+import math
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+
+def _has_non_finite(data: Any) -> bool:
+    """Проверяет, есть ли в данных NaN или ±Infinity (рекурсивно)."""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(item) for item in data)
+    return False
+
+
+if HAS_ORJSON:
+    # Нестроковые ключи (int, date) stdlib тоже приводит к строкам
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(data: Any) -> str:
+        """
+        Сериализует данные в JSON-строку (UTF-8 без экранирования кириллицы).
+
+        Raises:
+            TypeError: Если тип не поддерживается orjson
+        """
+        if _has_non_finite(data):
+            return json.dumps(data, ensure_ascii=False)
+        return orjson.dumps(data, option=_ORJSON_OPTIONS).decode("utf-8")
+
+    def dumps_bytes(data: Any) -> bytes:
+        """
+        Сериализует данные в JSON как UTF-8 байты (без промежуточной строки).
+
+        Raises:
+            TypeError: Если тип не поддерживается orjson
+        """
+        if _has_non_finite(data):
+            return json.dumps(data, ensure_ascii=False).encode("utf-8")
+        return orjson.dumps(data, option=_ORJSON_OPTIONS)
+
+    def loads(data: Union[str, bytes, bytearray]) -> Any:
+        """
+        Разбирает JSON из строки или байтов.
+
+        Старые записи, сохранённые через json.dumps, могут содержать NaN/Infinity,
+        которых нет в стандарте JSON - такие данные дочитываются через stdlib.
+        """
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+else:
+
+    def dumps(data: Any) -> str:
+        """Сериализует данные в JSON-строку (UTF-8 без экранирования кириллицы)."""
+        return json.dumps(data, ensure_ascii=False)
+
+    def dumps_bytes(data: Any) -> bytes:
+        """Сериализует данные в JSON как UTF-8 байты."""
+        return dumps(data).encode("utf-8")
+
+    def loads(data: Union[str, bytes, bytearray]) -> Any:
+        """Разбирает JSON из строки или байтов."""
+        return json.loads(data)
+
+
+class LazyJSON(Mapping):
+    """
+    JSON-объект, который разбирается только при первом обращении к данным.
+
+    Используется при чтении множества строк, когда вызывающему коду нужны
+    лишь некоторые записи: неиспользованные payload'ы не разбираются вовсе.
+    Некорректный JSON читается как пустой объект.
+    """
+
+    __slots__ = ("_raw", "_data")
+
+    def __init__(self, raw: Union[str, bytes, bytearray]):
+        self._raw = raw
+        self._data: Optional[Dict[str, Any]] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Возвращает разобранный словарь (разбирает при первом вызове)."""
+        if self._data is None:
+            try:
+                data = loads(self._raw)
+            except (ValueError, TypeError) as exc:
+                logger.warning(f"Не удалось разобрать JSON: {exc}")
+                data = {}
+            self._data = data if isinstance(data, dict) else {}
+            self._raw = None
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.as_dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.as_dict())
+
+    def __len__(self) -> int:
+        return len(self.as_dict())
+
+    def __repr__(self) -> str:
+        state = "parsed" if self._data is not None else "raw"
+        return f"LazyJSON({state})"